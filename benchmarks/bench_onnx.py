@@ -0,0 +1,125 @@
+"""
+EasyOCR (torch) vs ONNX Runtime engine benchmark
+
+Runs each OCR engine in its own process on the synthetic device-list
+screenshots (see synthetic_screens.py) and reports model load time,
+per-image latency, peak process memory and serial recall against the
+ground truth, plus how many of EasyOCR's recognised texts the ONNX
+engine reproduces exactly.
+
+Needs easyocr/torch for the easyocr engine and onnxruntime/opencv plus
+exported models (python -m ocr_onnx --export) for the onnx engine.
+
+Usage: python benchmarks/bench_onnx.py [--images 2] [--engines easyocr onnx]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ocr_engine import OCR_ENGINES, create_reader, normalize_detections, parse_detections, warm_up_reader  # noqa: E402
+from synthetic_screens import RESOLUTIONS, ROW_COUNTS, recall, render_screen  # noqa: E402
+
+
+def peak_memory_mb():
+    """Peak resident memory of this process in MB (None when it cannot be read)"""
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_engine(engine, images):
+    """Child process: OCR every synthetic screen with one engine, returns the result dict"""
+    import numpy as np
+
+    start = time.perf_counter()
+    reader = create_reader(engine=engine)
+    warm_up_reader(reader)
+    load_seconds = time.perf_counter() - start
+
+    latencies, recalls, texts = [], [], {}
+    for width, height in RESOLUTIONS:
+        for rows in ROW_COUNTS:
+            for seed in range(images):
+                screen = render_screen(width, height, rows, seed=seed)
+                array = np.asarray(screen.image)
+                start = time.perf_counter()
+                detections = normalize_detections(reader.readtext(array))
+                latencies.append(time.perf_counter() - start)
+                recalls.append(recall(parse_detections(detections), screen.serials)[0])
+                texts[f"{width}x{height}_{rows}_{seed}"] = sorted(text for _, text, _ in detections)
+    return {
+        "engine": engine,
+        "load_seconds": load_seconds,
+        "latency_mean": statistics.mean(latencies),
+        "latency_median": statistics.median(latencies),
+        "peak_memory_mb": peak_memory_mb(),
+        "recall": statistics.mean(recalls),
+        "texts": texts,
+    }
+
+
+def agreement(reference, other):
+    """Fraction of the reference engine's texts that the other engine produced as well"""
+    matched = total = 0
+    for key, texts in reference.items():
+        remaining = list(other.get(key, []))
+        for text in texts:
+            total += 1
+            if text in remaining:
+                remaining.remove(text)
+                matched += 1
+    return matched / total if total else 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the EasyOCR and ONNX Runtime OCR engines")
+    parser.add_argument("--images", type=int, default=2, help="Screenshots per resolution/row count (default 2)")
+    parser.add_argument("--engines", nargs="+", choices=OCR_ENGINES, default=list(OCR_ENGINES))
+    parser.add_argument("--child", choices=OCR_ENGINES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_engine(args.child, args.images)))
+        return 0
+
+    results = {}
+    for engine in args.engines:
+        print(f"Running {engine}...")
+        completed = subprocess.run(
+            [sys.executable, __file__, "--child", engine, "--images", str(args.images)],
+            capture_output=True, text=True,
+        )
+        if completed.returncode != 0:
+            print(f"  {engine} failed:\n{completed.stderr.strip()}")
+            continue
+        results[engine] = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    print(f"\n{'engine':<10}{'load':>9}{'mean':>11}{'median':>11}{'peak mem':>11}{'recall':>9}")
+    for engine, result in results.items():
+        memory = f"{result['peak_memory_mb']:.0f} MB" if result['peak_memory_mb'] else "-"
+        print(f"{engine:<10}{result['load_seconds']:>8.1f}s{result['latency_mean'] * 1000:>9.0f}ms"
+              f"{result['latency_median'] * 1000:>9.0f}ms{memory:>11}{result['recall']:>9.3f}")
+    if "easyocr" in results and "onnx" in results:
+        speedup = results["easyocr"]["latency_mean"] / results["onnx"]["latency_mean"]
+        same = agreement(results["easyocr"]["texts"], results["onnx"]["texts"])
+        print(f"\nONNX speed-up: {speedup:.2f}x, same text as EasyOCR for {same:.1%} of boxes")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""
+Parse-throughput benchmark for device_parser.parse_device_text
+
+Builds a synthetic OCR dump (default 100k lines) mixing device rows,
+engine blocks and screen noise, then times the compiled token classifier
+against the original per-token pattern loop. Both must return the same
+devices.
+
+Usage: python benchmarks/bench_parser.py [--lines 100000] [--repeat 3]
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from device_parser import parse_device_text  # noqa: E402
+
+
+def legacy_parse_device_text(text):
+    """Original per-token implementation, kept as the benchmark baseline"""
+    devices = []
+    lines = text.split('\n')
+    for i, line in enumerate(lines):
+        line = line.strip()
+        if not line:
+            continue
+        parts = line.split()
+        if len(parts) < 2:
+            continue
+        product_code_pattern = r'^(E\d{5}|V\d{5}|MS-[A-Z0-9]+|\d{1,3}L\d{4})$'
+        serial_patterns = [
+            r'^[A-Z]{3}\d[A-Z0-9]{3}$',
+            r'^\d{7,12}$',
+            r'^[JC]\d{6}-\d{4}$',
+            r'^E\d{10,}$',
+            r'^[A-Z]{1,2}\d{7,10}$',
+            r'^[A-Z0-9]{8,12}$',
+            r'^[A-Z]{1,2}\d{6,8}$',
+            r'^\d{8,10}$',
+            r'^[A-Z]{1,2}\d{6,12}$',
+            r'^[A-Z0-9]{6,14}$',
+            r'^[A-Z]{1,2}\d{6,12}$',
+            r'^[A-Z]{1,2}\d{6,12}$',
+            r'^[A-Z0-9]{8,15}$',
+            r'^[A-Z0-9]{8,15}$',
+            r'^[A-Z0-9Α-Ω]{8,15}$',
+            r'^[A-Z0-9\-]{6,16}$',
+            r'^[A-Z0-9]{4,8}$',
+        ]
+        product_code_idx = None
+        serial_idx = None
+        for idx, part in enumerate(parts):
+            if re.match(product_code_pattern, part):
+                product_code_idx = idx
+            for pattern in serial_patterns:
+                if re.match(pattern, part):
+                    serial_idx = idx
+                    break
+        if product_code_idx is not None and serial_idx is not None and serial_idx > product_code_idx:
+            devices.append({'product': ' '.join(parts[:serial_idx]), 'serial': parts[serial_idx]})
+        elif product_code_idx is not None and serial_idx is None and i + 1 < len(lines):
+            for part in lines[i + 1].strip().split():
+                for pattern in serial_patterns:
+                    if re.match(pattern, part):
+                        devices.append({'product': ' '.join(parts[:product_code_idx+1]), 'serial': part})
+                        break
+    for i, line in enumerate(lines):
+        l = line.strip()
+        if not l:
+            continue
+        if re.search(r'engine', l, flags=re.IGNORECASE) or re.search(r'engines', l, flags=re.IGNORECASE):
+            for j in range(i+1, min(i+6, len(lines))):
+                model_line = lines[j].strip()
+                if re.search(r'model', model_line, flags=re.IGNORECASE):
+                    if j+1 < len(lines):
+                        serial_line = lines[j+1].strip()
+                        serial_match = None
+                        for pattern in serial_patterns:
+                            if re.match(pattern, serial_line):
+                                serial_match = serial_line
+                                break
+                        if serial_match:
+                            devices.append({'product': 'ENGINE', 'serial': serial_match})
+                if re.search(r'serial', model_line, flags=re.IGNORECASE):
+                    serial_match = None
+                    for pattern in serial_patterns:
+                        if re.match(pattern, model_line):
+                            serial_match = model_line
+                            break
+                    if serial_match:
+                        devices.append({'product': 'ENGINE', 'serial': serial_match})
+    seen = set()
+    unique_devices = []
+    for device in devices:
+        key = (device['product'], device['serial'])
+        if key not in seen:
+            seen.add(key)
+            unique_devices.append(device)
+    return unique_devices
+
+
+PRODUCTS = [
+    ("AXIOM 2 PRO 12", "E70656"),
+    ("AXIOM 2 PRO 16", "E70658"),
+    ("RAYMARINE RS 150", "E70310"),
+    ("QUANTUM 2 DOPPLER", "E70498"),
+    ("AIS 700", "E70476"),
+    ("RAY53 VHF", "E70524"),
+    ("GMDSS", "12L3487"),
+    ("CAMERA", "MS-RA770"),
+]
+NOISE = [
+    "Device List", "Settings", "Network", "Software version 3.15.48",
+    "Status OK", "Connected", "Back", "Home", "Diagnostics", "NMEA 2000",
+]
+ENGINE_BLOCK = ["Engine 1", "Yamaha", "Model", "XF450NSA", "Serial", "6MLN1000296"]
+
+
+def random_serial(rng):
+    """Random serial in one of the formats the parser handles"""
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    digits = "0123456789"
+    choice = rng.randrange(4)
+    if choice == 0:
+        return ''.join(rng.choice(letters) for _ in range(3)) + rng.choice(digits) + \
+            ''.join(rng.choice(letters + digits) for _ in range(3))
+    if choice == 1:
+        return ''.join(rng.choice(digits) for _ in range(7))
+    if choice == 2:
+        return rng.choice("JC") + ''.join(rng.choice(digits) for _ in range(6)) + "-" + \
+            ''.join(rng.choice(digits) for _ in range(4))
+    return "1E" + ''.join(rng.choice(digits) for _ in range(6))
+
+
+def build_dump(line_count, seed=1234):
+    """Build a synthetic OCR dump with the given number of lines"""
+    rng = random.Random(seed)
+    lines = []
+    while len(lines) < line_count:
+        roll = rng.random()
+        if roll < 0.45:
+            name, code = rng.choice(PRODUCTS)
+            lines.append(f"{name} {code} {random_serial(rng)}")
+        elif roll < 0.55:
+            name, code = rng.choice(PRODUCTS)
+            lines.append(f"{name} {code}")
+            lines.append(random_serial(rng))
+        elif roll < 0.60:
+            lines.extend(ENGINE_BLOCK)
+        else:
+            lines.append(rng.choice(NOISE))
+    return '\n'.join(lines[:line_count])
+
+
+def time_parser(parser, text, repeat):
+    """Return (best seconds, result) over repeat runs"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = parser(text)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=100000, help="lines in the synthetic OCR dump")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per parser (best time is reported)")
+    args = parser.parse_args()
+
+    text = build_dump(args.lines)
+    legacy_time, legacy_result = time_parser(legacy_parse_device_text, text, args.repeat)
+    new_time, new_result = time_parser(parse_device_text, text, args.repeat)
+
+    print(f"Lines parsed:    {args.lines}")
+    print(f"Devices found:   {len(new_result)}")
+    print(f"Legacy parser:   {legacy_time:.3f} s ({args.lines / legacy_time:,.0f} lines/s)")
+    print(f"Compiled parser: {new_time:.3f} s ({args.lines / new_time:,.0f} lines/s)")
+    print(f"Speed-up:        {legacy_time / new_time:.1f}x")
+
+    # The row index is new metadata, compare the fields the legacy parser produced
+    new_pairs = [{'product': device['product'], 'serial': device['serial']} for device in new_result]
+    if new_pairs != legacy_result:
+        print("✗ Output differs from legacy parser")
+        return 1
+    if new_time >= legacy_time:
+        print("✗ Compiled parser is not faster than legacy parser")
+        return 1
+    print("✓ Output identical to legacy parser")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""
+End-to-end extraction benchmark on synthetic device-list screenshots
+
+Renders screenshots at several resolutions and row counts (see
+synthetic_screens.py), runs them through the extraction pipeline
+(extract_image with the default OCR options, as the GUI's in-process
+OCR does) and times each stage per image: decode, preprocess, OCR
+(detect and recognise with --targeted), parse, tree population (the GUI
+results table) and export. Reports throughput and
+serial recall against the rendered ground truth.
+
+Results are compared with a JSON baseline in benchmarks/baselines/; a
+stage that got slower than the tolerance or a drop in recall is
+reported as a regression and the script exits with status 1.
+
+Without --ocr the rendered text boxes are used as detections (perfect
+OCR), which times everything after recognition without easyocr/torch.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--ocr] [--targeted] [--images 3]
+    python benchmarks/bench_pipeline.py --ocr --save-baseline
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from device_export import build_rows, write_export  # noqa: E402
+from ocr_engine import (  # noqa: E402
+    add_timing, create_reader, decode_image, extract_image, ocr_options, ocr_params, parse_detections,
+)
+from synthetic_screens import RESOLUTIONS, ROW_COUNTS, recall, render_screen  # noqa: E402
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+STAGES = ["decode", "preprocess", "ocr", "detect", "recognize", "parse", "tree", "export"]
+# A stage is a regression when it is this much slower than the baseline
+# and at least MIN_REGRESSION_MS slower per image (ignores timer noise)
+DEFAULT_TOLERANCE = 0.25
+MIN_REGRESSION_MS = 2.0
+
+
+def make_tree():
+    """Hidden results table like the GUI's, or None without a display"""
+    import tkinter as tk
+    from tkinter import ttk
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        return None
+    root.withdraw()
+    return ttk.Treeview(root, columns=("Select", "DeviceType", "Code", "Serial"), show="headings")
+
+
+def populate_tree(tree, devices, image_path):
+    """Insert rows the way the GUI does for one finished image"""
+    for row in build_rows(devices, image=image_path):
+        tree.insert("", "end", values=("☐", row['device_type'], row['code'], row['serial']))
+
+
+def run_case(width, height, rows, images, reader, options, tree, workdir):
+    """Benchmark one resolution/row count, returns the case result dict"""
+    image_timings = []
+    recalls, extra, found = [], 0, 0
+    export_rows = []
+    for seed in range(images):
+        timings = {}
+        image_timings.append(timings)
+        screen = render_screen(width, height, rows, seed=seed)
+        path = Path(workdir) / f"screen_{width}x{height}_{rows}_{seed}.png"
+        screen.image.save(path)
+
+        image = decode_image(str(path), timings)
+        if reader is not None:
+            _, devices = extract_image(reader, image, options, timings)
+        else:
+            start = time.perf_counter()
+            devices = parse_detections(screen.detections)
+            add_timing(timings, 'parse', start)
+
+        if tree is not None:
+            start = time.perf_counter()
+            populate_tree(tree, devices, str(path))
+            tree.update_idletasks()
+            add_timing(timings, 'tree', start)
+            tree.delete(*tree.get_children())
+
+        export_rows.extend(build_rows(devices, image=str(path)))
+        image_recall, image_extra = recall(devices, screen.serials)
+        recalls.append(image_recall)
+        extra += image_extra
+        found += len(devices)
+
+    export_timings = {}
+    start = time.perf_counter()
+    write_export(Path(workdir) / "export.txt", export_rows, "BENCH", "Synthetic", "0000000")
+    add_timing(export_timings, 'export', start)
+
+    # Median per image, so one image hit by machine noise does not count as a regression
+    per_image = {
+        stage: statistics.median(timings.get(stage, 0.0) for timings in image_timings)
+        for stage in STAGES if any(stage in timings for timings in image_timings)
+    }
+    per_image['export'] = export_timings['export'] / images
+    total = sum(sum(timings.values()) for timings in image_timings) + export_timings['export']
+    return {
+        "name": f"{width}x{height}_{rows}rows",
+        "images": images,
+        "stages_ms": {stage: round(seconds * 1000, 3) for stage, seconds in per_image.items()},
+        "images_per_second": round(images / total, 2) if total else None,
+        "rows_per_second": round(found / total, 1) if total else None,
+        "recall": round(sum(recalls) / len(recalls), 4),
+        "extra_serials": extra,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Regression messages for cases that are slower or less accurate than the baseline"""
+    regressions = []
+    baseline_cases = {case["name"]: case for case in baseline["cases"]}
+    for case in results["cases"]:
+        base = baseline_cases.get(case["name"])
+        if base is None:
+            continue
+        for stage, ms in case["stages_ms"].items():
+            base_ms = base["stages_ms"].get(stage)
+            if base_ms and ms > base_ms * (1 + tolerance) and ms - base_ms > MIN_REGRESSION_MS:
+                regressions.append(f"{case['name']} {stage}: {base_ms:.1f} -> {ms:.1f} ms/image")
+        if case["recall"] < base["recall"]:
+            regressions.append(f"{case['name']} recall: {base['recall']:.3f} -> {case['recall']:.3f}")
+    return regressions
+
+
+def print_results(results):
+    header = f"{'case':<22}" + "".join(f"{stage:>11}" for stage in STAGES) + f"{'img/s':>9}{'recall':>8}{'extra':>7}"
+    print(header)
+    print("-" * len(header))
+    for case in results["cases"]:
+        stages = "".join(
+            f"{case['stages_ms'][stage]:>9.1f}ms" if stage in case["stages_ms"] else f"{'-':>11}" for stage in STAGES
+        )
+        print(f"{case['name']:<22}{stages}{case['images_per_second'] or 0:>9.1f}{case['recall']:>8.3f}{case['extra_serials']:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the extraction pipeline on synthetic screenshots")
+    parser.add_argument("--images", type=int, default=3, help="Screenshots per case (default 3)")
+    parser.add_argument("--ocr", action="store_true", help="Run EasyOCR instead of using the rendered text boxes")
+    parser.add_argument("--targeted", action="store_true", help="Use targeted recognition (implies --ocr)")
+    parser.add_argument("--baseline", help="Baseline JSON (default benchmarks/baselines/pipeline_<mode>.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--output", help="Also write the results JSON here")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"Allowed slowdown per stage before it counts as a regression (default {DEFAULT_TOLERANCE})")
+    args = parser.parse_args()
+
+    use_ocr = args.ocr or args.targeted
+    mode = ("easyocr-targeted" if args.targeted else "easyocr") if use_ocr else "no-ocr"
+    reader = None
+    options = ocr_options(targeted=args.targeted)
+    if use_ocr:
+        print("Loading EasyOCR...")
+        reader = create_reader()
+    tree = make_tree()
+    # Import numpy and compile the catalogue before anything is timed
+    parse_detections(render_screen(640, 480, 2).detections)
+    if tree is None:
+        print("No display: tree population is not timed")
+
+    results = {
+        "mode": mode,
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "environment": {"python": platform.python_version(), "platform": platform.platform(), "processor": platform.processor()},
+        "ocr": ocr_params(options) if use_ocr else None,
+        "cases": [],
+    }
+    with tempfile.TemporaryDirectory() as workdir:
+        for width, height in RESOLUTIONS:
+            for rows in ROW_COUNTS:
+                results["cases"].append(run_case(width, height, rows, args.images, reader, options, tree, workdir))
+    print_results(results)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding='utf-8')
+    baseline_path = Path(args.baseline) if args.baseline else BASELINE_DIR / f"pipeline_{mode}.json"
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(results, indent=2), encoding='utf-8')
+        print(f"\nBaseline written to {baseline_path}")
+        return 0
+    if not baseline_path.exists():
+        print(f"\nNo baseline at {baseline_path} (run with --save-baseline to create one)")
+        return 0
+    regressions = compare(results, json.loads(baseline_path.read_text(encoding='utf-8')), args.tolerance)
+    if regressions:
+        print(f"\nRegressions against {baseline_path}:")
+        for message in regressions:
+            print(f"  {message}")
+        return 1
+    print(f"\nNo regressions against {baseline_path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""
+OCR profile benchmark: speed-up and serial recall per profile
+
+Runs each OCR profile in its own process through extract_image (the same
+path as the GUI and command line) and reports model load time, time per
+image and serial recall, with the speed-up and recall change relative to
+the balanced profile.
+
+Recall is measured on the synthetic screenshots (see synthetic_screens.py)
+and, with --corpus, on a folder of real captures against an expected
+serials file written by `bench_replay.py --save-expected` (keyed by image
+content hash, so the file names do not matter).
+
+Usage:
+    python benchmarks/bench_profiles.py [--engine onnx] [--images 2]
+    python benchmarks/bench_profiles.py --corpus captures/ --expected expected.json
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_onnx import peak_memory_mb  # noqa: E402
+from ocr_cache import hash_file  # noqa: E402
+from ocr_engine import (  # noqa: E402
+    DEFAULT_OCR_PROFILE, OCR_ENGINES, OCR_PROFILES, create_reader, extract_image, ocr_options, warm_up_reader,
+)
+from synthetic_screens import RESOLUTIONS, ROW_COUNTS, recall, render_screen  # noqa: E402
+
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff"}
+
+
+def corpus_recall(found, expected):
+    """(found expected serials, expected serials) for one image"""
+    found = set(found)
+    return sum(1 for serial in expected if serial in found), len(expected)
+
+
+def run_profile(engine, profile, images, corpus=None, expected=None):
+    """Child process: extract with one profile, returns the result dict"""
+    start = time.perf_counter()
+    reader = create_reader(engine=engine, profile=profile)
+    warm_up_reader(reader)
+    load_seconds = time.perf_counter() - start
+    options = ocr_options(engine=engine, profile=profile)
+
+    latencies, recalls = [], []
+    for width, height in RESOLUTIONS:
+        for rows in ROW_COUNTS:
+            for seed in range(images):
+                screen = render_screen(width, height, rows, seed=seed)
+                start = time.perf_counter()
+                _, devices = extract_image(reader, screen.image, options)
+                latencies.append(time.perf_counter() - start)
+                recalls.append(recall(devices, screen.serials)[0])
+
+    result = {
+        "profile": profile,
+        "load_seconds": load_seconds,
+        "latency_mean": statistics.mean(latencies),
+        "peak_memory_mb": peak_memory_mb(),
+        "recall": statistics.mean(recalls),
+    }
+    if corpus:
+        found_total = expected_total = 0
+        corpus_latencies = []
+        for path in sorted(Path(corpus).iterdir()):
+            wanted = expected.get(hash_file(path)) if path.suffix.lower() in IMAGE_EXTENSIONS else None
+            if wanted is None:
+                continue
+            start = time.perf_counter()
+            _, devices = extract_image(reader, str(path), options)
+            corpus_latencies.append(time.perf_counter() - start)
+            found, total = corpus_recall((device['serial'] for device in devices), wanted)
+            found_total += found
+            expected_total += total
+        result["corpus_images"] = len(corpus_latencies)
+        result["corpus_latency_mean"] = statistics.mean(corpus_latencies) if corpus_latencies else None
+        result["corpus_recall"] = found_total / expected_total if expected_total else None
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare OCR profiles: speed and serial recall")
+    parser.add_argument("--engine", choices=OCR_ENGINES, default="easyocr")
+    parser.add_argument("--profiles", nargs="+", choices=OCR_PROFILES, default=list(OCR_PROFILES))
+    parser.add_argument("--images", type=int, default=2, help="Synthetic screenshots per resolution/row count (default 2)")
+    parser.add_argument("--corpus", help="Folder of real captures")
+    parser.add_argument("--expected", help="Expected serials JSON for --corpus (bench_replay.py --save-expected)")
+    parser.add_argument("--child", choices=OCR_PROFILES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if bool(args.corpus) != bool(args.expected):
+        parser.error("--corpus and --expected go together")
+
+    if args.child:
+        expected = json.loads(Path(args.expected).read_text(encoding='utf-8')) if args.expected else None
+        print(json.dumps(run_profile(args.engine, args.child, args.images, args.corpus, expected)))
+        return 0
+
+    results = {}
+    for profile in args.profiles:
+        print(f"Running {args.engine} / {profile}...")
+        command = [sys.executable, __file__, "--child", profile, "--engine", args.engine, "--images", str(args.images)]
+        if args.corpus:
+            command += ["--corpus", args.corpus, "--expected", args.expected]
+        completed = subprocess.run(command, capture_output=True, text=True)
+        if completed.returncode != 0:
+            print(f"  {profile} failed:\n{completed.stderr.strip()}")
+            continue
+        results[profile] = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    base = results.get(DEFAULT_OCR_PROFILE)
+    header = f"{'profile':<10}{'load':>8}{'per image':>11}{'speed-up':>10}{'peak mem':>10}{'recall':>8}{'change':>8}"
+    if args.corpus:
+        header += f"{'corpus':>9}{'change':>8}"
+    print("\n" + header)
+    for profile, result in results.items():
+        memory = f"{result['peak_memory_mb']:.0f} MB" if result['peak_memory_mb'] else "-"
+        speedup = f"{base['latency_mean'] / result['latency_mean']:.2f}x" if base else "-"
+        change = f"{result['recall'] - base['recall']:+.3f}" if base else "-"
+        line = (f"{profile:<10}{result['load_seconds']:>7.1f}s{result['latency_mean'] * 1000:>9.0f}ms"
+                f"{speedup:>10}{memory:>10}{result['recall']:>8.3f}{change:>8}")
+        if args.corpus:
+            corpus = result.get("corpus_recall")
+            base_corpus = base.get("corpus_recall") if base else None
+            corpus_change = f"{corpus - base_corpus:+.3f}" if corpus is not None and base_corpus is not None else "-"
+            line += f"{corpus:>9.3f}" if corpus is not None else f"{'-':>9}"
+            line += f"{corpus_change:>8}"
+        print(line)
+    if args.corpus and results:
+        print(f"\nCorpus: {next(iter(results.values()))['corpus_images']} images with expected serials in {args.corpus}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
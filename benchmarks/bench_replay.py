@@ -0,0 +1,112 @@
+"""
+Parser benchmark and regression check on recorded OCR detections
+
+Runs layout, parsing, device type matching and TXT export over every
+recording in a folder made with `device_ocr_cli --record`, without easyocr
+or torch. With --expected, the serials found per image are compared with a
+saved expectation file so parser changes that lose (or add) serials on
+real captures show up immediately.
+
+Usage:
+    python benchmarks/bench_replay.py recordings/ [--repeat 3]
+    python benchmarks/bench_replay.py recordings/ --save-expected expected.json
+    python benchmarks/bench_replay.py recordings/ --expected expected.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from device_export import build_rows, format_txt  # noqa: E402
+from ocr_backends import RecordingStore  # noqa: E402
+from ocr_layout import layout_rows, row_tokens  # noqa: E402
+from device_parser import parse_device_rows  # noqa: E402
+
+
+def run(records):
+    """Parse every recording once, returns (stage seconds, serials per image hash)"""
+    timings = {"layout": 0.0, "parse": 0.0, "match": 0.0, "export": 0.0}
+    serials = {}
+    rows = []
+    for image_hash, record in records:
+        start = time.perf_counter()
+        tokens = row_tokens(layout_rows(record["detections"]))
+        timings["layout"] += time.perf_counter() - start
+        start = time.perf_counter()
+        devices = parse_device_rows(tokens)
+        timings["parse"] += time.perf_counter() - start
+        start = time.perf_counter()
+        rows.extend(build_rows(devices, image=record.get("image", "")))
+        timings["match"] += time.perf_counter() - start
+        serials[image_hash] = sorted(device['serial'] for device in devices)
+    start = time.perf_counter()
+    format_txt(rows, "BENCH", "Replay", "0000000")
+    timings["export"] += time.perf_counter() - start
+    return timings, serials
+
+
+def diff_expected(serials, expected, names):
+    """Lines describing serials that were lost or gained per image"""
+    lines = []
+    for image_hash, wanted in expected.items():
+        found = serials.get(image_hash)
+        if found is None:
+            continue
+        lost, gained = set(wanted) - set(found), set(found) - set(wanted)
+        if lost or gained:
+            name = names.get(image_hash) or image_hash[:12]
+            lines.append(f"{name}: lost {sorted(lost)} gained {sorted(gained)}")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark and check the parser on recorded OCR detections")
+    parser.add_argument("recordings", help="Folder written by device_ocr_cli --record")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs, best is reported (default 3)")
+    parser.add_argument("--expected", help="Expected serials JSON to check against")
+    parser.add_argument("--save-expected", help="Write the serials found as the expectation file")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    records = list(RecordingStore(args.recordings).records())
+    load_seconds = time.perf_counter() - start
+    if not records:
+        print(f"No recordings in {args.recordings}")
+        return 2
+    detections = sum(len(record["detections"]) for _, record in records)
+    print(f"{len(records)} recordings, {detections} text boxes (loaded in {load_seconds:.2f} s)")
+
+    # One untimed run imports numpy and compiles the catalogue
+    run(records[:1])
+    best = None
+    for _ in range(args.repeat):
+        timings, serials = run(records)
+        if best is None or sum(timings.values()) < sum(best.values()):
+            best = timings
+    total = sum(best.values())
+    print(", ".join(f"{stage} {seconds * 1000:.1f} ms" for stage, seconds in best.items()))
+    print(f"Total {total:.3f} s: {len(records) / total:.0f} images/s, "
+          f"{sum(len(found) for found in serials.values())} serials")
+
+    if args.save_expected:
+        Path(args.save_expected).write_text(json.dumps(serials, indent=1, sort_keys=True), encoding='utf-8')
+        print(f"Expected serials written to {args.save_expected}")
+    if args.expected:
+        expected = json.loads(Path(args.expected).read_text(encoding='utf-8'))
+        names = {image_hash: record.get("image", "") for image_hash, record in records}
+        changes = diff_expected(serials, expected, names)
+        if changes:
+            print(f"\n{len(changes)} image(s) differ from {args.expected}:")
+            for line in changes:
+                print(f"  {line}")
+            return 1
+        print(f"All {len(expected)} images match {args.expected}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""
+Startup-time benchmark: time-to-first-frame of the GUI
+
+Launches the application with SERIAL_EXTRACTOR_STARTUP_PROBE set, which
+makes it write a timestamp once the main window has painted and exit.
+Each launch gets empty temporary session and cache folders
+(SERIAL_EXTRACTOR_SESSION_DIR, SERIAL_EXTRACTOR_CACHE_DIR), so no saved
+session is restored and the user's session and OCR cache are left alone.
+Measures the Python source and, optionally, the PyInstaller onefile
+build. Also reports how long importing easyocr/torch takes on its own,
+i.e. what the lazy import keeps off the startup path.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5]
+    python benchmarks/bench_startup.py --exe dist/TechnohullSerialExtractor.exe
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+PROBE_ENV_VAR = "SERIAL_EXTRACTOR_STARTUP_PROBE"
+# Session and OCR cache folders (session_store.SESSION_DIR_ENV_VAR, ocr_cache.CACHE_DIR_ENV_VAR)
+SESSION_DIR_ENV_VAR = "SERIAL_EXTRACTOR_SESSION_DIR"
+CACHE_DIR_ENV_VAR = "SERIAL_EXTRACTOR_CACHE_DIR"
+
+
+def time_to_first_frame(command, timeout):
+    """Launch command once, return seconds until the first frame was recorded"""
+    with tempfile.TemporaryDirectory() as tmp:
+        probe_file = Path(tmp) / "first_frame.txt"
+        env = dict(os.environ, **{
+            PROBE_ENV_VAR: str(probe_file),
+            SESSION_DIR_ENV_VAR: str(Path(tmp) / "session"),
+            CACHE_DIR_ENV_VAR: str(Path(tmp) / "cache"),
+        })
+        start = time.time()
+        subprocess.run(command, cwd=REPO_ROOT, env=env, timeout=timeout, check=True)
+        if not probe_file.exists():
+            raise RuntimeError(f"No first-frame timestamp written by {command}")
+        return float(probe_file.read_text(encoding='utf-8')) - start
+
+
+def time_import(module):
+    """Seconds to import a module in a fresh interpreter"""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", f"import {module}"], check=True)
+    return time.perf_counter() - start
+
+
+def report(label, samples):
+    """Print median/min/max for a list of timings"""
+    print(f"{label:<28} median {statistics.median(samples):6.2f} s   "
+          f"min {min(samples):6.2f} s   max {max(samples):6.2f} s   ({len(samples)} runs)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="launches per target")
+    parser.add_argument("--exe", help="path to the PyInstaller onefile build to measure as well")
+    parser.add_argument("--timeout", type=float, default=300, help="seconds before a launch is abandoned")
+    args = parser.parse_args()
+
+    targets = [("Python source", [sys.executable, str(REPO_ROOT / "device_ocr_extractor.py")])]
+    if args.exe:
+        targets.append(("Onefile executable", [str(Path(args.exe).resolve())]))
+
+    for label, command in targets:
+        samples = [time_to_first_frame(command, args.timeout) for _ in range(args.runs)]
+        report(f"{label} first frame", samples)
+
+    try:
+        samples = [time_import("easyocr") for _ in range(args.runs)]
+        report("import easyocr (deferred)", samples)
+    except subprocess.CalledProcessError:
+        print("easyocr not installed, skipping import timing")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Parity check for the single-pass engine serial scanner
+
+Compares device_parser.parse_device_text with the legacy implementation
+(engine header search followed by a rescan of the next 5 lines) on the
+OCR text dumps in benchmarks/corpus/ and on synthetic engine-heavy
+dumps, then times both on the synthetic dumps. Any difference in the
+devices found, or their order, fails the check. tests/test_engine_scanner.py
+runs the same parity checks under pytest.
+
+corpus/engine_screens.txt is hand-written in the layout of readtext output
+from engine screens (header variants, overlapping engine windows), not a
+recording of real captures; recorded dumps can be added next to it.
+
+Usage: python benchmarks/parity_engine_scanner.py [--corpus DIR] [--lines 50000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+sys.path.insert(0, str(BENCH_DIR))
+
+from bench_parser import legacy_parse_device_text  # noqa: E402
+from device_parser import parse_device_text  # noqa: E402
+
+ENGINE_LINES = [
+    "Engine 1", "ENGINES", "engine hours 1240", "Mercury Engine", "Model", "MODEL",
+    "model number", "Serial", "SERIAL NUMBER", "serial", "Serial 6725", "Yamaha",
+    "Volvo Penta", "XF450NSA", "6MLN1000296", "1E103027", "3B553644", "A1230833",
+    "D6-440A-G", "6467", "Status OK", "",
+]
+
+
+def build_engine_dump(line_count, seed):
+    """Random dump dense in engine headers, overlapping windows and keyword variants"""
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(line_count):
+        if rng.random() < 0.3:
+            # Unique serials so the check also covers the order of first occurrences
+            lines.append(rng.choice(("", "SN", "1E")) + str(rng.randrange(10 ** 7, 10 ** 9)))
+        else:
+            lines.append(rng.choice(ENGINE_LINES))
+    return '\n'.join(lines)
+
+
+def plain(devices):
+    """Drop the row index, which the legacy parser does not produce"""
+    return [{'product': device['product'], 'serial': device['serial']} for device in devices]
+
+
+def check(label, text):
+    """Compare both parsers on one dump, returns True when they agree"""
+    legacy = legacy_parse_device_text(text)
+    current = plain(parse_device_text(text))
+    if current != legacy:
+        print(f"✗ {label}: {len(current)} devices, legacy found {len(legacy)}")
+        return False
+    print(f"✓ {label}: {len(current)} devices")
+    return True
+
+
+def best_time(parser, text, repeat=3):
+    """Best of repeat runs in seconds"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parser(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=str(BENCH_DIR / "corpus"), help="folder of OCR text dumps (*.txt)")
+    parser.add_argument("--lines", type=int, default=50000, help="lines per synthetic dump")
+    parser.add_argument("--seeds", type=int, default=20, help="number of synthetic dumps")
+    args = parser.parse_args()
+
+    ok = True
+    for path in sorted(Path(args.corpus).glob("*.txt")):
+        ok &= check(path.name, path.read_text(encoding='utf-8'))
+    for seed in range(args.seeds):
+        ok &= check(f"synthetic #{seed}", build_engine_dump(2000, seed))
+
+    text = build_engine_dump(args.lines, seed=1234)
+    ok &= check(f"synthetic {args.lines} lines", text)
+    legacy_time = best_time(legacy_parse_device_text, text)
+    new_time = best_time(parse_device_text, text)
+    print(f"Legacy parser:   {legacy_time:.3f} s")
+    print(f"Scanner parser:  {new_time:.3f} s ({legacy_time / new_time:.1f}x)")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""
+Synthetic device-list screenshots for the pipeline benchmarks
+
+Renders Raymarine-style device tables (product name, product code,
+serial) followed by engine blocks with PIL. Product codes come from the
+device catalogue and serials use formats the parser accepts, so every
+screen has an exact ground truth. The rendered text boxes double as
+perfect readtext detections for runs without an OCR engine.
+"""
+
+import random
+import string
+import sys
+from pathlib import Path
+
+from PIL import Image, ImageDraw, ImageFont
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from device_catalog import default_catalog  # noqa: E402
+
+
+RESOLUTIONS = [(1280, 800), (1920, 1080), (3840, 2160)]
+ROW_COUNTS = [8, 24]
+ENGINE_BLOCKS = 2
+
+BACKGROUND = (18, 18, 18)
+HEADER_COLOR = (150, 150, 150)
+TEXT_COLOR = (235, 235, 235)
+# Column starts as a fraction of the width: name, code, serial
+COLUMNS = (0.05, 0.45, 0.65)
+
+
+def _device_serial(rng):
+    """Device serial in one of the Raymarine formats"""
+    kind = rng.randrange(3)
+    if kind == 0:  # TAZ2ZKB
+        return (''.join(rng.choices(string.ascii_uppercase, k=3)) + rng.choice(string.digits)
+                + ''.join(rng.choices(string.ascii_uppercase + string.digits, k=3)))
+    if kind == 1:  # 0330729
+        return ''.join(rng.choices(string.digits, k=rng.randint(7, 10)))
+    return f"J{rng.randrange(10 ** 6):06d}-{rng.randrange(10 ** 4):04d}"  # J497793-0051
+
+
+def _engine_serial(rng):
+    """Engine serial in one of the outboard formats"""
+    kind = rng.randrange(3)
+    if kind == 0:  # Yamaha 6MLN1000296
+        return f"6{''.join(rng.choices(string.ascii_uppercase, k=3))}{rng.randrange(10 ** 7):07d}"
+    if kind == 1:  # Mercury 1E103027
+        return f"1E{rng.randrange(10 ** 6):06d}"
+    return f"A{rng.randrange(10 ** 7):07d}"  # Volvo A1230833
+
+
+def _font(size):
+    """Arial where installed (as on the target laptops), else Pillow's bundled font"""
+    try:
+        return ImageFont.truetype("arial.ttf", size)
+    except OSError:
+        return ImageFont.load_default(size=size)
+
+
+def _products():
+    """(name, code) pairs for the catalogue device types that have a product code"""
+    catalog = default_catalog()
+    products = [(device_type, catalog.code_for(device_type)) for device_type in catalog.device_types]
+    return [(name, code) for name, code in products if code]
+
+
+class Screen:
+    """A rendered screenshot with its text boxes and expected serials"""
+
+    def __init__(self, image, detections, serials):
+        self.image = image
+        self.detections = detections
+        self.serials = serials
+
+
+def render_screen(width, height, device_rows, engine_blocks=ENGINE_BLOCKS, seed=0):
+    """Render one device-list screenshot"""
+    rng = random.Random(seed)
+    catalog = default_catalog()
+    products = _products()
+    lines = [[("Device List", COLUMNS[0])], [("Product", COLUMNS[0]), ("Code", COLUMNS[1]), ("Serial", COLUMNS[2])]]
+    serials = []
+    used = set()
+
+    def unique(make):
+        serial = make(rng)
+        while serial in used:
+            serial = make(rng)
+        used.add(serial)
+        return serial
+
+    for _ in range(device_rows):
+        name, code = rng.choice(products)
+        serial = unique(_device_serial)
+        serials.append(serial)
+        if rng.random() < 0.2:
+            # Long names wrap the serial onto the next line
+            lines.append([(name, COLUMNS[0]), (code, COLUMNS[1])])
+            lines.append([(serial, COLUMNS[2])])
+        else:
+            lines.append([(name, COLUMNS[0]), (code, COLUMNS[1]), (serial, COLUMNS[2])])
+    for number in range(1, engine_blocks + 1):
+        serial = unique(_engine_serial)
+        serials.append(serial)
+        lines.append([(f"Engine {number}", COLUMNS[0]), (rng.choice(catalog.engines), COLUMNS[1])])
+        lines.append([("Model", COLUMNS[0])])
+        lines.append([(serial, COLUMNS[0])])
+
+    pitch = height / (len(lines) + 2)
+    font = _font(max(10, int(min(pitch * 0.6, height / 30))))
+    image = Image.new('RGB', (width, height), BACKGROUND)
+    draw = ImageDraw.Draw(image)
+    detections = []
+    for line_idx, cells in enumerate(lines):
+        y = int(pitch * (line_idx + 1))
+        for text, column in cells:
+            x = int(width * column)
+            color = HEADER_COLOR if line_idx < 2 else TEXT_COLOR
+            draw.text((x, y), text, fill=color, font=font)
+            x0, y0, x1, y1 = draw.textbbox((x, y), text, font=font)
+            box = [[float(x0), float(y0)], [float(x1), float(y0)], [float(x1), float(y1)], [float(x0), float(y1)]]
+            detections.append([box, text, 1.0])
+    return Screen(image, detections, serials)
+
+
+def recall(devices, serials):
+    """(recall, extra serials) of parsed devices against the expected serials"""
+    found = {device['serial'] for device in devices}
+    expected = set(serials)
+    return len(found & expected) / len(expected) if expected else 1.0, len(found - expected)
@@ -0,0 +1,215 @@
+"""
+Device type catalogue
+
+One JSON file lists the vessel models, the device types with the product
+codes and name keywords that identify them, and the engine types. It is
+compiled into a code lookup table and a keyword automaton, so all
+extracted rows are resolved in one batch call.
+
+The file is looked up in this order, so a new product code can be added
+without rebuilding the executable:
+  1. the path in SERIAL_EXTRACTOR_CATALOG
+  2. device_catalog.json next to the executable (or this script)
+  3. assets/device_catalog.json shipped with the application
+An edited file that cannot be read or parsed is reported and the shipped
+catalogue is used instead, so a typo never stops the application.
+
+Device entries, in priority order (the first entry whose rule matches wins):
+  type           device type shown in the results table
+  codes          exact product codes (primary key, checked first)
+  code_prefixes  product code prefixes, e.g. GMDSS 12L####
+  keywords       rules on the upper-cased product name; a rule matches
+                 when all of its keywords are present as whole words or
+                 numbers (a "9" never matches inside "E70659")
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+
+CATALOG_ENV_VAR = "SERIAL_EXTRACTOR_CATALOG"
+CATALOG_FILENAME = "device_catalog.json"
+BUNDLED_CATALOG = Path(__file__).resolve().parent / "assets" / CATALOG_FILENAME
+# Errors of a catalogue file that cannot be read or parsed
+CATALOG_ERRORS = (OSError, ValueError, KeyError, TypeError)
+
+
+def _glued(neighbour, edge):
+    """True when a keyword edge continues into its neighbour (digit-digit or letter-letter)"""
+    return (neighbour.isdigit() and edge.isdigit()) or (neighbour.isalpha() and edge.isalpha())
+
+
+class KeywordIndex:
+    """Aho-Corasick automaton reporting which keywords occur in a text
+
+    A hit only counts when the keyword is not glued to more characters of
+    the same class (digits next to digits, letters next to letters).
+    """
+
+    def __init__(self, keywords):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        for keyword in dict.fromkeys(keywords):
+            self._add(keyword)
+        self._build_failure_links()
+
+    def _add(self, keyword):
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][char] = next_state
+            state = next_state
+        self._output[state].append(keyword)
+
+    def _build_failure_links(self):
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find(self, text):
+        """Set of keywords found in text as whole words/numbers"""
+        found = set()
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for end, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for keyword in output[state]:
+                if keyword in found:
+                    continue
+                start = end - len(keyword) + 1
+                if start > 0 and _glued(text[start - 1], keyword[0]):
+                    continue
+                if end + 1 < len(text) and _glued(text[end + 1], keyword[-1]):
+                    continue
+                found.add(keyword)
+        return found
+
+
+class DeviceCatalog:
+    """Compiled device catalogue: code table plus keyword index"""
+
+    def __init__(self, data, path=None, mtime=None):
+        self.path = path
+        self.mtime = mtime
+        self.entries = list(data.get("devices", []))
+        self.device_types = [entry["type"] for entry in self.entries]
+        self.vessel_models = list(data.get("vessel_models", []))
+        self.engines = list(data.get("engines", []))
+        self._by_code = {}
+        self._codes_by_type = {}
+        self._prefixes = []
+        self._rules = []
+        for entry in self.entries:
+            if entry.get("codes"):
+                self._codes_by_type.setdefault(entry["type"], entry["codes"][0])
+            for code in entry.get("codes", []):
+                self._by_code.setdefault(code.upper(), entry["type"])
+            for prefix in entry.get("code_prefixes", []):
+                self._prefixes.append((prefix.upper(), entry["type"]))
+            for rule in entry.get("keywords", []):
+                self._rules.append((frozenset(keyword.upper() for keyword in rule), entry["type"]))
+        self._index = KeywordIndex(keyword for rule, _ in self._rules for keyword in rule)
+
+    @classmethod
+    def from_file(cls, path):
+        """Load and compile a catalogue file"""
+        path = Path(path)
+        mtime = path.stat().st_mtime
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f), path, mtime)
+
+    def code_for(self, device_type):
+        """Standard product code of a device type, or None"""
+        return self._codes_by_type.get(device_type)
+
+    def match(self, product_name, code=""):
+        """Device type for a product name and code, or None"""
+        code = (code or "").upper()
+        device_type = self._by_code.get(code)
+        if device_type is not None:
+            return device_type
+        for prefix, device_type in self._prefixes:
+            if code.startswith(prefix):
+                return device_type
+        found = self._index.find(product_name.upper())
+        if found:
+            for rule, device_type in self._rules:
+                if rule <= found:
+                    return device_type
+        return None
+
+    def match_many(self, products):
+        """Device types for (product name, code) pairs, in order"""
+        return [self.match(product_name, code) for product_name, code in products]
+
+
+def catalog_path():
+    """Catalogue file to use: env override, file next to the executable, bundled file"""
+    configured = os.environ.get(CATALOG_ENV_VAR, "").strip()
+    if configured:
+        return Path(configured)
+    app_dir = Path(sys.executable if getattr(sys, 'frozen', False) else __file__).resolve().parent
+    local = app_dir / CATALOG_FILENAME
+    return local if local.exists() else BUNDLED_CATALOG
+
+
+_default_catalog = None
+_load_error = None
+
+
+def default_catalog():
+    """Catalogue loaded from catalog_path() (loaded on first use)
+
+    Falls back to the shipped catalogue when an override or local file
+    cannot be loaded; the error is kept for catalog_load_error().
+    """
+    global _default_catalog, _load_error
+    if _default_catalog is None:
+        path = catalog_path()
+        try:
+            _default_catalog = DeviceCatalog.from_file(path)
+        except CATALOG_ERRORS as e:
+            if path == BUNDLED_CATALOG:
+                raise
+            _load_error = f"{path}: {e}"
+            if sys.stderr is not None:
+                print(f"⚠ Device catalogue not loaded, using the built-in one ({_load_error})", file=sys.stderr)
+            _default_catalog = DeviceCatalog.from_file(BUNDLED_CATALOG)
+    return _default_catalog
+
+
+def catalog_load_error():
+    """Why the catalogue file could not be loaded on start (built-in one in use), or None"""
+    default_catalog()
+    return _load_error
+
+
+def reload_if_changed():
+    """Reload the catalogue when its file (or the file to use) changed, returns True on reload
+
+    A file that cannot be read or parsed raises and leaves the current
+    catalogue in place.
+    """
+    global _default_catalog
+    current = default_catalog()
+    path = catalog_path()
+    if path == current.path and path.stat().st_mtime == current.mtime:
+        return False
+    _default_catalog = DeviceCatalog.from_file(path)
+    return True
@@ -0,0 +1,154 @@
+"""
+Export of extracted device rows
+
+Shared by the GUI and the command line so both write the same TXT
+layout. Also provides JSON and CSV output for scripted runs. Exports
+can record the OCR engine and profile the rows were extracted with.
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+
+from device_catalog import default_catalog
+from device_parser import split_product_code
+
+
+# Device type shown for rows that could not be matched automatically
+UNASSIGNED_DEVICE_TYPE = "[Click to select device type]"
+
+EXPORT_FORMATS = ("txt", "json", "csv")
+CSV_COLUMNS = ["vessel_model", "vessel_name", "sap", "device_type", "code", "serial", "image", "ocr_engine",
+               "ocr_profile"]
+
+
+def build_rows(devices, image=None):
+    """Turn parsed devices into export rows (device type, code, serial)"""
+    products = [split_product_code(device['product']) for device in devices]
+    device_types = default_catalog().match_many(products)
+    rows = []
+    for device, (_, code), device_type in zip(devices, products, device_types):
+        rows.append({
+            'device_type': device_type or UNASSIGNED_DEVICE_TYPE,
+            'code': code,
+            'serial': device['serial'],
+            'product': device['product'],
+            'image': image or "",
+        })
+    return rows
+
+
+def default_export_name(sap_number, extension="txt"):
+    """Default export filename for a SAP number (SN_[SAP].txt)"""
+    if not sap_number or not sap_number.strip():
+        return f"SN_NoSAP_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+    return f"SN_{sap_number.strip()}.{extension}"
+
+
+def ocr_summary(used):
+    """Export OCR info from the (engine, profile) pairs rows were extracted with, or None
+
+    Several engines or profiles are joined with "/"; unknown ones are skipped.
+    """
+    engines = sorted({engine for engine, _ in used if engine})
+    profiles = sorted({profile for _, profile in used if profile})
+    if not engines and not profiles:
+        return None
+    return {'engine': '/'.join(engines) or None, 'profile': '/'.join(profiles) or None}
+
+
+def format_ocr(ocr):
+    """Short description of an export's OCR settings ("easyocr, fast profile")"""
+    if not ocr.get('profile'):
+        return ocr.get('engine') or ""
+    return f"{ocr.get('engine', '')}, {ocr['profile']} profile"
+
+
+def format_txt(rows, vessel_model, vessel_name, sap_number, ocr=None):
+    """Format rows in the TXT layout, returns (text, exported count)"""
+    out = io.StringIO()
+    # Header with vessel info - format: (MODEL) - (NAME)
+    out.write(f"{vessel_model} - {vessel_name}\n")
+    # SAP line
+    out.write(f"{sap_number}\n")
+    # Divider line
+    out.write("___________________________________\n\n")
+
+    # Collect devices grouped by type
+    devices_by_type = {}
+    for row in rows:
+        device_type = row['device_type']
+        # Skip if device type not selected
+        if not device_type or device_type == UNASSIGNED_DEVICE_TYPE:
+            continue
+        devices_by_type.setdefault(device_type, []).append(row)
+
+    # Export grouped by device type
+    exported_count = 0
+    for device_type, devices in devices_by_type.items():
+        # Append 'GPS' to AXIOM screens
+        display_type = device_type
+        if device_type.upper().startswith("AXIOM"):
+            display_type = f"{device_type} GPS"
+        count = len(devices)
+        if count > 1:
+            display_type = f"{display_type} (x{count})"
+        out.write(f"{display_type}:\n")
+        # Write all serial numbers for this device type
+        for device in devices:
+            if device['code']:
+                out.write(f"{device['code']}\t{device['serial']}\n")
+            else:
+                out.write(f"{device['serial']}\n")
+            exported_count += 1
+        # Add blank line between device types
+        out.write("\n")
+
+    # OCR engine and profile as the last line
+    if ocr:
+        out.write(f"OCR: {format_ocr(ocr)}\n")
+
+    return out.getvalue(), exported_count
+
+
+def write_export(file_path, rows, vessel_model, vessel_name, sap_number, fmt="txt", ocr=None):
+    """Write rows to file_path in the given format, returns exported count
+
+    ocr: optional {"engine": ..., "profile": ...} the rows were extracted with
+    """
+    if fmt == "txt":
+        text, exported_count = format_txt(rows, vessel_model, vessel_name, sap_number, ocr)
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return exported_count
+
+    items = [
+        {
+            'device_type': "" if row['device_type'] == UNASSIGNED_DEVICE_TYPE else row['device_type'],
+            'code': row['code'],
+            'serial': row['serial'],
+            'image': row.get('image', ""),
+        }
+        for row in rows
+    ]
+    if fmt == "json":
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'vessel_model': vessel_model,
+                'vessel_name': vessel_name,
+                'sap': sap_number,
+                'ocr': ocr,
+                'items': items,
+            }, f, indent=2, ensure_ascii=False)
+    elif fmt == "csv":
+        with open(file_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
+            writer.writeheader()
+            ocr_columns = {'ocr_engine': (ocr or {}).get('engine') or "", 'ocr_profile': (ocr or {}).get('profile') or ""}
+            for item in items:
+                writer.writerow({'vessel_model': vessel_model, 'vessel_name': vessel_name, 'sap': sap_number, **item,
+                                 **ocr_columns})
+    else:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    return len(items)
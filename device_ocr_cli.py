@@ -0,0 +1,169 @@
+"""
+Technohull Marine Device Serial Number Extractor - command line
+
+Headless batch extraction for build servers and scripts. Runs the same
+OCR + parse pipeline as the GUI without importing tkinter.
+
+Usage:
+    python -m device_ocr_cli screenshots/ --sap 9100967 --vessel-model GT9
+    python -m device_ocr_cli "vessel/*.png" --format json -o results.json
+    python -m device_ocr_cli captures/ --record recordings/   (store OCR detections)
+    python -m device_ocr_cli captures/ --replay recordings/   (parse them again, no OCR)
+"""
+
+import argparse
+import glob
+import multiprocessing
+import sys
+from pathlib import Path
+
+from device_export import EXPORT_FORMATS, build_rows, default_export_name, write_export
+from ocr_engine import DEFAULT_OCR_PROFILE, OCR_ENGINES, OCR_PROFILES, default_engine
+from ocr_preprocess import DEFAULT_PREPROCESS_PROFILE, PREPROCESS_PROFILES
+
+
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".bmp", ".gif", ".tiff", ".tif"}
+
+
+def collect_images(inputs, recursive=False):
+    """Expand files, directories and glob patterns into a sorted image list"""
+    images = []
+    seen = set()
+
+    def add(path):
+        key = path.resolve()
+        if key not in seen and path.suffix.lower() in IMAGE_EXTENSIONS:
+            seen.add(key)
+            images.append(path)
+
+    for entry in inputs:
+        path = Path(entry)
+        if path.is_dir():
+            pattern = "**/*" if recursive else "*"
+            for child in sorted(path.glob(pattern)):
+                if child.is_file():
+                    add(child)
+        elif path.is_file():
+            add(path)
+        else:
+            for match in sorted(glob.glob(entry, recursive=True)):
+                if Path(match).is_file():
+                    add(Path(match))
+    return images
+
+
+def build_parser():
+    """Build the argument parser"""
+    parser = argparse.ArgumentParser(
+        prog="python -m device_ocr_cli",
+        description="Extract device and engine serial numbers from screenshots without the GUI.",
+    )
+    parser.add_argument("inputs", nargs="+", help="image files, directories or glob patterns")
+    parser.add_argument("-o", "--output", help="output file or directory (default: SN_[SAP].<format> in the current directory)")
+    parser.add_argument("-f", "--format", choices=EXPORT_FORMATS, default="txt", help="export format (default: txt)")
+    parser.add_argument("-r", "--recursive", action="store_true", help="search directories recursively")
+    parser.add_argument("--sap", default="", help="SAP number, used in the header and the default filename")
+    parser.add_argument("--vessel-name", default="", help="vessel name for the export header")
+    parser.add_argument("--vessel-model", default="", help="vessel model for the export header")
+    parser.add_argument("--gpu", action="store_true", help="run OCR on the GPU")
+    parser.add_argument("-j", "--workers", type=int, help="OCR worker processes (default: half the CPU cores, max 4)")
+    parser.add_argument("--no-daemon", action="store_true", help="do not use a running OCR daemon")
+    parser.add_argument("--no-cache", action="store_true", help="ignore the on-disk OCR result cache")
+    parser.add_argument("--preprocess", choices=PREPROCESS_PROFILES, default=DEFAULT_PREPROCESS_PROFILE,
+                        help=f"image preprocessing profile before OCR (default: {DEFAULT_PREPROCESS_PROFILE})")
+    parser.add_argument("--targeted", action="store_true",
+                        help="detect text first and only recognise rows that can hold device or engine serials")
+    parser.add_argument("--engine", choices=OCR_ENGINES, default=default_engine(),
+                        help="OCR engine: easyocr (torch) or onnx (exported models on onnxruntime, "
+                             "see python -m ocr_onnx --export); default: %(default)s")
+    parser.add_argument("--profile", choices=OCR_PROFILES, default=DEFAULT_OCR_PROFILE,
+                        help=f"OCR speed/accuracy profile: fast, balanced or thorough (default: {DEFAULT_OCR_PROFILE})")
+    replay = parser.add_mutually_exclusive_group()
+    replay.add_argument("--record", metavar="DIR",
+                        help="store the OCR detections of every image in DIR, keyed by image content (skips the OCR cache)")
+    replay.add_argument("--replay", metavar="DIR",
+                        help="use detections recorded with --record instead of running OCR")
+    return parser
+
+
+def main(argv=None):
+    """Command line entry point"""
+    args = build_parser().parse_args(argv)
+
+    images = collect_images(args.inputs, recursive=args.recursive)
+    if not images:
+        print("✗ No images found", file=sys.stderr)
+        return 2
+
+    output = Path(args.output) if args.output else Path.cwd()
+    if output.is_dir():
+        output = output / default_export_name(args.sap, args.format)
+
+    from ocr_backends import EasyOcrBackend, OnnxBackend, RecordingBackend, RecordingStore, ReplayBackend
+    from ocr_cache import OcrCache
+    from ocr_engine import OcrService, default_worker_count, format_timings, ocr_options, ocr_params
+
+    workers = min(args.workers, len(images)) if args.workers else default_worker_count(len(images))
+
+    def on_status(text):
+        print(text, file=sys.stderr)
+
+    options = ocr_options(args.preprocess, targeted=args.targeted, engine=args.engine, profile=args.profile)
+    backend = None
+    if args.replay:
+        backend = ReplayBackend(RecordingStore(args.replay), on_status=on_status)
+    elif args.record:
+        # Cache hits would bypass the recording, so every image is OCR'd
+        if args.engine == "onnx":
+            ocr_backend = OnnxBackend(workers, on_status, options)
+        else:
+            ocr_backend = EasyOcrBackend(workers, args.gpu, not args.no_daemon, on_status, options)
+        backend = RecordingBackend(ocr_backend, RecordingStore(args.record), params=ocr_params(options))
+    cache = None if args.no_cache or backend is not None else OcrCache()
+    service = OcrService(
+        workers=workers,
+        gpu=args.gpu,
+        use_daemon=not args.no_daemon,
+        cache=cache,
+        on_status=on_status,
+        options=options,
+        backend=backend,
+    )
+
+    rows = []
+    processed = 0
+    interrupted = False
+    try:
+        for image_path, (_, devices) in zip(images, service.extract(images)):
+            processed += 1
+            rows.extend(build_rows(devices, image=str(image_path)))
+            print(f"[{processed}/{len(images)}] {image_path.name}: {len(devices)} items", file=sys.stderr)
+    except KeyboardInterrupt:
+        # Ctrl-C: stop the workers and export what was extracted so far
+        interrupted = True
+        print(f"⚠ Interrupted after {processed}/{len(images)} images, exporting partial results", file=sys.stderr)
+    finally:
+        service.close()
+        if service.timings:
+            settings = "replay" if args.replay else f"{args.engine}, {args.profile}, {args.preprocess}"
+            print(f"Timings ({settings}): {format_timings(service.timings)}", file=sys.stderr)
+        if cache is not None:
+            print(cache.stats_text().capitalize(), file=sys.stderr)
+            cache.close()
+
+    exported_count = write_export(
+        output,
+        rows,
+        args.vessel_model.strip() or "N/A",
+        args.vessel_name.strip() or "N/A",
+        args.sap.strip() or "N/A",
+        fmt=args.format,
+        ocr=backend.ocr_info() if args.replay else {'engine': args.engine, 'profile': args.profile},
+    )
+    print(f"✓ Exported {exported_count} items to {output}", file=sys.stderr)
+    return 130 if interrupted else 0
+
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    sys.exit(main())
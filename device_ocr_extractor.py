@@ -10,12 +10,39 @@ NO TESSERACT REQUIRED!
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 from PIL import Image, ImageTk
-import easyocr
-import re
 from pathlib import Path
-from datetime import datetime
-import json
+import multiprocessing
+import os
+import queue
 import threading
+import time
+
+from device_catalog import CATALOG_ERRORS, catalog_load_error, default_catalog, reload_if_changed
+from device_export import UNASSIGNED_DEVICE_TYPE, build_rows, default_export_name, ocr_summary, write_export
+from device_parser import auto_match_device_type, parse_device_text
+from image_cache import ImageCache
+from image_viewer import ImageViewer
+from ocr_cache import OcrCache, hash_file
+from ocr_engine import (
+    DEFAULT_OCR_PROFILE, OCR_PROFILES, ExtractionCancelled, ExtractionJob, OcrService, format_timings, ocr_options,
+)
+from ocr_layout import row_box
+from session_store import SessionAutosaver, default_session_path, load_session
+from thumbnail_strip import ThumbnailStrip
+
+
+# EasyOCR/torch are imported lazily by ocr_engine (warm-up thread or first
+# extraction) so the window can paint without waiting for them.
+
+# Startup benchmark hook: write time-to-first-frame to this file and exit
+STARTUP_PROBE_ENV_VAR = "SERIAL_EXTRACTOR_STARTUP_PROBE"
+
+# How often the device catalogue file is checked for changes
+CATALOG_POLL_MS = 2000
+# How often per-image extraction results are moved into the table
+RESULTS_POLL_MS = 100
+# How often the session is checked for changes and autosaved
+AUTOSAVE_MS = 5000
 
 
 class DeviceExtractorGUI:
@@ -24,23 +51,13 @@ class DeviceExtractorGUI:
 
     def _on_device_dropdown_selected(self, event=None):
         device = self.device_dropdown_add.get()
-        code = getattr(self, 'device_standard_codes', {}).get(device)
+        code = self.catalog.code_for(device)
         if code:
             self.product_code_entry.delete(0, tk.END)
             self.product_code_entry.insert(0, code)
         else:
             self.product_code_entry.delete(0, tk.END)
 
-    # Map device names to standard codes (instance variable)
-    def _init_device_standard_codes(self):
-        self.device_standard_codes = {
-            "AXIOM 2 PRO 12": "E70656",
-            "RAYMARINE RS 150": "E70310",
-            "RADAR QUANTUM 2 DOPPLER": "E70498",
-            "RAYMARINE AIS 700": "E70476",
-            "RAYMARINE RAY53 VHF": "E70524"
-        }
-
 
     def _on_mousewheel(self, event):
         # Windows uses event.delta, positive/negative for up/down
@@ -56,10 +73,278 @@ class DeviceExtractorGUI:
         self.image_path = None
         self.image_paths = []
         self.extracted_devices = []
-        self.reader = None
+        # Content hash of each image whose rows are in the table, and the
+        # source image/row of every extracted table item
+        self.image_hashes = {}
+        self.row_meta = {}
+        # readtext detections of each extracted image, for the OCR box highlight
+        self.image_detections = {}
+        # Open zoom/pan viewer (None when closed)
+        self.viewer = None
+        # Edits of rows whose image is being re-extracted, keyed by (image, code, serial)
+        self._stashed_rows = {}
+        self.planned_images = 0
+        # Per-image results from the extraction thread, drained by the Tk loop
+        self.results_queue = queue.Queue()
+        # Cancel/pause controls of the running extraction (None when idle)
+        self.extraction_job = None
+        self.ocr_cache = self._open_ocr_cache()
+        # Decoded screenshots shared by the preview, thumbnails, enlarged view and OCR
+        self.image_cache = ImageCache()
+        self.ocr_profile = DEFAULT_OCR_PROFILE
+        self.ocr_service = self._create_ocr_service()
         self.is_loading = False
-        self._init_device_standard_codes()
+        self.catalog = default_catalog()
+        self._catalog_error = catalog_load_error()
         self.setup_ui()
+        # Session file: restored on start, autosaved in the background
+        self.session_autosaver = SessionAutosaver(default_session_path(), on_error=self._on_autosave_error)
+        self._saved_session = None
+        # Changed images found on restore are re-extracted once the engine is up
+        self._warm_up_done = False
+        self._refresh_after_warm_up = False
+        self._restore_session()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        # Load the OCR engine in the background once the window is up
+        self.root.after(200, self._start_warm_up)
+        # Pick up edits to the device catalogue file while running
+        self.root.after(CATALOG_POLL_MS, self._poll_catalog)
+        self.root.after(AUTOSAVE_MS, self._autosave)
+        if self._catalog_error:
+            self.root.after(300, lambda: messagebox.showwarning(
+                "Device Catalogue",
+                f"The device catalogue file could not be loaded:\n{self._catalog_error}\n\n"
+                "The built-in catalogue is used until the file is fixed."
+            ))
+        
+    def _start_warm_up(self):
+        """Build and prime the OCR engine on a background thread"""
+        self.is_loading = True
+        self.status_label.config(text="Loading OCR engine in the background... (10-30 seconds)")
+        thread = threading.Thread(target=self._perform_warm_up, daemon=True)
+        thread.start()
+        
+    def _perform_warm_up(self):
+        """Warm up the OCR engine (runs in background thread)"""
+        try:
+            engine = self.ocr_service.warm_up()
+            self.root.after(0, lambda: self._on_warm_up_done(f"✓ OCR engine ready ({engine}, {self.ocr_profile} profile)"))
+        except Exception as e:
+            self.root.after(0, lambda e=e: self._on_warm_up_done(f"⚠ OCR engine failed to load, will retry on extract: {e}"))
+        
+    def _on_warm_up_done(self, status_text):
+        """Mark the OCR engine as ready (runs in main thread)"""
+        self.is_loading = False
+        self._warm_up_done = True
+        self.status_label.config(text=status_text)
+        if self._refresh_after_warm_up and self.extraction_job is None:
+            self._refresh_after_warm_up = False
+            self.extract_devices(incremental=True)
+        
+    def _create_ocr_service(self):
+        """OCR service for the selected OCR profile"""
+        return OcrService(
+            cache=self.ocr_cache,
+            on_status=self._set_status_async,
+            options=ocr_options(profile=self.ocr_profile),
+            image_cache=self.image_cache,
+        )
+
+    def on_profile_selected(self, event=None):
+        """Switch the OCR profile, the new engine loads in the background"""
+        profile = self.profile_dropdown.get()
+        if profile == self.ocr_profile:
+            return
+        if self.is_loading or self.extraction_job is not None:
+            self.profile_dropdown.set(self.ocr_profile)
+            self.status_label.config(text="⚠ The OCR profile can be changed once the OCR engine is idle")
+            return
+        self.ocr_service.close()
+        self.ocr_profile = profile
+        self.ocr_service = self._create_ocr_service()
+        self._warm_up_done = False
+        self._start_warm_up()
+
+    def _open_ocr_cache(self):
+        """Open the on-disk OCR result cache (None if it cannot be opened)"""
+        try:
+            return OcrCache()
+        except Exception:
+            return None
+        
+    def _set_status_async(self, text):
+        """Update the status bar from a background thread"""
+        self.root.after(0, lambda: self.status_label.config(text=text))
+        
+    def _poll_catalog(self):
+        """Reload the device catalogue when its file changed and refresh the dropdowns"""
+        try:
+            reloaded = reload_if_changed()
+            self._catalog_error = None
+        except CATALOG_ERRORS as e:
+            # Keep the current catalogue while the file is being edited
+            if str(e) != self._catalog_error:
+                self._catalog_error = str(e)
+                self.status_label.config(text=f"⚠ Device catalogue not reloaded: {e}")
+            reloaded = False
+        if reloaded:
+            self.catalog = default_catalog()
+            self.available_device_types = list(self.catalog.device_types)
+            self.device_dropdown_add.configure(values=self.catalog.device_types)
+            self.engine_dropdown_add.configure(values=self.catalog.engines)
+            self.vessel_model_entry.configure(values=self.catalog.vessel_models)
+            self.status_label.config(text=f"✓ Device catalogue reloaded ({self.catalog.path.name})")
+        self.root.after(CATALOG_POLL_MS, self._poll_catalog)
+        
+    def _session_fields(self):
+        """Vessel/SAP widgets saved with the session, with their placeholder text"""
+        return [
+            ("vessel_name", self.vessel_name_entry, "e.g., Sea Explorer"),
+            ("vessel_model", self.vessel_model_entry, "Select model..."),
+            ("sap", self.sap_entry, "e.g., 9100967"),
+        ]
+
+    def _session_snapshot(self):
+        """Current images, detections, table rows and vessel fields as a session dict"""
+        rows = []
+        for item in self.tree.get_children():
+            _, device_type, code, serial = self.tree.item(item, 'values')
+            meta = self.row_meta.get(item, {})
+            rows.append({
+                "selected": self.device_selected.get(item, False),
+                "device_type": self.device_types.get(item, device_type),
+                "code": code,
+                "serial": serial,
+                "image": meta.get('image'),
+                "row": meta.get('row'),
+                "ocr_engine": meta.get('ocr_engine'),
+                "ocr_profile": meta.get('ocr_profile'),
+            })
+        fields = {}
+        for key, widget, placeholder in self._session_fields():
+            value = widget.get()
+            fields[key] = "" if value == placeholder else value
+        return {
+            "images": [{"path": path, "hash": self.image_hashes.get(path)} for path in self.image_paths],
+            "current": self.current_image_index if self.image_paths else 0,
+            # Detection lists are never modified once stored, so snapshots share them
+            "detections": {
+                self.image_hashes[path]: detections
+                for path, detections in self.image_detections.items() if path in self.image_hashes
+            },
+            "rows": rows,
+            "fields": fields,
+            "profile": self.ocr_profile,
+        }
+
+    def _autosave(self, reschedule=True):
+        """Hand the session to the background writer when it changed since the last save"""
+        snapshot = self._session_snapshot()
+        if snapshot != self._saved_session:
+            self._saved_session = snapshot
+            self.session_autosaver.submit(snapshot)
+        if reschedule:
+            self.root.after(AUTOSAVE_MS, self._autosave)
+
+    def _on_autosave_error(self, error):
+        """Report a failed session write (called on the writer thread)"""
+        self._set_status_async(f"⚠ Session not saved: {error}")
+
+    def _restore_session(self):
+        """Reload the last session; OCR only runs again for images whose content changed"""
+        try:
+            session = load_session(self.session_autosaver.path)
+        except (OSError, ValueError) as e:
+            self.status_label.config(text=f"⚠ Previous session not restored: {e}")
+            return
+        if not session:
+            return
+        images = [image for image in session.get("images", []) if os.path.exists(image["path"])]
+        detections = session.get("detections", {})
+        self.image_paths = [image["path"] for image in images]
+        self.image_hashes = {image["path"]: image["hash"] for image in images if image.get("hash")}
+        self.image_detections = {
+            path: detections[image_hash] for path, image_hash in self.image_hashes.items() if image_hash in detections
+        }
+        for row in session.get("rows", []):
+            item_id = self.tree.insert("", tk.END, values=(
+                "☑" if row["selected"] else "☐", row["device_type"], row["code"], row["serial"]
+            ))
+            self.device_selected[item_id] = row["selected"]
+            self.device_types[item_id] = row["device_type"]
+            if row.get("image"):
+                self.row_meta[item_id] = {
+                    'image': row["image"],
+                    'row': row.get("row"),
+                    'ocr_engine': row.get("ocr_engine"),
+                    'ocr_profile': row.get("ocr_profile"),
+                }
+        for key, widget, placeholder in self._session_fields():
+            value = session.get("fields", {}).get(key)
+            if not value:
+                continue
+            if widget is self.vessel_model_entry:
+                widget.set(value)
+            else:
+                widget.delete(0, tk.END)
+                widget.insert(0, value)
+                widget.configure(text_color=self.fg_primary)
+        profile = session.get("profile")
+        if profile in OCR_PROFILES and profile != self.ocr_profile:
+            # The engine has not started loading yet, swap the service before warm-up
+            self.ocr_service.close()
+            self.ocr_profile = profile
+            self.ocr_service = self._create_ocr_service()
+            self.profile_dropdown.set(profile)
+        if self.tree.get_children():
+            self.export_btn.config(state=tk.NORMAL)
+        if self.image_paths:
+            self.current_image_index = min(session.get("current", 0), len(self.image_paths) - 1)
+            self.image_path = self.image_paths[self.current_image_index]
+            self.display_image(self.image_path)
+            self.extract_btn.config(state=tk.NORMAL)
+            self.show_thumbnails()
+        self._saved_session = self._session_snapshot()
+        self.status_label.config(
+            text=f"✓ Restored previous session: {len(self.image_paths)} image(s), {len(self.tree.get_children())} items"
+        )
+        # Hash the images off the Tk thread to find the ones edited since the save
+        thread = threading.Thread(target=self._check_session_images, args=(dict(self.image_hashes),), daemon=True)
+        thread.start()
+
+    def _check_session_images(self, saved_hashes):
+        """Find restored images whose content changed (runs in background thread)"""
+        changed = []
+        for path, image_hash in saved_hashes.items():
+            try:
+                if hash_file(path) != image_hash:
+                    changed.append(path)
+            except OSError:
+                continue
+        if changed:
+            self.root.after(0, lambda: self._on_session_images_changed(changed))
+
+    def _on_session_images_changed(self, changed):
+        """Re-extract the images that changed since the session was saved"""
+        if self.extraction_job is not None:
+            return
+        self.status_label.config(text=f"{len(changed)} image(s) changed since the last session, re-extracting...")
+        if self._warm_up_done:
+            self.extract_devices(incremental=True)
+        else:
+            self._refresh_after_warm_up = True
+
+    def on_close(self, save_session=True):
+        """Save the session, shut down OCR worker processes and close the window"""
+        if self.extraction_job is not None:
+            self.extraction_job.cancel()
+        if save_session:
+            self._autosave(reschedule=False)
+        self.session_autosaver.close()
+        self.ocr_service.close()
+        if self.ocr_cache is not None:
+            self.ocr_cache.close()
+        self.root.destroy()
         
     def add_manual_engine(self):
         """Add engine manually from dropdown"""
@@ -209,7 +494,7 @@ class DeviceExtractorGUI:
         model_label.pack(side="left", padx=(0, 12))
         self.vessel_model_entry = ctk.CTkComboBox(
             model_row,
-            values=["GS38", "GTX", "GT7", "GT9", "ALPHA 40", "ALPHA 45", "ALPHA 50", "OMEGA47", "XPD"],
+            values=self.catalog.vessel_models,
             font=("Arial", 12),
             fg_color="#e0e0e0",
             text_color="#222222",
@@ -272,6 +557,23 @@ class DeviceExtractorGUI:
         )
         self.upload_btn.pack(side=tk.LEFT, padx=5)
 
+        self.add_images_btn = tk.Button(
+            button_frame,
+            text="➕ Add Images",
+            command=self.add_images,
+            font=("Arial", 11, "bold"),
+            bg=self.accent_blue,
+            fg="#222222",
+            padx=20,
+            pady=10,
+            cursor="hand2",
+            relief=tk.FLAT,
+            activebackground="#e0e0e0",
+            borderwidth=0,
+            disabledforeground="#7f8c8d"
+        )
+        self.add_images_btn.pack(side=tk.LEFT, padx=5)
+
         self.extract_btn = tk.Button(
             button_frame,
             text="🔍 Extract Devices & Engines",
@@ -290,6 +592,42 @@ class DeviceExtractorGUI:
         )
         self.extract_btn.pack(side=tk.LEFT, padx=5)
 
+        self.pause_btn = tk.Button(
+            button_frame,
+            text="⏸ Pause",
+            command=self.toggle_pause_extraction,
+            font=("Arial", 11, "bold"),
+            bg=self.accent_blue,
+            fg="#222222",
+            padx=20,
+            pady=10,
+            cursor="hand2",
+            relief=tk.FLAT,
+            state=tk.DISABLED,
+            activebackground="#e0e0e0",
+            borderwidth=0,
+            disabledforeground="#7f8c8d"
+        )
+        self.pause_btn.pack(side=tk.LEFT, padx=5)
+
+        self.cancel_btn = tk.Button(
+            button_frame,
+            text="✖ Cancel",
+            command=self.cancel_extraction,
+            font=("Arial", 11, "bold"),
+            bg=self.accent_blue,
+            fg="#222222",
+            padx=20,
+            pady=10,
+            cursor="hand2",
+            relief=tk.FLAT,
+            state=tk.DISABLED,
+            activebackground="#e0e0e0",
+            borderwidth=0,
+            disabledforeground="#7f8c8d"
+        )
+        self.cancel_btn.pack(side=tk.LEFT, padx=5)
+
         self.export_btn = tk.Button(
             button_frame,
             text="💾 Export to TXT",
@@ -307,6 +645,18 @@ class DeviceExtractorGUI:
             disabledforeground="#7f8c8d"
         )
         self.export_btn.pack(side=tk.LEFT, padx=5)
+
+        tk.Label(button_frame, text="OCR profile:", font=("Arial", 9, "bold"), bg=self.bg_dark, fg=self.fg_primary).pack(side=tk.LEFT, padx=(15, 5))
+        self.profile_dropdown = ttk.Combobox(
+            button_frame,
+            values=list(OCR_PROFILES),
+            state="readonly",
+            width=10,
+            font=("Arial", 9)
+        )
+        self.profile_dropdown.set(self.ocr_profile)
+        self.profile_dropdown.bind("<<ComboboxSelected>>", self.on_profile_selected)
+        self.profile_dropdown.pack(side=tk.LEFT, padx=5)
         
         # Image preview frame
         import customtkinter as ctk
@@ -358,11 +708,15 @@ class DeviceExtractorGUI:
         )
         self.enlarge_btn.pack(pady=(0, 10))
 
-        # Thumbnails frame
-        self.thumbnails_frame = tk.Frame(preview_frame, bg=self.bg_medium, borderwidth=0, highlightthickness=0)
-        self.thumbnails_frame.pack(fill=tk.X, pady=5)
-        self.thumbnail_images = []  # Store references
-        self.thumbnail_buttons = []
+        # Thumbnail strip (thumbnails are made in the background, only the visible ones are drawn)
+        self.thumbnail_strip = ThumbnailStrip(
+            preview_frame,
+            self.image_cache,
+            on_select=self.on_thumbnail_click,
+            bg=self.bg_medium,
+            highlight=self.accent_blue,
+        )
+        self.thumbnail_strip.pack(fill=tk.X, pady=5)
         self.current_image_index = 0
         
         # Results frame
@@ -386,20 +740,7 @@ class DeviceExtractorGUI:
         tk.Label(add_device_frame, text="Add Device Manually:", font=("Arial", 9, "bold"), bg=self.bg_medium, fg=self.fg_primary).pack(side=tk.LEFT, padx=5)
         self.device_dropdown_add = ttk.Combobox(
             add_device_frame,
-            values=[
-                "AXIOM 2 PRO 9",
-                "AXIOM 2 PRO 12",
-                "AXIOM 2 PRO 16",
-                "GMDSS",
-                "RAYMARINE AIS 700",
-                "RADAR QUANTUM 2",
-                "RADAR QUANTUM 2 DOPPLER",
-                "THERMAL CAMERA",
-                "RAYMARINE RAY53 VHF",
-                "RAYMARINE RS 150",
-                "CONNECT 50",
-                "OTHER DEVICE"
-            ],
+            values=self.catalog.device_types,
             state="readonly",
             width=25,
             font=("Arial", 9)
@@ -463,20 +804,7 @@ class DeviceExtractorGUI:
         tk.Label(engine_frame, text="Add Engine Manually:", font=("Arial", 9, "bold"), bg=self.bg_medium, fg=self.fg_primary).pack(side=tk.LEFT, padx=5)
         self.engine_dropdown_add = ttk.Combobox(
             engine_frame,
-            values=[
-                "300 MERCURY",
-                "350 V10 MERCURY",
-                "400 V10 MERCURY",
-                "400R V10 MERCURY",
-                "500 MERCURY",
-                "500R MERCURY",
-                "600 MERCURY",
-                "300 YAMAHA",
-                "350 YAMAHA",
-                "450 YAMAHA",
-                "250 YANMAR",
-                "370 YANMAR"
-            ],
+            values=self.catalog.engines,
             state="readonly",
             width=30,
             font=("Arial", 9)
@@ -540,25 +868,14 @@ class DeviceExtractorGUI:
         # Bind click event for checkboxes and device type selection
         self.tree.bind("<Button-1>", self.on_tree_click)
         self.tree.bind("<Double-1>", self.on_device_type_double_click)
+        self.tree.bind("<<TreeviewSelect>>", self.on_tree_select)
         
         # Store checkbox states and device type dropdowns
         self.device_selected = {}
         self.device_types = {}  # Store device type for each item
         
         # Available device types
-        self.available_device_types = [
-            "AXIOM 2 PRO 9",
-            "AXIOM 2 PRO 12",
-            "AXIOM 2 PRO 16",
-            "GMDSS",
-            "RAYMARINE AIS 700",
-            "RADAR QUANTUM 2 DOPPLER",
-            "THERMAL CAMERA",
-            "RAYMARINE RAY53 VHF",
-            "RAYMARINE RS 150",
-            "CONNECT 50",
-            "OTHER DEVICE"
-        ]
+        self.available_device_types = list(self.catalog.device_types)
         
         # Scrollbar
         scrollbar = ttk.Scrollbar(results_frame, orient=tk.VERTICAL, command=self.tree.yview)
@@ -625,17 +942,42 @@ class DeviceExtractorGUI:
                 self.status_label.config(text=f"Loaded {loaded_count} images (showing first)")
             self.show_thumbnails()
             
+    def add_images(self):
+        """Add images to the session and extract only new or changed ones, keeping table edits"""
+        if self.extraction_job is not None:
+            messagebox.showinfo("Please Wait", "An extraction is already running")
+            return
+        file_paths = filedialog.askopenfilenames(
+            title="Add Screenshots",
+            filetypes=[
+                ("Image files", "*.png *.jpg *.jpeg *.bmp *.gif *.tiff"),
+                ("All files", "*.*")
+            ]
+        )
+        if not file_paths:
+            return
+        new_paths = [path for path in file_paths if path not in self.image_paths]
+        self.image_paths.extend(new_paths)
+        self.thumbnail_strip.add_images(new_paths)
+        if self.image_path is None:
+            self.current_image_index = 0
+            self.image_path = self.image_paths[0]
+            self.display_image(self.image_path)
+            self.thumbnail_strip.select(0)
+        if self.is_loading:
+            # Extracted by _on_warm_up_done once the engine is up
+            self._refresh_after_warm_up = True
+            self.status_label.config(
+                text=f"Added {len(new_paths)} image(s), extraction starts once the OCR engine is ready..."
+            )
+            return
+        self.extract_devices(incremental=True)
+            
     def display_image(self, image_path):
         """Display the uploaded image"""
         try:
-            # Load and resize image
-            image = Image.open(image_path)
-            # Calculate size to fit in preview (max 800x250)
-            max_width = 800
-            max_height = 250
-            ratio = min(max_width/image.width, max_height/image.height)
-            new_size = (int(image.width * ratio), int(image.height * ratio))
-            image = image.resize(new_size, Image.Resampling.LANCZOS)
+            # Load image resized to fit in preview (max 800x250)
+            image = self.image_cache.fit(image_path, 800, 250, upscale=True)
             # Convert to PhotoImage
             photo = ImageTk.PhotoImage(image)
             self.image_label.config(image=photo, text="")
@@ -645,75 +987,65 @@ class DeviceExtractorGUI:
 
     def show_thumbnails(self):
         """Show thumbnails for all selected images"""
-        # Clear previous thumbnails
-        for btn in self.thumbnail_buttons:
-            btn.destroy()
-        self.thumbnail_buttons.clear()
-        self.thumbnail_images.clear()
-        # Create thumbnails
-        thumb_size = (60, 40)
-        for idx, img_path in enumerate(self.image_paths):
-            try:
-                img = Image.open(img_path)
-                img.thumbnail(thumb_size, Image.Resampling.LANCZOS)
-                thumb = ImageTk.PhotoImage(img)
-                self.thumbnail_images.append(thumb)
-                border_frame = tk.Frame(self.thumbnails_frame, bg=self.bg_medium, borderwidth=0, highlightthickness=0)
-                btn = tk.Label(
-                    border_frame,
-                    image=thumb,
-                    bg=self.bg_medium,
-                    cursor="hand2",
-                    borderwidth=0,
-                    highlightthickness=0,
-                    relief=tk.FLAT
-                )
-                btn.pack(padx=0, pady=0)
-                border_frame.pack(side=tk.LEFT, padx=4, pady=2)
-                # Draw highlight border for selected
-                if idx == self.current_image_index:
-                    border_frame.config(bg=self.accent_blue)
-                else:
-                    border_frame.config(bg=self.bg_medium)
-                btn.bind("<Button-1>", lambda e, i=idx: self.on_thumbnail_click(i))
-                self.thumbnail_buttons.append(border_frame)
-            except Exception:
-                continue
+        self.thumbnail_strip.set_images(self.image_paths)
+        self.thumbnail_strip.select(self.current_image_index)
 
     def on_thumbnail_click(self, idx):
         """Change main preview to selected thumbnail and update highlight"""
         self.current_image_index = idx
         self.image_path = self.image_paths[idx]
         self.display_image(self.image_path)
-        self.show_thumbnails()
+        self.thumbnail_strip.select(idx)
 
     def enlarge_image(self):
-        """Open the current image in a maximized popup window"""
+        """Open the image of the selected row (or the current image) in the zoom/pan viewer"""
         if not self.image_paths:
             return
-        img_path = self.image_paths[self.current_image_index]
+        item = self._selected_row()
+        img_path = self.row_meta[item]['image'] if item else self.image_paths[self.current_image_index]
         try:
-            img = Image.open(img_path)
-            popup = tk.Toplevel(self.root)
-            popup.title(f"Enlarged View - {Path(img_path).name}")
-            popup.configure(bg=self.bg_dark)
-            # Maximize window
-            popup.state('zoomed')
-            # Resize image to fit screen
-            screen_w = popup.winfo_screenwidth()
-            screen_h = popup.winfo_screenheight()
-            ratio = min(screen_w/img.width, screen_h/img.height, 1.0)
-            new_size = (int(img.width * ratio), int(img.height * ratio))
-            img = img.resize(new_size, Image.Resampling.LANCZOS)
-            photo = ImageTk.PhotoImage(img)
-            label = tk.Label(popup, image=photo, bg=self.bg_dark)
-            label.image = photo
-            label.pack(expand=True)
+            if self.viewer is not None and self.viewer.is_open:
+                self.viewer.window.destroy()
+            self.viewer = ImageViewer(
+                self.root,
+                self.image_cache.full(img_path),
+                title=f"Enlarged View - {Path(img_path).name} (wheel to zoom, drag to pan, 0 to fit)",
+                bg=self.bg_dark,
+                box=self._row_box(item) if item else None,
+                path=img_path,
+            )
         except Exception as e:
             messagebox.showerror("Error", f"Failed to enlarge image: {e}")
+
+    def _selected_row(self):
+        """Selected table item that came from an extracted image, or None"""
+        for item in self.tree.selection():
+            if item in self.row_meta:
+                return item
+        return None
+
+    def _row_box(self, item):
+        """OCR bounding box of the table row an item was parsed from, or None"""
+        meta = self.row_meta[item]
+        detections = self.image_detections.get(meta['image'])
+        return row_box(detections, meta['row']) if detections else None
+
+    def on_tree_select(self, event):
+        """Move the viewer highlight to the newly selected row"""
+        item = self._selected_row()
+        if item is None or self.viewer is None or not self.viewer.is_open:
+            return
+        if self.row_meta[item]['image'] == self.viewer.path:
+            self.viewer.show_box(self._row_box(item))
+        else:
+            self.enlarge_image()
             
-    def extract_devices(self):
-        """Extract device and engine information from image(s) using OCR"""
+    def extract_devices(self, incremental=False):
+        """Extract device and engine information from image(s) using OCR
+
+        Incremental mode only OCRs images that are new or changed since their
+        rows were added, and keeps all other rows and their edits.
+        """
         if not self.image_paths:
             messagebox.showwarning("Warning", "Please upload one or more images first")
             return
@@ -725,83 +1057,176 @@ class DeviceExtractorGUI:
         # Disable buttons during extraction
         self.extract_btn.config(state=tk.DISABLED)
         self.upload_btn.config(state=tk.DISABLED)
+        self.add_images_btn.config(state=tk.DISABLED)
         self.status_label.config(text="Extracting devices... This may take 10-30 seconds")
+        if incremental:
+            self.extracted_devices = []
+            self.processed_images = 0
+        else:
+            self._clear_results()
         self.root.update()
         
-        # Run extraction in a separate thread to keep GUI responsive
-        thread = threading.Thread(target=self._perform_extraction, daemon=True)
+        # Run extraction in a separate thread to keep GUI responsive; rows
+        # are added to the table as each image finishes
+        image_paths = list(self.image_paths)
+        self.extraction_job = ExtractionJob()
+        self.pause_btn.config(state=tk.NORMAL, text="⏸ Pause")
+        self.cancel_btn.config(state=tk.NORMAL)
+        known_hashes = dict(self.image_hashes) if incremental else {}
+        thread = threading.Thread(
+            target=self._perform_extraction,
+            args=(image_paths, self.extraction_job, known_hashes),
+            daemon=True,
+        )
         thread.start()
+        self.root.after(RESULTS_POLL_MS, self._drain_results)
     
-    def _perform_extraction(self):
+    def toggle_pause_extraction(self):
+        """Pause the running extraction after the current image, or resume it"""
+        job = self.extraction_job
+        if job is None:
+            return
+        if job.paused:
+            job.resume()
+            self.pause_btn.config(text="⏸ Pause")
+            self.status_label.config(text="Resuming extraction...")
+        else:
+            job.pause()
+            self.pause_btn.config(text="▶ Resume")
+            self.status_label.config(text="Pausing after the current image...")
+        
+    def cancel_extraction(self):
+        """Stop the running extraction, keeping the rows found so far"""
+        if self.extraction_job is None:
+            return
+        self.extraction_job.cancel()
+        self.pause_btn.config(state=tk.DISABLED)
+        self.cancel_btn.config(state=tk.DISABLED)
+        self.status_label.config(text="Cancelling extraction...")
+        
+    def _perform_extraction(self, image_paths, job, known_hashes):
         """Perform the actual OCR extraction (runs in background thread)"""
         try:
-            # Initialize reader if needed (first time only)
-            if self.reader is None:
-                self.root.after(0, lambda: self.status_label.config(
-                    text="First time: Loading OCR engine... (10-30 seconds)"
-                ))
-                self.reader = easyocr.Reader(['en'], gpu=False)
-            
             self.root.after(0, lambda: self.status_label.config(
                 text="Reading image(s)... Please wait"
             ))
 
-            aggregated_devices = []
-            for idx, img_path in enumerate(self.image_paths):
-                # Perform OCR per image
-                results = self.reader.readtext(img_path)
-                text_lines = [detection[1] for detection in results]
-                text = '\n'.join(text_lines)
-                # Parse the text to extract devices and engine serials
-                parsed = self.parse_device_text(text)
-                aggregated_devices.extend(parsed)
+            # Skip images whose rows are already in the table unchanged
+            hashes = {image_path: hash_file(image_path) for image_path in image_paths}
+            image_paths = [path for path in image_paths if known_hashes.get(path) != hashes[path]]
+            self.results_queue.put(("plan", image_paths))
 
-            self.extracted_devices = aggregated_devices
-            
-            # Update GUI in main thread
-            self.root.after(0, self._update_results)
-                
+            # Cached images are served from disk; the rest go to the OCR daemon,
+            # worker pool or in-process reader. Results come back in input order.
+            for idx, (detections, parsed) in enumerate(self.ocr_service.extract(image_paths, job)):
+                image_path = image_paths[idx]
+                self.results_queue.put(("image", (idx, len(image_paths), image_path, hashes[image_path], detections, parsed)))
+            self.results_queue.put(("done", None))
+        except ExtractionCancelled:
+            self.results_queue.put(("cancelled", None))
         except Exception as e:
-            self.root.after(0, lambda: self.status_label.config(text="✗ Extraction failed"))
-            self.root.after(0, lambda: messagebox.showerror("Error", f"Failed to extract devices: {e}"))
-            self.root.after(0, lambda: self.extract_btn.config(state=tk.NORMAL))
-            self.root.after(0, lambda: self.upload_btn.config(state=tk.NORMAL))
+            self.results_queue.put(("error", e))
     
-    def _update_results(self):
-        """Update the GUI with extraction results"""
-        # Clear existing items
+    def _drain_results(self):
+        """Move queued per-image results into the table (runs in the Tk loop)"""
+        while True:
+            try:
+                kind, payload = self.results_queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "plan":
+                self._remove_changed_images(payload)
+            elif kind == "image":
+                self._add_image_results(*payload)
+            elif kind == "done":
+                self._finish_extraction()
+                return
+            elif kind == "cancelled":
+                self._extraction_cancelled()
+                return
+            else:
+                self._extraction_failed(payload)
+                return
+        self.root.after(RESULTS_POLL_MS, self._drain_results)
+    
+    def _clear_results(self):
+        """Remove all rows from the results table"""
         for item in self.tree.get_children():
             self.tree.delete(item)
         self.device_selected.clear()
         self.device_types.clear()
-        
-        # Add extracted devices to treeview with checkboxes
+        self.row_meta.clear()
+        self.image_detections.clear()
+        self.image_hashes.clear()
+        self.extracted_devices = []
+        self.processed_images = 0
+        self._stashed_rows = {}
+    
+    def _remove_changed_images(self, image_paths):
+        """Drop the rows of images about to be re-extracted, remembering their edits"""
+        self.planned_images = len(image_paths)
+        self._stashed_rows = {}
+        changed = {path for path in image_paths if path in self.image_hashes}
+        for item_id, meta in list(self.row_meta.items()):
+            if meta['image'] in changed:
+                _, _, code, serial = self.tree.item(item_id, 'values')
+                self._stashed_rows[(meta['image'], code, serial)] = (self.device_selected[item_id], self.device_types[item_id])
+                self.tree.delete(item_id)
+                del self.device_selected[item_id]
+                del self.device_types[item_id]
+                del self.row_meta[item_id]
+        for path in changed:
+            del self.image_hashes[path]
+            self.image_detections.pop(path, None)
+    
+    def _add_image_results(self, idx, total, image_path, image_hash, detections, devices):
+        """Append one image's devices to the table"""
+        self.extracted_devices.extend(devices)
+        self.image_detections[image_path] = detections
+        # Split product code from name and auto-match device type
+        for device, row in zip(devices, build_rows(devices, image=str(image_path))):
+            # Rows that were already there before the image changed keep their edits
+            selected, device_type = self._stashed_rows.get((image_path, row['code'], row['serial']), (False, row['device_type']))
+            item_id = self.tree.insert("", tk.END, values=("☑" if selected else "☐", device_type, row['code'], row['serial']))
+            self.device_selected[item_id] = selected
+            self.device_types[item_id] = device_type
+            self.row_meta[item_id] = {
+                'image': image_path,
+                'row': device.get('row'),
+                # The engine and profile cannot change while an extraction runs
+                'ocr_engine': self.ocr_service.options.get('engine'),
+                'ocr_profile': self.ocr_profile,
+            }
+        self.image_hashes[image_path] = image_hash
         if self.extracted_devices:
-            for idx, device in enumerate(self.extracted_devices):
-                # Parse product to separate name and code
-                product_full = device['product']
-                # Try to extract product code
-                code_match = re.search(r'\b([EV]\d{5}|MS-[A-Z0-9]+|\d{1,3}L\d{4})\b', product_full)
-                
-                if code_match:
-                    code = code_match.group(1)
-                    product_name = product_full.replace(code, '').strip()
-                else:
-                    product_name = product_full
-                    code = ""
-                
-                # Try to auto-match device type from extracted name
-                device_type = self.auto_match_device_type(product_name)
-                if not device_type:
-                    device_type = "[Click to select device type]"
-                
-                item_id = self.tree.insert("", tk.END, values=("☐", device_type, code, device['serial']))
-                self.device_selected[item_id] = False
-                self.device_types[item_id] = device_type
-            
             self.export_btn.config(state=tk.NORMAL)
+        self.processed_images = idx + 1
+        self.status_label.config(text=f"Extracting... image {idx + 1}/{total}, {len(self.extracted_devices)} items")
+    
+    def _end_extraction(self):
+        """Re-enable the controls once an extraction stopped for any reason"""
+        self.extraction_job = None
+        self._stashed_rows = {}
+        self.pause_btn.config(state=tk.DISABLED, text="⏸ Pause")
+        self.cancel_btn.config(state=tk.DISABLED)
+        self.extract_btn.config(state=tk.NORMAL)
+        self.upload_btn.config(state=tk.NORMAL)
+        self.add_images_btn.config(state=tk.NORMAL)
+    
+    def _extraction_cancelled(self):
+        """Report a cancelled extraction; rows from finished images stay in the table"""
+        self.status_label.config(
+            text=f"⚠ Extraction cancelled after {self.processed_images} image(s), {len(self.extracted_devices)} items kept"
+        )
+        self._end_extraction()
+    
+    def _finish_extraction(self):
+        """Final status and summary once every image has been processed"""
+        if not self.planned_images:
+            self.status_label.config(text="✓ No new or changed images to extract")
+        elif self.extracted_devices:
             self.status_label.config(
-                text=f"✓ Extracted {len(self.extracted_devices)} items - Double-click device type to change"
+                text=f"✓ Extracted {len(self.extracted_devices)} items{self._extraction_stats()} - Double-click device type to change"
             )
             messagebox.showinfo(
                 "Success",
@@ -815,36 +1240,27 @@ class DeviceExtractorGUI:
             )
         
         # Re-enable buttons
-        self.extract_btn.config(state=tk.NORMAL)
-        self.upload_btn.config(state=tk.NORMAL)
+        self._end_extraction()
     
-    def auto_match_device_type(self, product_name):
-        """Try to automatically match extracted product name to device type"""
-        product_upper = product_name.upper()
-        
-        # Match patterns
-        if "AXIOM" in product_upper and "9" in product_upper:
-            return "AXIOM 2 PRO 9"
-        elif "AXIOM" in product_upper and "12" in product_upper:
-            return "AXIOM 2 PRO 12"
-        elif "AXIOM" in product_upper and "16" in product_upper:
-            return "AXIOM 2 PRO 16"
-        elif "GMDSS" in product_upper or "12L" in product_name:
-            return "GMDSS"
-        elif "AIS" in product_upper and "700" in product_upper:
-            return "RAYMARINE AIS 700"
-        elif "QUANTUM" in product_upper or ("RADAR" in product_upper and "2" in product_upper):
-            return "RADAR QUANTUM 2"
-        elif "THERMAL" in product_upper or "CAMERA" in product_upper:
-            return "THERMAL CAMERA"
-        elif "RAY53" in product_upper or ("VHF" in product_upper and "53" in product_upper):
-            return "RAYMARINE RAY53 VHF"
-        elif "RS" in product_upper and "150" in product_upper:
-            return "RAYMARINE RS 150"
-        elif "OTHER OTHER" in product_upper:
-            return "OTHER DEVICE"
-        
-        return None
+    def _extraction_failed(self, error):
+        """Report an extraction error; rows from finished images stay in the table"""
+        self.status_label.config(text="✗ Extraction failed")
+        self._end_extraction()
+        messagebox.showerror("Error", f"Failed to extract devices: {error}")
+    
+    def _extraction_stats(self):
+        """Cache hit/miss counter and stage timings for the status bar"""
+        stats = []
+        if self.ocr_cache is not None:
+            stats.append(self.ocr_cache.stats_text())
+        if self.ocr_service.timings:
+            stats.append(f"{self.ocr_profile} profile: {format_timings(self.ocr_service.timings)}")
+        stats.append(self.image_cache.stats_text())
+        return f" ({'; '.join(stats)})" if stats else ""
+    
+    def auto_match_device_type(self, product_name, code=""):
+        """Try to automatically match extracted product name (and code) to device type"""
+        return auto_match_device_type(product_name, code)
     
     def on_tree_click(self, event):
         """Handle clicks on tree items to toggle checkboxes"""
@@ -1080,7 +1496,7 @@ class DeviceExtractorGUI:
             new_device_type = type_combo.get()
             new_code = code_entry.get().strip()
             new_serial = serial_entry.get().strip()
-            if not new_device_type or new_device_type == "[Click to select device type]":
+            if not new_device_type or new_device_type == UNASSIGNED_DEVICE_TYPE:
                 messagebox.showwarning("Warning", "Please select a device type")
                 return
             if not new_serial:
@@ -1137,137 +1553,13 @@ class DeviceExtractorGUI:
             del self.device_selected[item]
             if item in self.device_types:
                 del self.device_types[item]
+            self.row_meta.pop(item, None)
         
         self.status_label.config(text=f"✓ Removed {len(selected_items)} device(s)")
             
     def parse_device_text(self, text):
         """Parse OCR text to extract device and engine serial information"""
-        devices = []
-        lines = text.split('\n')
-        
-        # Process each line - looking for product name + code + serial
-        for i, line in enumerate(lines):
-            line = line.strip()
-            if not line:
-                continue
-            
-            # Split line into parts (space-separated)
-            parts = line.split()
-            if len(parts) < 2:
-                continue
-            
-            # Look for product code patterns (E##### or V##### etc.)
-            product_code_pattern = r'^(E\d{5}|V\d{5}|MS-[A-Z0-9]+|\d{1,3}L\d{4})$'
-            
-            # Look for serial number patterns
-            # Further expanded serial patterns based on new examples
-            serial_patterns = [
-                r'^[A-Z]{3}\d[A-Z0-9]{3}$',  # TAZ2ZKB, TAR3WR7, TADG0G9
-                r'^\d{7,12}$',  # 1240430, 0330729, 10962030599, 3490083196
-                r'^[JC]\d{6}-\d{4}$',  # J497793-0051
-                r'^E\d{10,}$',  # E704760350080
-                r'^[A-Z]{1,2}\d{7,10}$',  # Yamaha: 6MLN1000296, Mercury: 1E100979
-                r'^[A-Z0-9]{8,12}$',  # General engine/device serials: 3B417994, 3B424456, 3B331193
-                r'^[A-Z]{1,2}\d{6,8}$',  # Volvo: A1230833
-                r'^\d{8,10}$',  # Numeric serials: 0233669, 0326146
-                r'^[A-Z]{1,2}\d{6,12}$',  # e.g. 6MLLN1005392, 6KNN1005289
-                r'^[A-Z0-9]{6,14}$',  # e.g. 3B553644, 3B557006, 3B563885, 3B563883
-                r'^[A-Z]{1,2}\d{6,12}$',  # e.g. 6MLN1005390, 6MLLN1005392
-                r'^[A-Z]{1,2}\d{6,12}$',  # e.g. 6KNN1005289, 6KNN1005075
-                r'^[A-Z0-9]{8,15}$',  # e.g. 1E103027, 1E103214, 1E102818, 1E102771
-                r'^[A-Z0-9]{8,15}$',  # e.g. 1E102775, 1E102817, 1E102460
-                r'^[A-Z0-9\u0391-\u03A9]{8,15}$',  # Greek/Unicode letters (e.g. 13500033Α, 3Β535504)
-                r'^[A-Z0-9\-]{6,16}$',  # D6-440A-G, 8LV370Z, XF450NSA
-                r'^[A-Z0-9]{4,8}$',  # Short Yanmar: 6467, 6465, 6725, 6724
-            ]
-            
-            # Try to find product code and serial in the line
-            product_code_idx = None
-            serial_idx = None
-            
-            for idx, part in enumerate(parts):
-                # Check if this part is a product code
-                if re.match(product_code_pattern, part):
-                    product_code_idx = idx
-                
-                # Check if this part is a serial number
-                for pattern in serial_patterns:
-                    if re.match(pattern, part):
-                        serial_idx = idx
-                        break
-            
-            # If we found both a product code and serial number
-            if product_code_idx is not None and serial_idx is not None and serial_idx > product_code_idx:
-                # Product name is everything before the serial number
-                product_parts = parts[:serial_idx]
-                product_name = ' '.join(product_parts)
-                
-                # Serial is the last part
-                serial_number = parts[serial_idx]
-                
-                devices.append({
-                    'product': product_name,
-                    'serial': serial_number
-                })
-            
-            # If we only found product code but no serial on same line, check next line
-            elif product_code_idx is not None and serial_idx is None and i + 1 < len(lines):
-                next_line = lines[i + 1].strip()
-                next_parts = next_line.split()
-                
-                for part in next_parts:
-                    for pattern in serial_patterns:
-                        if re.match(pattern, part):
-                            product_name = ' '.join(parts[:product_code_idx+1])
-                            devices.append({
-                                'product': product_name,
-                                'serial': part
-                            })
-                            break
-        
-        # Engine serial detection: look for lines indicating engine serial markers
-        for i, line in enumerate(lines):
-            l = line.strip()
-            if not l:
-                continue
-            # Look for engine serial blocks (Yamaha, Mercury, Volvo, etc.)
-            if re.search(r'engine', l, flags=re.IGNORECASE) or re.search(r'engines', l, flags=re.IGNORECASE):
-                # Scan next few lines for model/serial pairs
-                for j in range(i+1, min(i+6, len(lines))):
-                    model_line = lines[j].strip()
-                    if re.search(r'model', model_line, flags=re.IGNORECASE):
-                        # Try to get serial from next line
-                        if j+1 < len(lines):
-                            serial_line = lines[j+1].strip()
-                            serial_match = None
-                            for pattern in serial_patterns:
-                                m = re.match(pattern, serial_line)
-                                if m:
-                                    serial_match = serial_line
-                                    break
-                            if serial_match:
-                                devices.append({'product': 'ENGINE', 'serial': serial_match})
-                    # Also catch lines like 'SERIAL NUMBER:'
-                    if re.search(r'serial', model_line, flags=re.IGNORECASE):
-                        serial_match = None
-                        for pattern in serial_patterns:
-                            m = re.match(pattern, model_line)
-                            if m:
-                                serial_match = model_line
-                                break
-                        if serial_match:
-                            devices.append({'product': 'ENGINE', 'serial': serial_match})
-
-        # Remove duplicates
-        seen = set()
-        unique_devices = []
-        for device in devices:
-            key = (device['product'], device['serial'])
-            if key not in seen:
-                seen.add(key)
-                unique_devices.append(device)
-        
-        return unique_devices
+        return parse_device_text(text)
     
     def export_results(self):
         """Export results to text file"""
@@ -1284,10 +1576,9 @@ class DeviceExtractorGUI:
         
         # Get SAP for filename
         sap_number = self.sap_entry.get()
-        if sap_number == "e.g., 9100967" or not sap_number.strip():
-            default_name = f"SN_NoSAP_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-        else:
-            default_name = f"SN_{sap_number}.txt"
+        if sap_number == "e.g., 9100967":
+            sap_number = ""
+        default_name = default_export_name(sap_number)
         
         file_path = filedialog.asksaveasfilename(
             title="Save Device Serial Numbers",
@@ -1314,63 +1605,19 @@ class DeviceExtractorGUI:
                 if sap_number == "e.g., 9100967" or not sap_number.strip():
                     sap_number = "N/A"
                 
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    # Header with vessel info - format: (MODEL) - (NAME)
-                    f.write(f"{vessel_model} - {vessel_name}\n")
-                    # SAP line
-                    f.write(f"{sap_number}\n")
-                    # Divider line
-                    f.write("___________________________________\n\n")
-                    
-                    # Collect devices grouped by type
-                    devices_by_type = {}
-                    for item in self.tree.get_children():
-                        if self.device_selected.get(item, False):
-                            values = self.tree.item(item, "values")
-                            # values: (checkbox, device_type, code, serial)
-                            device_type = values[1]
-                            code = values[2]
-                            serial = values[3]
-                            
-                            # Skip if device type not selected
-                            if device_type == "[Click to select device type]":
-                                continue
-                            
-                            # Group by device type
-                            if device_type not in devices_by_type:
-                                devices_by_type[device_type] = []
-                            
-                            devices_by_type[device_type].append({
-                                'code': code,
-                                'serial': serial
-                            })
-                    
-                    # Export grouped by device type
-                    exported_count = 0
-                    for device_type, devices in devices_by_type.items():
-                        # Append 'GPS' to AXIOM screens
-                        display_type = device_type
-                        if device_type.upper().startswith("AXIOM"):
-                            display_type = f"{device_type} GPS"
-                        # For engines, show count and type
-                        if device_type.upper() == "ENGINE" or device_type.upper().startswith("ENGINE"):
-                            count = len(devices)
-                            if count > 1:
-                                display_type = f"{device_type} (x{count})"
-                        else:
-                            count = len(devices)
-                            if count > 1:
-                                display_type = f"{display_type} (x{count})"
-                        f.write(f"{display_type}:\n")
-                        # Write all serial numbers for this device type
-                        for device in devices:
-                            if device['code']:
-                                f.write(f"{device['code']}\t{device['serial']}\n")
-                            else:
-                                f.write(f"{device['serial']}\n")
-                            exported_count += 1
-                        # Add blank line between device types
-                        f.write("\n")
+                # Collect selected rows, values: (checkbox, device_type, code, serial)
+                rows = []
+                used_ocr = set()
+                for item in self.tree.get_children():
+                    if self.device_selected.get(item, False):
+                        values = self.tree.item(item, "values")
+                        rows.append({'device_type': values[1], 'code': values[2], 'serial': values[3]})
+                        meta = self.row_meta.get(item, {})
+                        used_ocr.add((meta.get('ocr_engine'), meta.get('ocr_profile')))
+                
+                # Record how the exported rows were extracted (none for manual rows)
+                ocr = ocr_summary(used_ocr)
+                exported_count = write_export(file_path, rows, vessel_model, vessel_name, sap_number, ocr=ocr)
                 
                 self.status_label.config(text=f"✓ Exported {exported_count} devices to {Path(file_path).name}")
                 messagebox.showinfo(
@@ -1384,12 +1631,29 @@ class DeviceExtractorGUI:
 
 def main():
     """Main entry point"""
+    # Needed for OCR worker processes in the packaged executable
+    multiprocessing.freeze_support()
     print("Starting Technohull Marine Device Serial Number Extractor...")
     print("Note: First run will download OCR model (~100MB). Please be patient.")
     
     root = tk.Tk()
     app = DeviceExtractorGUI(root)
     
+    probe_path = os.environ.get(STARTUP_PROBE_ENV_VAR)
+    if probe_path:
+        # Startup benchmark: record when the first frame has painted, then quit
+        # without touching the session file
+        def record_first_frame():
+            Path(probe_path).write_text(repr(time.time()), encoding='utf-8')
+            app.on_close(save_session=False)
+        def on_map(event):
+            if event.widget is root:
+                root.unbind("<Map>")
+                root.after_idle(record_first_frame)
+        root.bind("<Map>", on_map)
+        root.mainloop()
+        return
+    
     # Show initial loading message
     messagebox.showinfo(
         "Welcome!",
@@ -0,0 +1,181 @@
+"""
+Device list text parser
+
+Turns OCR text from device list / engine screenshots into product and
+serial number pairs. Kept free of any GUI imports so it can be reused
+from scripts and benchmarks.
+"""
+
+import re
+
+from device_catalog import default_catalog
+
+
+# Product codes: Raymarine E#####/V#####, MS-xxx, GMDSS ##L####
+PRODUCT_CODE_PATTERN = r'E\d{5}|V\d{5}|MS-[A-Z0-9]+|\d{1,3}L\d{4}'
+
+# Serial number patterns (each one must match a whole token)
+SERIAL_PATTERNS = [
+    r'[A-Z]{3}\d[A-Z0-9]{3}',  # TAZ2ZKB, TAR3WR7, TADG0G9
+    r'\d{7,12}',  # 1240430, 0330729, 10962030599, 3490083196
+    r'[JC]\d{6}-\d{4}',  # J497793-0051
+    r'E\d{10,}',  # E704760350080
+    r'[A-Z]{1,2}\d{7,10}',  # Yamaha: 6MLN1000296, Mercury: 1E100979
+    r'[A-Z0-9]{8,12}',  # General engine/device serials: 3B417994, 3B424456
+    r'[A-Z]{1,2}\d{6,8}',  # Volvo: A1230833
+    r'\d{8,10}',  # Numeric serials: 0233669, 0326146
+    r'[A-Z]{1,2}\d{6,12}',  # e.g. 6MLLN1005392, 6KNN1005289, 6MLN1005390
+    r'[A-Z0-9]{6,14}',  # e.g. 3B553644, 3B557006, 3B563885
+    r'[A-Z0-9]{8,15}',  # e.g. 1E103027, 1E103214, 1E102775, 1E102460
+    r'[A-Z0-9\u0391-\u03A9]{8,15}',  # Greek/Unicode letters (e.g. 13500033Α, 3Β535504)
+    r'[A-Z0-9\-]{6,16}',  # D6-440A-G, 8LV370Z, XF450NSA
+    r'[A-Z0-9]{4,8}',  # Short Yanmar: 6467, 6465, 6725, 6724
+]
+
+# Token classes returned by classify_token()
+TOKEN_CODE = 'code'
+TOKEN_SERIAL = 'serial'
+TOKEN_CODE_SERIAL = 'code_serial'  # product code that also looks like a serial
+
+_SERIAL_ALTERNATION = '|'.join(f'(?:{pattern})' for pattern in dict.fromkeys(SERIAL_PATTERNS))
+
+# Single compiled classifier, built once at import. The first branch only
+# wins when the token is a product code *and* a serial, so one match call
+# answers both questions the parser asks about a token.
+TOKEN_CLASSIFIER = re.compile(
+    rf'^(?:(?P<{TOKEN_CODE_SERIAL}>(?=(?:{_SERIAL_ALTERNATION})$)(?:{PRODUCT_CODE_PATTERN}))'
+    rf'|(?P<{TOKEN_CODE}>{PRODUCT_CODE_PATTERN})'
+    rf'|(?P<{TOKEN_SERIAL}>{_SERIAL_ALTERNATION}))$'
+)
+
+
+def classify_token(token):
+    """Classify a token as product code and/or serial, returns (kind, span) or None"""
+    match = TOKEN_CLASSIFIER.match(token)
+    if match is None:
+        return None
+    kind = match.lastgroup
+    return kind, match.span(kind)
+
+
+def is_serial_token(token):
+    """Check whether a whole token looks like a serial number"""
+    match = TOKEN_CLASSIFIER.match(token)
+    return match is not None and match.lastgroup != TOKEN_CODE
+
+
+# Engine block keywords, matched against case-folded lines
+ENGINE_KEYWORD = 'engine'
+MODEL_KEYWORD = 'model'
+SERIAL_KEYWORD = 'serial'
+# Lines after an engine header that can hold its model/serial rows
+ENGINE_WINDOW = 5
+
+
+def scan_engine_serials(lines):
+    """Find engine serials in one pass over the lines
+
+    A line containing "engine" opens a window over the next ENGINE_WINDOW
+    lines. Inside it, a "model" line takes the following line as serial,
+    and a line mentioning "serial" counts when the whole line is a serial.
+    Results come out in line order with their row index.
+    """
+    devices = []
+    window_end = -1
+    for j, line in enumerate(lines):
+        if not line:
+            continue
+        folded = line.casefold()
+        if j <= window_end:
+            if MODEL_KEYWORD in folded and j + 1 < len(lines) and is_serial_token(lines[j + 1]):
+                devices.append({'product': 'ENGINE', 'serial': lines[j + 1], 'row': j + 1})
+            if SERIAL_KEYWORD in folded and is_serial_token(line):
+                devices.append({'product': 'ENGINE', 'serial': line, 'row': j})
+        if ENGINE_KEYWORD in folded:
+            window_end = j + ENGINE_WINDOW
+    return devices
+
+
+def parse_device_text(text):
+    """Parse OCR text to extract device and engine serial information"""
+    return parse_device_rows([line.split() for line in text.split('\n')])
+
+
+def parse_device_rows(rows):
+    """Parse OCR rows (lists of tokens) to extract device and engine serial information
+
+    Each device gets the index of the row its serial was read from.
+    """
+    devices = []
+    classify = TOKEN_CLASSIFIER.match
+
+    # Classify every token once; the next-row fallback reuses the result
+    row_kinds = [[(match.lastgroup if match else None) for match in map(classify, parts)] for parts in rows]
+
+    # Process each row - looking for product name + code + serial
+    for i, parts in enumerate(rows):
+        if len(parts) < 2:
+            continue
+
+        # Try to find product code and serial in the row
+        product_code_idx = None
+        serial_idx = None
+
+        for idx, kind in enumerate(row_kinds[i]):
+            if kind is None:
+                continue
+            if kind != TOKEN_SERIAL:
+                product_code_idx = idx
+            if kind != TOKEN_CODE:
+                serial_idx = idx
+
+        # If we found both a product code and serial number
+        if product_code_idx is not None and serial_idx is not None and serial_idx > product_code_idx:
+            # Product name is everything before the serial number
+            devices.append({
+                'product': ' '.join(parts[:serial_idx]),
+                'serial': parts[serial_idx],
+                'row': i,
+            })
+
+        # If we only found product code but no serial on same row, check next row
+        elif product_code_idx is not None and serial_idx is None and i + 1 < len(rows):
+            for part, kind in zip(rows[i + 1], row_kinds[i + 1]):
+                if kind is not None and kind != TOKEN_CODE:
+                    devices.append({
+                        'product': ' '.join(parts[:product_code_idx+1]),
+                        'serial': part,
+                        'row': i + 1,
+                    })
+
+    # Engine serial detection: engine header rows followed by model/serial rows
+    devices.extend(scan_engine_serials([' '.join(parts) for parts in rows]))
+
+    # Remove duplicates
+    seen = set()
+    unique_devices = []
+    for device in devices:
+        key = (device['product'], device['serial'])
+        if key not in seen:
+            seen.add(key)
+            unique_devices.append(device)
+
+    return unique_devices
+
+
+# Product code inside a full product string (e.g. "AXIOM 2 PRO 12 E70656")
+PRODUCT_CODE_SEARCH = re.compile(r'\b([EV]\d{5}|MS-[A-Z0-9]+|\d{1,3}L\d{4})\b')
+
+
+def split_product_code(product_full):
+    """Split a parsed product string into (product name, product code)"""
+    code_match = PRODUCT_CODE_SEARCH.search(product_full)
+    if code_match:
+        code = code_match.group(1)
+        return product_full.replace(code, '').strip(), code
+    return product_full, ""
+
+
+def auto_match_device_type(product_name, code=""):
+    """Try to automatically match extracted product name (and code) to device type"""
+    return default_catalog().match(product_name, code)
@@ -0,0 +1,148 @@
+"""
+Decoded image cache
+
+The preview, thumbnails, enlarged view and in-process OCR all need the
+same screenshots. This keeps decoded PIL images and their resized
+variants in one LRU cache with a memory budget, keyed by file path plus
+modification time and size so an edited file is decoded again.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+from PIL import Image
+
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Variant names
+FULL = "full"
+FIT = "fit"
+THUMBNAIL = "thumbnail"
+
+
+def image_bytes(image):
+    """Approximate memory held by a decoded PIL image"""
+    bytes_per_pixel = {'1': 1, 'L': 1, 'P': 1, 'I;16': 2, 'I': 4, 'F': 4}.get(image.mode, len(image.getbands()))
+    return image.width * image.height * bytes_per_pixel
+
+
+class ImageCache:
+    """Thread-safe LRU cache of decoded images and derived sizes under a byte budget"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _file_key(path):
+        stat = os.stat(path)
+        return str(path), stat.st_mtime_ns, stat.st_size
+
+    def _lookup(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def _store(self, key, image):
+        with self._lock:
+            if key in self._entries:
+                return
+            # A variant can be the full image itself (already fits), count it once
+            shared = any(cached is image for cached, _ in self._entries.values())
+            size = 0 if shared else image_bytes(image)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (image, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (evicted, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                if evicted_size:
+                    self._recount_shared(evicted, evicted_size)
+
+    def _recount_shared(self, evicted, size):
+        """Move an evicted image's size to a variant that shares it (lock held)"""
+        for key, (cached, cached_size) in self._entries.items():
+            if cached is evicted:
+                # The variant still holds the memory it was counted as sharing
+                self._entries[key] = (cached, size)
+                self.current_bytes += size - cached_size
+                return
+
+    def _get(self, path, variant, make):
+        key = self._file_key(path) + variant
+        image = self._lookup(key)
+        if image is None:
+            image = make()
+            self._store(key, image)
+        return image
+
+    def full(self, path):
+        """Decoded full-resolution image (treat as read-only)"""
+        def decode():
+            image = Image.open(path)
+            image.load()
+            return image
+        return self._get(path, (FULL,), decode)
+
+    def fit(self, path, max_width, max_height, upscale=False):
+        """Image scaled to fit a box, keeping the aspect ratio"""
+        def resize():
+            image = self.full(path)
+            ratio = min(max_width / image.width, max_height / image.height)
+            if not upscale:
+                ratio = min(ratio, 1.0)
+            if ratio == 1.0:
+                return image
+            new_size = (max(1, int(image.width * ratio)), max(1, int(image.height * ratio)))
+            return image.resize(new_size, Image.Resampling.LANCZOS)
+        return self._get(path, (FIT, max_width, max_height, upscale), resize)
+
+    def thumbnail(self, path, size):
+        """Small thumbnail that fits size (never upscaled)
+
+        Uses the cached full image when there is one; otherwise decodes the
+        file at reduced size without caching the full image.
+        """
+        def shrink():
+            key = self._file_key(path) + (FULL,)
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is not None:
+                # resize() returns a new image, the cached one is left as is
+                image = entry[0]
+                ratio = min(size[0] / image.width, size[1] / image.height, 1.0)
+                if ratio == 1.0:
+                    return image
+                new_size = (max(1, round(image.width * ratio)), max(1, round(image.height * ratio)))
+                return image.resize(new_size, Image.Resampling.LANCZOS, reducing_gap=2.0)
+            # On an unloaded file, thumbnail() lets the JPEG decoder scale
+            # while reading (draft) and shrinks by an integer factor (reduce)
+            # before the final LANCZOS pass
+            image = Image.open(path)
+            image.thumbnail(size, Image.Resampling.LANCZOS, reducing_gap=2.0)
+            return image
+        return self._get(path, (THUMBNAIL,) + tuple(size), shrink)
+
+    def stats_text(self):
+        """Hit rate and memory use for the status bar"""
+        lookups = self.hits + self.misses
+        hit_rate = 100 * self.hits / lookups if lookups else 0
+        return f"images: {hit_rate:.0f}% hits, {self.current_bytes / (1024 * 1024):.0f} MB"
+
+    def clear(self):
+        """Drop all cached images"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
@@ -0,0 +1,170 @@
+"""
+Zoom and pan image viewer
+
+Shows a screenshot in its own window with mouse-wheel zoom and drag to
+pan. The image is split into a resolution pyramid (each level half the
+size of the one below) and only the tiles in view are cut, scaled and
+drawn, so zooming into a 4K screenshot stays smooth. An OCR bounding box
+can be highlighted to check a serial number against the screen.
+"""
+
+import math
+import tkinter as tk
+
+from PIL import Image, ImageTk
+
+
+TILE_SIZE = 256
+# The smallest pyramid level fits inside this many pixels
+MIN_LEVEL_SIZE = 256
+MAX_ZOOM = 8.0
+ZOOM_STEP = 1.25
+
+
+def build_pyramid(image):
+    """Resolution levels: level 0 is the image, each next level is half the size"""
+    levels = [image]
+    while max(levels[-1].size) > MIN_LEVEL_SIZE:
+        levels.append(levels[-1].reduce(2))
+    return levels
+
+
+class ImageViewer:
+    """Toplevel window with a tiled, zoomable view of one image"""
+
+    def __init__(self, master, image, title, bg, highlight="#ff3b30", box=None, path=None):
+        self.path = path
+        self.image = image.convert('RGB') if image.mode not in ('RGB', 'L') else image
+        self.levels = build_pyramid(self.image)
+        self.highlight_color = highlight
+        self.box = None
+        self._tiles = {}  # (level, tx, ty) -> (canvas item, PhotoImage) at the current zoom
+
+        self.window = tk.Toplevel(master)
+        self.window.title(title)
+        self.window.configure(bg=bg)
+        self.window.state('zoomed')
+        self.canvas = tk.Canvas(self.window, bg=bg, borderwidth=0, highlightthickness=0, cursor="fleur")
+        self.canvas.pack(fill=tk.BOTH, expand=True)
+        self.highlight = self.canvas.create_rectangle(0, 0, 0, 0, outline=highlight, width=3, state=tk.HIDDEN)
+
+        self.canvas.bind("<ButtonPress-1>", lambda event: self.canvas.scan_mark(event.x, event.y))
+        self.canvas.bind("<B1-Motion>", self._on_drag)
+        self.canvas.bind("<MouseWheel>", self._on_wheel)
+        # X11 reports the wheel as buttons 4/5
+        self.canvas.bind("<Button-4>", lambda event: self._zoom_at(event.x, event.y, ZOOM_STEP))
+        self.canvas.bind("<Button-5>", lambda event: self._zoom_at(event.x, event.y, 1 / ZOOM_STEP))
+        self.canvas.bind("<Configure>", self._on_first_configure)
+        self.window.bind("<Key-0>", lambda event: self.fit())
+
+        self.zoom = 1.0
+        self._initial_box = box
+
+    @property
+    def is_open(self):
+        return bool(self.window.winfo_exists())
+
+    def _on_first_configure(self, event):
+        # The window size is only known once it is mapped
+        self.canvas.bind("<Configure>", lambda event: self._render())
+        self.fit()
+        if self._initial_box is not None:
+            self.show_box(self._initial_box)
+
+    def fit(self):
+        """Zoom so the whole image fits the window"""
+        width, height = self.canvas.winfo_width(), self.canvas.winfo_height()
+        self._set_zoom(min(width / self.image.width, height / self.image.height, 1.0))
+        self.canvas.xview_moveto(0)
+        self.canvas.yview_moveto(0)
+        self._render()
+
+    def show_box(self, box):
+        """Highlight a box (x0, y0, x1, y1 in image pixels) and centre it, zooming in if small"""
+        self.box = box
+        if box is None:
+            self.canvas.itemconfigure(self.highlight, state=tk.HIDDEN)
+            return
+        x0, y0, x1, y1 = box
+        width, height = self.canvas.winfo_width(), self.canvas.winfo_height()
+        # Make the box readable: about a third of the window wide, never below the fit zoom
+        wanted = min(width / 3 / max(1, x1 - x0), height / 3 / max(1, y1 - y0), MAX_ZOOM)
+        self._set_zoom(max(self.zoom, min(wanted, 2.0)))
+        self._scroll_to((x0 + x1) / 2 * self.zoom, (y0 + y1) / 2 * self.zoom)
+        self._render()
+
+    def _set_zoom(self, zoom):
+        fit = min(self.canvas.winfo_width() / self.image.width, self.canvas.winfo_height() / self.image.height, 1.0)
+        zoom = max(min(fit, 1.0), min(zoom, MAX_ZOOM))
+        if zoom != self.zoom:
+            for item, _ in self._tiles.values():
+                self.canvas.delete(item)
+            self._tiles.clear()
+        self.zoom = zoom
+        self.canvas.configure(scrollregion=(0, 0, self.image.width * zoom, self.image.height * zoom))
+
+    def _scroll_to(self, x, y):
+        """Centre the view on a point in zoomed image coordinates"""
+        total_w, total_h = self.image.width * self.zoom, self.image.height * self.zoom
+        self.canvas.xview_moveto(max(0.0, (x - self.canvas.winfo_width() / 2) / total_w))
+        self.canvas.yview_moveto(max(0.0, (y - self.canvas.winfo_height() / 2) / total_h))
+
+    def _level_for_zoom(self):
+        """Coarsest pyramid level that still has at least one pixel per screen pixel"""
+        if self.zoom >= 1.0:
+            return 0
+        return min(len(self.levels) - 1, int(math.floor(math.log2(1 / self.zoom))))
+
+    def _render(self):
+        """Draw the tiles in view, drop the ones that scrolled out"""
+        level = self._level_for_zoom()
+        source = self.levels[level]
+        # Screen pixels per level pixel
+        scale = self.zoom * (2 ** level)
+        view_x0, view_y0 = self.canvas.canvasx(0), self.canvas.canvasy(0)
+        view_x1 = view_x0 + self.canvas.winfo_width()
+        view_y1 = view_y0 + self.canvas.winfo_height()
+        span = TILE_SIZE * scale
+        tx0, ty0 = max(0, int(view_x0 // span)), max(0, int(view_y0 // span))
+        tx1 = min(math.ceil(source.width / TILE_SIZE), int(view_x1 // span) + 1)
+        ty1 = min(math.ceil(source.height / TILE_SIZE), int(view_y1 // span) + 1)
+
+        visible = {(level, tx, ty) for tx in range(tx0, tx1) for ty in range(ty0, ty1)}
+        for key in [key for key in self._tiles if key not in visible]:
+            item, _ = self._tiles.pop(key)
+            self.canvas.delete(item)
+        for key in visible - self._tiles.keys():
+            _, tx, ty = key
+            crop = (tx * TILE_SIZE, ty * TILE_SIZE,
+                    min(source.width, (tx + 1) * TILE_SIZE), min(source.height, (ty + 1) * TILE_SIZE))
+            tile = source.crop(crop)
+            # Place tiles on rounded screen edges so neighbours never leave a gap
+            left, top = round(crop[0] * scale), round(crop[1] * scale)
+            size = (max(1, round(crop[2] * scale) - left), max(1, round(crop[3] * scale) - top))
+            if size != tile.size:
+                tile = tile.resize(size, Image.Resampling.BILINEAR if scale > 1 else Image.Resampling.LANCZOS)
+            photo = ImageTk.PhotoImage(tile)
+            self._tiles[key] = (self.canvas.create_image(left, top, image=photo, anchor=tk.NW), photo)
+
+        if self.box is not None:
+            x0, y0, x1, y1 = (value * self.zoom for value in self.box)
+            self.canvas.coords(self.highlight, x0 - 3, y0 - 3, x1 + 3, y1 + 3)
+            self.canvas.itemconfigure(self.highlight, state=tk.NORMAL)
+        self.canvas.tag_raise(self.highlight)
+
+    def _on_drag(self, event):
+        self.canvas.scan_dragto(event.x, event.y, gain=1)
+        self._render()
+
+    def _on_wheel(self, event):
+        self._zoom_at(event.x, event.y, ZOOM_STEP if event.delta > 0 else 1 / ZOOM_STEP)
+
+    def _zoom_at(self, x, y, factor):
+        """Zoom by factor keeping the image point under the cursor in place"""
+        image_x = self.canvas.canvasx(x) / self.zoom
+        image_y = self.canvas.canvasy(y) / self.zoom
+        self._set_zoom(self.zoom * factor)
+        total_w, total_h = self.image.width * self.zoom, self.image.height * self.zoom
+        self.canvas.xview_moveto(max(0.0, (image_x * self.zoom - x) / total_w))
+        self.canvas.yview_moveto(max(0.0, (image_y * self.zoom - y) / total_h))
+        self._render()
@@ -0,0 +1,244 @@
+"""
+OCR backends
+
+OcrService gets raw readtext detections from a backend. Every backend
+has the same small interface:
+  extract(image_paths, timings=None, job=None)
+                 yields (detections, devices) per image, in input order
+  warm_up()      loads the engine ahead of time, returns a short description
+  close()        releases worker processes or other resources
+
+EasyOcrBackend is the normal one (OCR daemon, worker pool or in-process
+reader); OnnxBackend runs the ONNX export of the same models (ocr_onnx)
+on the pool or in-process. RecordingBackend wraps another backend and
+stores the detections of every image under its content hash;
+ReplayBackend serves stored detections back without loading easyocr or
+torch, so the parser, layout and export can be benchmarked and checked
+on large sets of real captures in seconds.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+from device_export import ocr_summary
+from ocr_cache import hash_file
+from ocr_engine import (
+    DEFAULT_OCR_PROFILE, OcrPool, add_timing, create_reader, extract_image, normalize_detections, parse_detections,
+    warm_up_reader,
+)
+
+
+class EasyOcrBackend:
+    """EasyOCR via a running OCR daemon, a worker pool or an in-process reader"""
+
+    name = "easyocr"
+
+    def __init__(self, workers, gpu=False, use_daemon=True, on_status=None, options=None, image_cache=None):
+        self.workers = workers
+        self.gpu = gpu
+        self.use_daemon = use_daemon
+        self.on_status = on_status or (lambda text: None)
+        self.options = options
+        self.profile = (options or {}).get("profile", DEFAULT_OCR_PROFILE)
+        # Decoded images shared with the GUI views (in-process OCR only,
+        # the daemon and pool workers decode in their own process)
+        self.image_cache = image_cache
+        self.reader = None
+        self.pool = None
+
+    def extract(self, image_paths, timings=None, job=None):
+        """OCR images, yields (detections, devices) in input order"""
+        if not image_paths:
+            return iter(())
+        if self.use_daemon:
+            from ocr_daemon import connect_daemon
+            daemon = connect_daemon()
+            if daemon is not None:
+                # A running OCR daemon already has the model loaded
+                return daemon.extract_paths(image_paths, self.options)
+        if self.pool is not None or (self.workers > 1 and len(image_paths) > 1):
+            # Several images (or a pool already started): OCR on worker processes
+            if self.pool is None:
+                if self.reader is None:
+                    self.on_status(f"First time: Starting {self.workers} OCR workers... (10-30 seconds)")
+                self.pool = OcrPool(self.workers, gpu=self.gpu, options=self.options)
+            if self.reader is not None:
+                return self._extract_while_pool_starts(list(image_paths), timings, job)
+            return self.pool.imap(image_paths, timings, job)
+        # Initialize reader if needed (first time only)
+        if self.reader is None:
+            self.on_status("First time: Loading OCR engine... (10-30 seconds)")
+            self.reader = create_reader(gpu=self.gpu, engine=self.name, profile=self.profile)
+        return (extract_image(self.reader, self._load_image(image_path, timings), self.options, timings, job)
+                for image_path in image_paths)
+
+    def _extract_while_pool_starts(self, image_paths, timings, job):
+        """OCR on the warm in-process reader until a worker is ready, then hand the rest to the pool"""
+        for idx, image_path in enumerate(image_paths):
+            if self.pool.is_ready():
+                # The workers have their own readers, release the warm-up one
+                self.reader = None
+                yield from self.pool.imap(image_paths[idx:], timings, job)
+                return
+            yield extract_image(self.reader, self._load_image(image_path, timings), self.options, timings, job)
+
+    def _load_image(self, image_path, timings):
+        """Decoded image from the shared image cache, or the path when there is none"""
+        if self.image_cache is None:
+            return image_path
+        start = time.perf_counter()
+        image = self.image_cache.full(image_path)
+        add_timing(timings, 'decode', start)
+        return image
+
+    def warm_up(self):
+        """Load the OCR engine ahead of the first extraction, returns a short description
+
+        Only one in-process reader is loaded; the worker processes (a reader
+        of several hundred MB each) start when an extraction has several
+        images to share between them, and the warm reader keeps extracting
+        until the first worker is ready.
+        """
+        if self.use_daemon:
+            from ocr_daemon import connect_daemon
+            if connect_daemon() is not None:
+                return "OCR daemon"
+        if self.pool is not None:
+            self.pool.wait_ready()
+            return f"{self.workers} workers"
+        if self.reader is None:
+            self.reader = create_reader(gpu=self.gpu, engine=self.name, profile=self.profile)
+        warm_up_reader(self.reader)
+        return "in-process"
+
+    def close(self):
+        """Shut down OCR worker processes"""
+        if self.pool is not None:
+            self.pool.close()
+            self.pool = None
+
+
+class OnnxBackend(EasyOcrBackend):
+    """ONNX Runtime export of the EasyOCR models on the worker pool or in-process
+
+    The OCR daemon is skipped, it always runs EasyOCR.
+    """
+
+    name = "onnx"
+
+    def __init__(self, workers, on_status=None, options=None, image_cache=None):
+        super().__init__(workers, gpu=False, use_daemon=False, on_status=on_status, options=options,
+                         image_cache=image_cache)
+
+
+class RecordingStore:
+    """Folder of recorded detections, one <image sha256>.json file per image"""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+
+    def _path(self, image_hash):
+        return self.directory / f"{image_hash}.json"
+
+    def get(self, image_hash):
+        """Recorded detections for an image hash, or None"""
+        record = self.get_record(image_hash)
+        return record["detections"] if record is not None else None
+
+    def get_record(self, image_hash):
+        """Whole record (image name, params, detections) for an image hash, or None"""
+        try:
+            with open(self._path(image_hash), encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def put(self, image_hash, detections, image_name="", params=None):
+        """Store the detections of one image (replaces an earlier recording)"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        record = {"image": image_name, "params": params or {}, "detections": detections}
+        path = self._path(image_hash)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(record, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    def records(self):
+        """(image hash, record dict) for every recording, sorted by hash"""
+        for path in sorted(self.directory.glob("*.json")):
+            with open(path, encoding='utf-8') as f:
+                yield path.stem, json.load(f)
+
+    def __len__(self):
+        return sum(1 for _ in self.directory.glob("*.json"))
+
+
+class RecordingBackend:
+    """Runs another backend and records each image's detections in a RecordingStore"""
+
+    def __init__(self, backend, store, params=None):
+        self.backend = backend
+        self.store = store
+        self.params = params
+        self.name = f"{backend.name} (recording)"
+
+    def extract(self, image_paths, timings=None, job=None):
+        image_paths = list(image_paths)
+        results = self.backend.extract(image_paths, timings, job)
+        for image_path, (detections, devices) in zip(image_paths, results):
+            detections = normalize_detections(detections)
+            self.store.put(hash_file(image_path), detections, Path(image_path).name, self.params)
+            yield detections, devices
+
+    def warm_up(self):
+        return self.backend.warm_up()
+
+    def close(self):
+        self.backend.close()
+
+
+class ReplayBackend:
+    """Serves recorded detections by image content hash, no OCR engine needed
+
+    Images without a recording are reported through on_status and give
+    no detections.
+    """
+
+    name = "replay"
+
+    def __init__(self, store, on_status=None):
+        self.store = store
+        self.on_status = on_status or (lambda text: None)
+        # (engine, profile) of the recordings served so far
+        self.recorded = set()
+
+    def extract(self, image_paths, timings=None, job=None):
+        for image_path in image_paths:
+            if job is not None:
+                job.checkpoint()
+            record = self.store.get_record(hash_file(image_path))
+            if record is None:
+                self.on_status(f"⚠ No recording for {Path(image_path).name}")
+                detections = []
+            else:
+                detections = record["detections"]
+                params = record.get("params") or {}
+                self.recorded.add((params.get("engine"), (params.get("options") or {}).get("profile")))
+            start = time.perf_counter()
+            devices = parse_detections(detections)
+            add_timing(timings, 'parse', start)
+            yield detections, devices
+
+    def warm_up(self):
+        return f"replay of {len(self.store)} recordings"
+
+    def ocr_info(self):
+        """Export OCR info: replay, with the engine and profile of the recordings served"""
+        recorded = ocr_summary(self.recorded) or {'engine': None, 'profile': None}
+        engine = recorded['engine']
+        return {'engine': f"replay of {engine}" if engine else "replay", 'profile': recorded['profile']}
+
+    def close(self):
+        pass
@@ -0,0 +1,107 @@
+"""
+On-disk OCR result cache
+
+Stores raw readtext detections in SQLite, keyed by the image content hash
+plus the OCR settings (languages, model, parameters). Re-extracting the
+same screenshots - after a restart, a re-upload or on another machine
+sharing the cache folder - then skips OCR entirely. The cache is capped
+in size and evicts least recently used entries.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+
+# Cache folder override, e.g. a shared network folder for the whole team
+CACHE_DIR_ENV_VAR = "SERIAL_EXTRACTOR_CACHE_DIR"
+DEFAULT_CACHE_DIR = Path.home() / ".technohull_extractor"
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+
+def hash_file(path):
+    """SHA-256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_params(params):
+    """Stable hash of the OCR settings dict"""
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+
+class OcrCache:
+    """SQLite cache of readtext detections with a size cap and LRU eviction"""
+
+    def __init__(self, path=None, max_bytes=DEFAULT_MAX_BYTES):
+        if path is None:
+            cache_dir = Path(os.environ.get(CACHE_DIR_ENV_VAR) or DEFAULT_CACHE_DIR)
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            path = cache_dir / "ocr_cache.sqlite3"
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS detections ("
+            "key TEXT PRIMARY KEY, data TEXT NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS detections_lru ON detections (last_access)")
+        self._db.commit()
+
+    @staticmethod
+    def key_for(image_path, params):
+        """Cache key for an image file and OCR settings"""
+        return f"{hash_file(image_path)}:{hash_params(params)}"
+
+    def get(self, key):
+        """Return cached detections or None, counting hits and misses"""
+        with self._lock:
+            row = self._db.execute("SELECT data FROM detections WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._db.execute("UPDATE detections SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+        return json.loads(row[0])
+
+    def put(self, key, detections):
+        """Store JSON-friendly detections and evict old entries over the size cap"""
+        data = json.dumps(detections, separators=(',', ':'))
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO detections (key, data, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, data, len(data), time.time()),
+            )
+            self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits max_bytes"""
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM detections").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._db.execute("SELECT key, size FROM detections ORDER BY last_access").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM detections WHERE key = ?", (key,))
+            total -= size
+
+    def stats_text(self):
+        """Short hit/miss summary for the status bar"""
+        return f"cache: {self.hits} hit{'s' if self.hits != 1 else ''} / {self.misses} miss{'es' if self.misses != 1 else ''}"
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            self._db.close()
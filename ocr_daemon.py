@@ -0,0 +1,226 @@
+"""
+Local OCR daemon
+
+Long-lived localhost HTTP service that loads the EasyOCR reader once and
+keeps it warm, so the GUI and the command line skip the 10-30 second
+model load. Both fall back to in-process OCR when it is not running.
+The reader of another OCR profile is loaded on its first request.
+
+Usage:
+    python -m ocr_daemon [--host 127.0.0.1] [--port 8765]
+
+Endpoints:
+    GET  /health   -> {"status": "ok", "languages": [...]}
+    POST /extract  JSON {"paths": [...], "options": {...}}
+                   -> {"results": [{"path", "detections", "devices"}]}
+                   (loopback clients only, the daemon reads the files)
+    POST /extract  raw image bytes (optional X-OCR-Options JSON header)
+                   -> {"results": [{"path", "detections", "devices"}]}
+
+Listening on anything but a loopback address lets other machines use the
+daemon; they can only send image bytes, never file paths.
+"""
+
+import argparse
+import ipaddress
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from ocr_engine import DEFAULT_OCR_PROFILE, OCR_LANGUAGES, OCR_PROFILES, create_reader, extract_image, normalize_detections
+
+
+# Daemon address, override with SERIAL_EXTRACTOR_DAEMON=host:port
+DAEMON_ENV_VAR = "SERIAL_EXTRACTOR_DAEMON"
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+def daemon_address():
+    """Return (host, port) of the OCR daemon"""
+    configured = os.environ.get(DAEMON_ENV_VAR, "").strip()
+    if configured:
+        host, _, port = configured.rpartition(":")
+        if port.isdigit():
+            return host or DEFAULT_HOST, int(port)
+    return DEFAULT_HOST, DEFAULT_PORT
+
+
+def is_loopback(host):
+    """Check whether a host name or address only reaches this machine"""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class OcrDaemonHandler(BaseHTTPRequestHandler):
+    """HTTP handler, the reader lives on the server object"""
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok", "languages": OCR_LANGUAGES})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/extract":
+            self._send_json(404, {"error": "not found"})
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        try:
+            if self.headers.get("Content-Type", "").startswith("application/json"):
+                if not is_loopback(self.client_address[0]):
+                    # Paths would let other machines read files on this one
+                    self._send_json(403, {"error": "file paths are only accepted from this machine, send image bytes"})
+                    return
+                request = json.loads(body)
+                sources = [(path, path) for path in request["paths"]]
+                options = request.get("options")
+            else:
+                sources = [(self.headers.get("X-Image-Name", ""), body)]
+                options = json.loads(self.headers.get("X-OCR-Options") or "null")
+            results = []
+            for name, image in sources:
+                detections, devices = self.server.extract(image, options)
+                results.append({"path": name, "detections": detections, "devices": devices})
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+            return
+        self._send_json(200, {"results": results})
+
+    def log_message(self, format, *args):
+        # Keep the console quiet apart from errors
+        pass
+
+
+class OcrDaemon(ThreadingHTTPServer):
+    """HTTP server holding warm EasyOCR readers, one per OCR profile in use"""
+
+    daemon_threads = True
+
+    def __init__(self, address, gpu=False, profile=DEFAULT_OCR_PROFILE):
+        self.gpu = gpu
+        # Load the models before listening so health checks only pass once warm
+        self.readers = {profile: create_reader(gpu=gpu, profile=profile)}
+        super().__init__(address, OcrDaemonHandler)
+        # The readers are not thread safe, requests take turns
+        self._reader_lock = threading.Lock()
+
+    def extract(self, image, options=None):
+        """OCR one image (path or bytes), returns JSON-friendly (detections, devices)"""
+        profile = (options or {}).get("profile", DEFAULT_OCR_PROFILE)
+        with self._reader_lock:
+            if profile not in self.readers:
+                self.readers[profile] = create_reader(gpu=self.gpu, profile=profile)
+            detections, devices = extract_image(self.readers[profile], image, options)
+        return normalize_detections(detections), devices
+
+
+class OcrDaemonClient:
+    """Client for a running OCR daemon"""
+
+    def __init__(self, host=None, port=None, timeout=300):
+        default_host, default_port = daemon_address()
+        self.host = host or default_host
+        self.base_url = f"http://{self.host}:{port or default_port}"
+        self.timeout = timeout
+
+    def is_available(self):
+        """Quick health check, False when no daemon is listening"""
+        try:
+            with urllib.request.urlopen(f"{self.base_url}/health", timeout=0.5) as response:
+                return json.load(response).get("status") == "ok"
+        except (OSError, ValueError):
+            return False
+
+    def _post(self, body, content_type, headers=None):
+        request = urllib.request.Request(
+            f"{self.base_url}/extract",
+            data=body,
+            headers={"Content-Type": content_type, **(headers or {})},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                payload = json.load(response)
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.load(e).get('error', e.reason)
+            except (ValueError, AttributeError):
+                # Not a JSON error body (a proxy, or a handler that crashed)
+                message = e.reason
+            raise RuntimeError(f"OCR daemon error: {message}") from e
+        return [(result["detections"], result["devices"]) for result in payload["results"]]
+
+    def extract_paths(self, image_paths, options=None):
+        """OCR images by path, yields (detections, devices) in input order
+
+        A daemon on another machine cannot read local paths, so it gets the
+        image bytes instead.
+        """
+        local = is_loopback(self.host)
+        for image_path in image_paths:
+            if not local:
+                yield self.extract_bytes(Path(image_path).read_bytes(), Path(image_path).name, options)
+                continue
+            body = json.dumps({"paths": [str(Path(image_path).resolve())], "options": options}).encode('utf-8')
+            yield self._post(body, "application/json")[0]
+
+    def extract_bytes(self, data, name="", options=None):
+        """OCR encoded image bytes, returns (detections, devices)"""
+        headers = {"X-Image-Name": name, "X-OCR-Options": json.dumps(options)}
+        return self._post(data, "application/octet-stream", headers)[0]
+
+
+def connect_daemon():
+    """Return a client for the running OCR daemon, or None when it is not running"""
+    client = OcrDaemonClient()
+    return client if client.is_available() else None
+
+
+def main(argv=None):
+    """Run the OCR daemon until interrupted"""
+    parser = argparse.ArgumentParser(prog="python -m ocr_daemon", description="Keep the OCR engine loaded for the GUI and command line.")
+    default_host, default_port = daemon_address()
+    parser.add_argument("--host", default=default_host, help=f"address to listen on (default: {default_host})")
+    parser.add_argument("--port", type=int, default=default_port, help=f"port to listen on (default: {default_port})")
+    parser.add_argument("--gpu", action="store_true", help="run OCR on the GPU")
+    parser.add_argument("--profile", choices=OCR_PROFILES, default=DEFAULT_OCR_PROFILE,
+                        help=f"OCR profile loaded on start, others load on first use (default: {DEFAULT_OCR_PROFILE})")
+    args = parser.parse_args(argv)
+
+    if not is_loopback(args.host):
+        print(f"⚠ Listening on {args.host}: other machines can send images to this OCR daemon "
+              "(file paths are only accepted from this machine)", file=sys.stderr)
+    print("Loading OCR engine... (10-30 seconds)", file=sys.stderr)
+    server = OcrDaemon((args.host, args.port), gpu=args.gpu, profile=args.profile)
+    print(f"✓ OCR daemon ready on http://{args.host}:{args.port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,479 @@
+"""
+OCR engine helpers
+
+Creates the EasyOCR reader and runs the OCR + parse pipeline for one
+image, either in-process or on a pool of worker processes that each keep
+their own warm reader. OcrService serves cached results and gets the
+rest from an OCR backend (ocr_backends: daemon, pool or in-process
+reader by default). Shared by the GUI and the command line, no GUI
+imports here.
+"""
+
+import collections
+import io
+import multiprocessing
+import os
+import signal
+import string
+import threading
+import time
+from importlib import metadata
+from pathlib import Path
+
+from device_parser import parse_device_rows
+from ocr_preprocess import DEFAULT_PREPROCESS_PROFILE, preprocess_image, resolve_preprocess, restore_detections
+
+
+OCR_LANGUAGES = ['en']
+
+# OCR engines: EasyOCR on torch, or its ONNX export on onnxruntime (ocr_onnx)
+OCR_ENGINES = ("easyocr", "onnx")
+DEFAULT_OCR_ENGINE = "easyocr"
+# Environment override for the engine used by the GUI (and the CLI default)
+ENGINE_ENV_VAR = "SERIAL_EXTRACTOR_OCR_ENGINE"
+
+# Characters of serials and product codes, plus the space between tokens.
+# Greek capitals that look like Latin ones turn up in some serials; the
+# English recogniser has no Greek characters, so they only count for
+# recognisers that do.
+SERIAL_ALLOWLIST = string.ascii_uppercase + string.digits + "- " + "ΑΒΕΖΗΙΚΜΝΟΡΤΥΧ"
+
+# OCR profile settings:
+#   quantize      int8 recogniser: dynamic quantisation of its linear and LSTM
+#                 layers (CPU only; the onnx engine keeps the int8 model on disk).
+#                 False: float recogniser. None: the engine's default, which is
+#                 int8 on CPU for EasyOCR and float for the onnx engine
+#   allowlist     characters the recogniser may return (None: all)
+#   decoder       "greedy" or "beamsearch" (CTC decoding of the recogniser output)
+#   batch_size    text crops per recogniser call
+#   canvas_size   longest side of the detector input in pixels
+#   mag_ratio     magnification of the image before detection
+OCR_PROFILES = {
+    # EasyOCR's default recogniser is int8 on CPU already, so with EasyOCR the
+    # gain comes from the smaller canvas, larger batches and the allowlist.
+    # Upper-case allowlist: labels and product names come back upper-cased,
+    # which the catalogue and engine keyword matching ignore anyway
+    "fast": {"quantize": True, "allowlist": SERIAL_ALLOWLIST, "decoder": "greedy", "batch_size": 16,
+             "canvas_size": 1920, "mag_ratio": 1.0},
+    # readtext defaults apart from the batch size, which does not change results
+    "balanced": {"quantize": None, "allowlist": None, "decoder": "greedy", "batch_size": 8,
+                 "canvas_size": 2560, "mag_ratio": 1.0},
+    # Small text on low resolution captures: magnified detection, beam search decoding
+    "thorough": {"quantize": False, "allowlist": None, "decoder": "beamsearch", "batch_size": 1,
+                 "canvas_size": 2560, "mag_ratio": 1.5},
+}
+DEFAULT_OCR_PROFILE = "balanced"
+# Profile settings passed to reader.detect / reader.recognize (readtext takes both)
+DETECT_SETTINGS = ("canvas_size", "mag_ratio")
+RECOGNIZE_SETTINGS = ("allowlist", "decoder", "batch_size")
+
+# Environment override for the number of OCR worker processes
+WORKERS_ENV_VAR = "SERIAL_EXTRACTOR_OCR_WORKERS"
+# Each worker holds its own reader (several hundred MB), so keep the default small
+MAX_DEFAULT_WORKERS = 4
+# Seconds between cancel checks while waiting for a worker result
+CANCEL_POLL_SECONDS = 0.2
+
+
+class ExtractionCancelled(Exception):
+    """Raised inside an extraction when its job was cancelled"""
+
+
+class ExtractionJob:
+    """Cancel and pause controls for one extraction run, safe to use from any thread"""
+
+    def __init__(self):
+        self._cancelled = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+
+    def cancel(self):
+        """Stop at the next checkpoint (also ends a pause)"""
+        self._cancelled.set()
+        self._running.set()
+
+    def pause(self):
+        """Hold the extraction at the next checkpoint"""
+        if not self._cancelled.is_set():
+            self._running.clear()
+
+    def resume(self):
+        """Continue a paused extraction"""
+        self._running.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    @property
+    def paused(self):
+        return not self._running.is_set()
+
+    def checkpoint(self):
+        """Wait while paused, raise ExtractionCancelled once cancelled"""
+        self._running.wait()
+        if self._cancelled.is_set():
+            raise ExtractionCancelled()
+
+
+def resolve_ocr_profile(profile):
+    """Return the settings dict for an OCR profile name"""
+    if profile not in OCR_PROFILES:
+        raise ValueError(f"Unknown OCR profile: {profile}")
+    return dict(OCR_PROFILES[profile])
+
+
+def profile_kwargs(profile, settings):
+    """Keyword arguments for detect/recognize from an OCR profile name"""
+    profile_settings = resolve_ocr_profile(profile)
+    return {name: profile_settings[name] for name in settings}
+
+
+def create_reader(gpu=False, engine=DEFAULT_OCR_ENGINE, threads=None, profile=DEFAULT_OCR_PROFILE, **kwargs):
+    """Create the OCR reader (loads the models, takes 10-30 seconds for EasyOCR)"""
+    quantize = resolve_ocr_profile(profile)["quantize"]
+    if engine == "onnx":
+        from ocr_onnx import OnnxReader
+        return OnnxReader(threads=threads, quantized=bool(quantize))
+    import easyocr
+    if quantize is None:
+        # easyocr's default: int8 recogniser on CPU
+        return easyocr.Reader(OCR_LANGUAGES, gpu=gpu, **kwargs)
+    # easyocr's own quantize option silently keeps the float model when
+    # quantisation fails, so the profile quantises explicitly
+    reader = easyocr.Reader(OCR_LANGUAGES, gpu=gpu, quantize=False, **kwargs)
+    if quantize and not gpu:
+        quantize_recognizer(reader)
+    return reader
+
+
+def quantize_recognizer(reader):
+    """Dynamic int8 quantisation of an EasyOCR reader's recogniser (linear and LSTM layers, in place)"""
+    import warnings
+    import torch
+    with warnings.catch_warnings():
+        # Eager-mode quantisation is deprecated in favour of torchao but still supported
+        warnings.simplefilter("ignore")
+        torch.ao.quantization.quantize_dynamic(
+            reader.recognizer, {torch.nn.Linear, torch.nn.LSTM}, dtype=torch.qint8, inplace=True
+        )
+
+
+def default_engine():
+    """OCR engine from SERIAL_EXTRACTOR_OCR_ENGINE, else EasyOCR"""
+    engine = os.environ.get(ENGINE_ENV_VAR, "").strip().lower()
+    return engine if engine in OCR_ENGINES else DEFAULT_OCR_ENGINE
+
+
+def ocr_options(preprocess=DEFAULT_PREPROCESS_PROFILE, targeted=False, engine=None, profile=DEFAULT_OCR_PROFILE):
+    """Per-run OCR options passed to extract_image, pool workers and the daemon"""
+    resolve_ocr_profile(profile)
+    return {
+        "preprocess": resolve_preprocess(preprocess),
+        "targeted": bool(targeted),
+        "engine": engine or default_engine(),
+        "profile": profile,
+    }
+
+
+def ocr_params(options=None):
+    """OCR settings that change readtext output, part of the result cache key"""
+    engine = (options or {}).get("engine", DEFAULT_OCR_ENGINE)
+    profile = (options or {}).get("profile", DEFAULT_OCR_PROFILE)
+    try:
+        version = metadata.version("onnxruntime" if engine == "onnx" else "easyocr")
+    except metadata.PackageNotFoundError:
+        version = "unknown"
+    return {
+        "engine": engine,
+        "version": version,
+        "languages": OCR_LANGUAGES,
+        "readtext": profile_kwargs(profile, DETECT_SETTINGS + RECOGNIZE_SETTINGS),
+        "quantize": resolve_ocr_profile(profile)["quantize"],
+        "options": options or {},
+    }
+
+
+def warm_up_reader(reader):
+    """Run one tiny inference so the first real readtext skips one-off setup costs"""
+    import numpy as np
+    reader.readtext(np.full((32, 128, 3), 255, dtype=np.uint8))
+
+
+def parse_detections(detections):
+    """Parse devices from readtext detections, grouped into table rows by box geometry"""
+    from ocr_layout import layout_rows, row_tokens
+    return parse_device_rows(row_tokens(layout_rows(detections)))
+
+
+def normalize_detections(detections):
+    """Convert readtext detections (numpy values) to plain JSON-friendly lists"""
+    return [
+        [[[float(x), float(y)] for x, y in box], str(text), float(confidence)]
+        for box, text, confidence in detections
+    ]
+
+
+def add_timing(timings, stage, start):
+    """Add the time since start to a stage total (no-op when timings is None)"""
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - start
+
+
+def format_timings(timings):
+    """Stage timings as a short text, e.g. 'decode 0.2 s, ocr 8.1 s'"""
+    return ", ".join(f"{stage} {seconds:.1f} s" for stage, seconds in timings.items())
+
+
+def decode_image(image, timings=None):
+    """Open a path or encoded bytes as a loaded PIL image"""
+    from PIL import Image
+    start = time.perf_counter()
+    pil_image = Image.open(io.BytesIO(image) if isinstance(image, (bytes, bytearray)) else image)
+    pil_image.load()
+    add_timing(timings, 'decode', start)
+    return pil_image
+
+
+def extract_image(reader, image, options=None, timings=None, job=None):
+    """Run OCR on one image (path, bytes, PIL image or array), returns (raw detections, parsed devices)"""
+    options = options or {}
+    preprocess = options.get("preprocess")
+    targeted = options.get("targeted")
+    profile = options.get("profile", DEFAULT_OCR_PROFILE)
+    detect_kwargs = profile_kwargs(profile, DETECT_SETTINGS)
+    recognize_kwargs = profile_kwargs(profile, RECOGNIZE_SETTINGS)
+    is_pil = hasattr(image, 'getbands')
+    scale, offset = 1.0, (0, 0)
+    if (preprocess or targeted or is_pil) and not hasattr(image, 'shape'):
+        pil_image = image if is_pil else decode_image(image, timings)
+        if preprocess:
+            image, scale, offset = preprocess_image(pil_image, preprocess, timings)
+        else:
+            import numpy as np
+            image = np.asarray(pil_image.convert('RGB'))
+    elif isinstance(image, Path):
+        image = str(image)
+
+    if targeted:
+        # Detector first, recogniser only on rows that can hold serials
+        from ocr_targeted import targeted_readtext
+        detections = targeted_readtext(reader, image, timings, job, detect_kwargs=detect_kwargs, **recognize_kwargs)
+    else:
+        if job is not None:
+            job.checkpoint()
+        start = time.perf_counter()
+        detections = reader.readtext(image, **detect_kwargs, **recognize_kwargs)
+        add_timing(timings, 'ocr', start)
+    detections = restore_detections(detections, scale, offset)
+
+    start = time.perf_counter()
+    devices = parse_detections(detections)
+    add_timing(timings, 'parse', start)
+    return detections, devices
+
+
+def default_worker_count(image_count=None):
+    """Number of OCR worker processes to use (env override, else half the cores)"""
+    configured = os.environ.get(WORKERS_ENV_VAR, "").strip()
+    if configured.isdigit() and int(configured) > 0:
+        workers = int(configured)
+    else:
+        workers = min(MAX_DEFAULT_WORKERS, max(1, (os.cpu_count() or 1) // 2))
+    if image_count is not None:
+        workers = min(workers, max(1, image_count))
+    return workers
+
+
+def threads_per_worker(workers):
+    """Torch intra-op threads per worker so the pool does not oversubscribe the CPU"""
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+# Reader owned by the current worker process (set by _init_worker)
+_worker_reader = None
+_worker_error = None
+_worker_options = None
+
+
+def _init_worker(threads, gpu, download_lock, options):
+    """Pool initializer: limit torch threads and load this worker's reader"""
+    global _worker_reader, _worker_error, _worker_options
+    _worker_options = options
+    # Ctrl-C is handled by the parent, which terminates the pool
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+    os.environ["MKL_NUM_THREADS"] = str(threads)
+    # An exception escaping the initializer makes the pool respawn workers
+    # forever, so keep it and report it from the first task instead
+    try:
+        engine = (options or {}).get("engine", DEFAULT_OCR_ENGINE)
+        profile = (options or {}).get("profile", DEFAULT_OCR_PROFILE)
+        if engine == "onnx":
+            _worker_reader = create_reader(engine=engine, threads=threads, profile=profile)
+        else:
+            import torch
+            torch.set_num_threads(threads)
+            try:
+                _worker_reader = create_reader(gpu=gpu, profile=profile, download_enabled=False)
+            except FileNotFoundError:
+                # Models not downloaded yet: let one worker at a time fetch them
+                with download_lock:
+                    _worker_reader = create_reader(gpu=gpu, profile=profile)
+        warm_up_reader(_worker_reader)
+    except Exception as e:
+        _worker_error = e
+
+
+def _check_worker():
+    """Pool task: raise if this worker's reader failed to load"""
+    if _worker_error is not None:
+        raise RuntimeError(f"OCR worker failed to start: {_worker_error}")
+
+
+def _extract_in_worker(image_path):
+    """Pool task: OCR and parse one image, returns (detections, devices, timings)"""
+    _check_worker()
+    timings = {}
+    detections, devices = extract_image(_worker_reader, image_path, _worker_options, timings)
+    return detections, devices, timings
+
+
+class OcrPool:
+    """Pool of worker processes, each with its own warm EasyOCR reader"""
+
+    def __init__(self, workers=None, gpu=False, options=None):
+        self.workers = workers or default_worker_count()
+        self.options = options
+        self._ready = None
+        context = multiprocessing.get_context("spawn")
+        self._pool = context.Pool(
+            processes=self.workers,
+            initializer=_init_worker,
+            initargs=(threads_per_worker(self.workers), gpu, context.Lock(), options),
+        )
+
+    def wait_ready(self):
+        """Block until a worker has loaded its reader (raises if loading failed)"""
+        self._pool.apply(_check_worker)
+
+    def is_ready(self):
+        """True once a worker has loaded its reader (never blocks)"""
+        if self._ready is None:
+            self._ready = self._pool.apply_async(_check_worker)
+        return self._ready.ready() and self._ready.successful()
+
+    def imap(self, image_paths, timings=None, job=None):
+        """OCR images in parallel, yields (detections, devices) in input order
+
+        Only a few images per worker are queued at a time, so a paused job
+        stops handing out work and a cancelled one stops waiting.
+        """
+        pending = collections.deque()
+        remaining = iter(image_paths)
+
+        def submit():
+            while len(pending) < 2 * self.workers:
+                image_path = next(remaining, None)
+                if image_path is None:
+                    return
+                if job is not None:
+                    job.checkpoint()
+                pending.append(self._pool.apply_async(_extract_in_worker, (str(image_path),)))
+
+        submit()
+        while pending:
+            result = pending[0]
+            while not result.ready():
+                result.wait(CANCEL_POLL_SECONDS)
+                if job is not None and job.cancelled:
+                    raise ExtractionCancelled()
+            pending.popleft()
+            detections, devices, image_timings = result.get()
+            if timings is not None:
+                for stage, seconds in image_timings.items():
+                    timings[stage] = timings.get(stage, 0.0) + seconds
+            yield detections, devices
+            submit()
+
+    def close(self):
+        """Shut down the worker processes"""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class OcrService:
+    """Runs OCR for a list of images via the result cache and an OCR backend (see ocr_backends)"""
+
+    def __init__(self, workers=None, gpu=False, use_daemon=True, cache=None, on_status=None, options=None,
+                 image_cache=None, backend=None):
+        self.cache = cache
+        self.options = options or ocr_options()
+        if backend is None:
+            from ocr_backends import EasyOcrBackend, OnnxBackend
+            workers = workers or default_worker_count()
+            if self.options.get("engine") == "onnx":
+                backend = OnnxBackend(workers, on_status, self.options, image_cache)
+            else:
+                backend = EasyOcrBackend(workers, gpu, use_daemon, on_status, self.options, image_cache)
+        self.backend = backend
+        # Per-stage seconds of the last extract() run (worker stages are summed)
+        self.timings = {}
+
+    def warm_up(self):
+        """Load the OCR engine ahead of the first extraction, returns a short description"""
+        return self.backend.warm_up()
+
+    def extract(self, image_paths, job=None):
+        """OCR images, yields (detections, devices) in input order
+
+        With a job, extraction pauses and stops between images (and between
+        OCR stages where possible); a cancelled job raises ExtractionCancelled
+        and shuts the worker pool down.
+        """
+        # Cache hits are parsed from the stored detections, so a fully
+        # cached run never loads torch
+        image_paths = list(image_paths)
+        params = ocr_params(self.options)
+        self.timings = {}
+        keys = [None] * len(image_paths)
+        cached = {}
+        if self.cache is not None:
+            for idx, image_path in enumerate(image_paths):
+                keys[idx] = self.cache.key_for(image_path, params)
+                detections = self.cache.get(keys[idx])
+                if detections is not None:
+                    cached[idx] = detections
+
+        try:
+            uncached = [path for idx, path in enumerate(image_paths) if idx not in cached]
+            results = self.backend.extract(uncached, self.timings, job)
+            for idx, image_path in enumerate(image_paths):
+                if job is not None:
+                    job.checkpoint()
+                if idx in cached:
+                    detections = cached[idx]
+                    yield detections, parse_detections(detections)
+                    continue
+                detections, devices = next(results)
+                detections = normalize_detections(detections)
+                if self.cache is not None:
+                    self.cache.put(keys[idx], detections)
+                yield detections, devices
+        except Exception:
+            # Drop the worker pool so the next extraction starts fresh workers
+            # (after a cancel this releases the workers straight away)
+            self.close()
+            raise
+
+    def close(self):
+        """Shut down OCR worker processes"""
+        self.backend.close()
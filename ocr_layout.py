@@ -0,0 +1,86 @@
+"""
+Table layout from readtext boxes
+
+readtext returns one detection per text box in detector order. Device
+list screenshots are tables, so the boxes are regrouped here: rows by
+box y-centre, columns by left edge, cells left to right. The parser then
+works on structured rows instead of guessing from a flat list of lines.
+"""
+
+
+# Boxes whose y-centres are closer than this fraction of the median box
+# height share a row; left edges closer than this fraction share a column
+ROW_TOLERANCE = 0.5
+COLUMN_TOLERANCE = 1.0
+
+
+def _split_points(values, tolerance):
+    """Cluster ids for 1-D values: a new cluster starts at each gap wider than tolerance"""
+    import numpy as np
+
+    order = np.argsort(values, kind='stable')
+    gaps = np.diff(values[order]) > tolerance
+    labels = np.empty(len(values), dtype=np.intp)
+    labels[order] = np.concatenate(([0], np.cumsum(gaps)))
+    return labels
+
+
+def cluster_rows(y_min, y_max, tolerance=ROW_TOLERANCE):
+    """Row id (top to bottom) for each box given its vertical extent"""
+    import numpy as np
+
+    y_min = np.asarray(y_min, dtype=float)
+    y_max = np.asarray(y_max, dtype=float)
+    if not len(y_min):
+        return np.empty(0, dtype=np.intp)
+    return _split_points((y_min + y_max) / 2, tolerance * np.median(y_max - y_min))
+
+
+def cluster_columns(x_min, y_min, y_max, tolerance=COLUMN_TOLERANCE):
+    """Column id (left to right) for each box given its left edge and vertical extent"""
+    import numpy as np
+
+    x_min = np.asarray(x_min, dtype=float)
+    if not len(x_min):
+        return np.empty(0, dtype=np.intp)
+    heights = np.asarray(y_max, dtype=float) - np.asarray(y_min, dtype=float)
+    return _split_points(x_min, tolerance * np.median(heights))
+
+
+def box_extents(detections):
+    """(x_min, x_max, y_min, y_max) arrays for readtext detections"""
+    import numpy as np
+
+    points = np.array([box for box, _, _ in detections], dtype=float).reshape(len(detections), -1, 2)
+    x, y = points[:, :, 0], points[:, :, 1]
+    return x.min(axis=1), x.max(axis=1), y.min(axis=1), y.max(axis=1)
+
+
+def layout_rows(detections):
+    """Group detections into table rows, returns rows of (column, detection) left to right"""
+    import numpy as np
+
+    if not detections:
+        return []
+    x_min, _, y_min, y_max = box_extents(detections)
+    row_ids = cluster_rows(y_min, y_max)
+    column_ids = cluster_columns(x_min, y_min, y_max)
+
+    rows = [[] for _ in range(int(row_ids.max()) + 1)]
+    for idx in np.lexsort((x_min, row_ids)):
+        rows[row_ids[idx]].append((int(column_ids[idx]), detections[idx]))
+    return rows
+
+
+def row_tokens(rows):
+    """Whitespace separated tokens of each layout row, in reading order"""
+    return [[token for _, detection in row for token in detection[1].split()] for row in rows]
+
+
+def row_box(detections, row):
+    """Bounding box (x0, y0, x1, y1) of one layout row, or None when out of range"""
+    rows = layout_rows(detections)
+    if row is None or not 0 <= row < len(rows):
+        return None
+    x_min, x_max, y_min, y_max = box_extents([detection for _, detection in rows[row]])
+    return float(x_min.min()), float(y_min.min()), float(x_max.max()), float(y_max.max())
@@ -0,0 +1,473 @@
+"""
+ONNX Runtime OCR engine
+
+Runs ONNX exports of the EasyOCR CRAFT detector and English recogniser
+with onnxruntime instead of torch. Pre- and post-processing follow
+readtext's defaults in numpy/OpenCV (score map thresholds, box grouping,
+greedy or beam search CTC decoding), and OnnxReader offers the same readtext, detect
+and recognize calls as easyocr.Reader, so extract_image, targeted
+recognition and the worker pool use it unchanged. Differences from
+easyocr: no second low-contrast recognition pass, and crops are batched
+by width.
+
+Export the models once on a machine with easyocr, torch and onnx:
+    python -m ocr_onnx --export
+They are read from ~/.technohull_extractor/onnx (override the folder
+with SERIAL_EXTRACTOR_ONNX_DIR). The fast OCR profile uses an int8 copy
+of the recogniser (linear and LSTM layers quantised), written by the
+export or on first use. onnxruntime and opencv are only imported when
+this engine is used.
+"""
+
+import argparse
+import io
+import json
+import math
+import os
+import sys
+from pathlib import Path
+
+from ocr_cache import CACHE_DIR_ENV_VAR, DEFAULT_CACHE_DIR
+
+
+MODEL_DIR_ENV_VAR = "SERIAL_EXTRACTOR_ONNX_DIR"
+DETECTOR_FILE = "craft.onnx"
+RECOGNIZER_FILE = "recognizer.onnx"
+# Int8 recogniser of the fast profile, quantised from RECOGNIZER_FILE
+RECOGNIZER_INT8_FILE = "recognizer.int8.onnx"
+# Only these are quantised: onnxruntime's dynamic int8 convolution is
+# several times slower than its float one
+QUANTIZE_OP_TYPES = ["MatMul", "Gemm", "LSTM"]
+METADATA_FILE = "recognizer.json"
+ONNX_OPSET = 17
+
+# readtext defaults
+CANVAS_SIZE = 2560
+MAG_RATIO = 1.0
+TEXT_THRESHOLD = 0.7
+LOW_TEXT = 0.4
+LINK_THRESHOLD = 0.4
+SLOPE_THS = 0.1
+YCENTER_THS = 0.5
+HEIGHT_THS = 0.5
+WIDTH_THS = 0.5
+ADD_MARGIN = 0.1
+MIN_SIZE = 20
+
+DETECTOR_MEAN = (0.485, 0.456, 0.406)
+DETECTOR_STD = (0.229, 0.224, 0.225)
+# Recogniser input height of the English model
+RECOGNIZER_HEIGHT = 64
+# Crops per recogniser call; crops are sorted by width so padding stays small
+RECOGNIZE_BATCH = 16
+# Beams kept by the beamsearch decoder (readtext's beamWidth default)
+BEAM_WIDTH = 5
+
+
+def model_dir():
+    """Folder holding the exported models"""
+    configured = os.environ.get(MODEL_DIR_ENV_VAR, "").strip()
+    if configured:
+        return Path(configured)
+    return Path(os.environ.get(CACHE_DIR_ENV_VAR) or DEFAULT_CACHE_DIR) / "onnx"
+
+
+def quantized_recognizer(directory=None):
+    """Path of the int8 recogniser, quantised from the float export when missing or older"""
+    directory = Path(directory or model_dir())
+    source, target = directory / RECOGNIZER_FILE, directory / RECOGNIZER_INT8_FILE
+    if target.exists() and target.stat().st_mtime >= source.stat().st_mtime:
+        return target
+    try:
+        import onnx
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+    except ImportError as e:
+        raise RuntimeError(
+            f"Quantising the recogniser needs the onnx package (pip install onnx), "
+            f"or copy {RECOGNIZER_INT8_FILE} from a machine that exported the models"
+        ) from e
+    # Pool workers may quantise at the same time: each writes its own file, and
+    # a loaded model (not a path) keeps quantize_dynamic's scratch files private
+    tmp_path = target.with_name(f"{target.stem}.{os.getpid()}.tmp.onnx")
+    quantize_dynamic(onnx.load(str(source)), str(tmp_path), weight_type=QuantType.QInt8,
+                     op_types_to_quantize=QUANTIZE_OP_TYPES)
+    os.replace(tmp_path, target)
+    return target
+
+
+def _rgb_array(image):
+    """Path, encoded bytes or array as an RGB uint8 array"""
+    import numpy as np
+    if isinstance(image, (str, Path, bytes, bytearray)):
+        from PIL import Image
+        source = io.BytesIO(image) if isinstance(image, (bytes, bytearray)) else image
+        with Image.open(source) as pil_image:
+            return np.asarray(pil_image.convert('RGB'))
+    image = np.asarray(image)
+    if image.ndim == 2:
+        return np.repeat(image[:, :, None], 3, axis=2)
+    return image[:, :, :3]
+
+
+def _score_map_boxes(text_map, link_map):
+    """Text boxes (4 corner points) on the detector score maps
+
+    Same rules as easyocr's getDetBoxes, but each component is processed
+    inside its own bounding region instead of on full-size masks.
+    """
+    import cv2
+    import numpy as np
+
+    text_score = text_map > LOW_TEXT
+    link_score = link_map > LINK_THRESHOLD
+    link_only = link_score & ~text_score
+    count, labels, stats, _ = cv2.connectedComponentsWithStats(
+        (text_score | link_score).astype(np.uint8), connectivity=4
+    )
+    map_h, map_w = text_map.shape
+    boxes = []
+    for k in range(1, count):
+        x, y, w, h, size = (int(value) for value in stats[k])
+        if size < 10:
+            continue
+        component = labels[y:y + h, x:x + w] == k
+        if text_map[y:y + h, x:x + w][component].max() < TEXT_THRESHOLD:
+            continue
+        niter = int(math.sqrt(size * min(w, h) / (w * h)) * 2)
+        sx, sy = max(0, x - niter), max(0, y - niter)
+        ex, ey = min(map_w, x + w + niter + 1), min(map_h, y + h + niter + 1)
+        segmap = np.zeros((ey - sy, ex - sx), dtype=np.uint8)
+        segmap[y - sy:y - sy + h, x - sx:x - sx + w][component] = 255
+        segmap[link_only[sy:ey, sx:ex]] = 0
+        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (1 + niter, 1 + niter))
+        segmap = cv2.dilate(segmap, kernel)
+
+        ys, xs = np.nonzero(segmap)
+        points = np.stack([xs + sx, ys + sy], axis=1).astype(np.int32)
+        box = cv2.boxPoints(cv2.minAreaRect(points))
+        box_w, box_h = np.linalg.norm(box[0] - box[1]), np.linalg.norm(box[1] - box[2])
+        if abs(1 - max(box_w, box_h) / (min(box_w, box_h) + 1e-5)) <= 0.1:
+            # Nearly square: use the axis-aligned bounds instead of a diamond
+            left, right = points[:, 0].min(), points[:, 0].max()
+            top, bottom = points[:, 1].min(), points[:, 1].max()
+            box = np.array([[left, top], [right, top], [right, bottom], [left, bottom]], dtype=np.float32)
+        start = box.sum(axis=1).argmin()
+        boxes.append(np.roll(box, 4 - start, 0))
+    return boxes
+
+
+def _merge_line(boxes):
+    """Merge horizontal boxes of one text line into [x_min, x_max, y_min, y_max] boxes"""
+    import numpy as np
+
+    if len(boxes) == 1:
+        box = boxes[0]
+        margin = int(ADD_MARGIN * min(box[1] - box[0], box[5]))
+        return [[box[0] - margin, box[1] + margin, box[2] - margin, box[3] + margin]]
+    groups, group = [], []
+    heights, x_max = [], 0
+    for box in sorted(boxes, key=lambda item: item[0]):
+        if group and abs(np.mean(heights) - box[5]) < HEIGHT_THS * np.mean(heights) \
+                and box[0] - x_max < WIDTH_THS * (box[3] - box[2]):
+            heights.append(box[5])
+        else:
+            if group:
+                groups.append(group)
+            group, heights = [], [box[5]]
+        group.append(box)
+        x_max = box[1]
+    groups.append(group)
+
+    merged = []
+    for group in groups:
+        x_min = min(box[0] for box in group)
+        x_max = max(box[1] for box in group)
+        y_min = min(box[2] for box in group)
+        y_max = max(box[3] for box in group)
+        margin = int(ADD_MARGIN * min(x_max - x_min, y_max - y_min))
+        merged.append([x_min - margin, x_max + margin, y_min - margin, y_max + margin])
+    return merged
+
+
+def group_text_boxes(polys):
+    """Split boxes into horizontal text lines and rotated boxes (easyocr group_text_box)"""
+    import numpy as np
+
+    horizontal, free = [], []
+    for poly in polys:
+        slope_up = (poly[3] - poly[1]) / max(10, poly[2] - poly[0])
+        slope_down = (poly[5] - poly[7]) / max(10, poly[4] - poly[6])
+        if max(abs(slope_up), abs(slope_down)) < SLOPE_THS:
+            xs, ys = poly[0::2], poly[1::2]
+            y_min, y_max = min(ys), max(ys)
+            horizontal.append([min(xs), max(xs), y_min, y_max, 0.5 * (y_min + y_max), y_max - y_min])
+        else:
+            height = np.linalg.norm([poly[6] - poly[0], poly[7] - poly[1]])
+            width = np.linalg.norm([poly[2] - poly[0], poly[3] - poly[1]])
+            margin = int(1.44 * ADD_MARGIN * min(width, height))
+            theta13 = abs(np.arctan((poly[1] - poly[5]) / max(10, poly[0] - poly[4])))
+            theta24 = abs(np.arctan((poly[3] - poly[7]) / max(10, poly[2] - poly[6])))
+            free.append([
+                [poly[0] - np.cos(theta13) * margin, poly[1] - np.sin(theta13) * margin],
+                [poly[2] + np.cos(theta24) * margin, poly[3] - np.sin(theta24) * margin],
+                [poly[4] + np.cos(theta13) * margin, poly[5] + np.sin(theta13) * margin],
+                [poly[6] - np.cos(theta24) * margin, poly[7] + np.sin(theta24) * margin],
+            ])
+
+    # Lines: boxes whose y-centres are close relative to the line height
+    lines, line = [], []
+    centres, heights = [], []
+    for box in sorted(horizontal, key=lambda item: item[4]):
+        if line and abs(np.mean(centres) - box[4]) >= YCENTER_THS * np.mean(heights):
+            lines.append(line)
+            line, centres, heights = [], [], []
+        line.append(box)
+        centres.append(box[4])
+        heights.append(box[5])
+    if line:
+        lines.append(line)
+
+    merged = [box for line in lines for box in _merge_line(line)]
+    merged = [box for box in merged if max(box[1] - box[0], box[3] - box[2]) > MIN_SIZE]
+    free = [box for box in free
+            if max(np.ptp([point[0] for point in box]), np.ptp([point[1] for point in box])) > MIN_SIZE]
+    return merged, free
+
+
+def _beam_search(probs, beam_width):
+    """CTC prefix beam search over per-step probabilities, returns the best label sequence
+
+    Like easyocr's decoder, only characters with at least 0.5 / classes
+    probability at a step extend the beams.
+    """
+    import numpy as np
+
+    # prefix -> (probability ending in blank, probability ending in a character)
+    beams = {(): (1.0, 0.0)}
+    threshold = 0.5 / probs.shape[1]
+    for step in probs:
+        candidates = [int(idx) for idx in np.nonzero(step >= threshold)[0] if idx]
+        extended = {}
+        for prefix, (blank, nonblank) in beams.items():
+            total = blank + nonblank
+            ext_blank, ext_nonblank = extended.get(prefix, (0.0, 0.0))
+            # Blank, or the last character repeated without a blank in between
+            ext_blank += total * step[0]
+            if prefix:
+                ext_nonblank += nonblank * step[prefix[-1]]
+            extended[prefix] = (ext_blank, ext_nonblank)
+            for idx in candidates:
+                new_prefix = prefix + (idx,)
+                new_blank, new_nonblank = extended.get(new_prefix, (0.0, 0.0))
+                # A repeated character needs a blank between the two
+                new_nonblank += step[idx] * (blank if prefix and prefix[-1] == idx else total)
+                extended[new_prefix] = (new_blank, new_nonblank)
+        beams = dict(sorted(extended.items(), key=lambda item: -sum(item[1]))[:beam_width])
+    return max(beams.items(), key=lambda item: sum(item[1]))[0]
+
+
+def _four_point_crop(grey, box):
+    """Perspective-corrected crop of a rotated box"""
+    import cv2
+    import numpy as np
+
+    rect = np.array(box, dtype=np.float32)
+    top_left, top_right, bottom_right, bottom_left = rect
+    width = int(max(np.linalg.norm(bottom_right - bottom_left), np.linalg.norm(top_right - top_left)))
+    height = int(max(np.linalg.norm(top_right - bottom_right), np.linalg.norm(top_left - bottom_left)))
+    target = np.array([[0, 0], [width - 1, 0], [width - 1, height - 1], [0, height - 1]], dtype=np.float32)
+    return cv2.warpPerspective(grey, cv2.getPerspectiveTransform(rect, target), (width, height))
+
+
+class OnnxReader:
+    """Drop-in for easyocr.Reader on the ONNX exports (readtext, detect, recognize)"""
+
+    def __init__(self, directory=None, threads=None, quantized=False):
+        try:
+            import onnxruntime
+        except ImportError as e:
+            raise RuntimeError("The onnx OCR engine needs onnxruntime (pip install onnxruntime)") from e
+        directory = Path(directory or model_dir())
+        if not (directory / DETECTOR_FILE).exists():
+            raise FileNotFoundError(f"No ONNX models in {directory}, export them with: python -m ocr_onnx --export")
+        options = onnxruntime.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        providers = ["CPUExecutionProvider"]
+        self.detector = onnxruntime.InferenceSession(str(directory / DETECTOR_FILE), options, providers=providers)
+        recognizer_path = quantized_recognizer(directory) if quantized else directory / RECOGNIZER_FILE
+        self.recognizer = onnxruntime.InferenceSession(str(recognizer_path), options, providers=providers)
+        with open(directory / METADATA_FILE, encoding='utf-8') as f:
+            metadata = json.load(f)
+        self.characters = metadata["characters"]
+        self.height = metadata.get("height", RECOGNIZER_HEIGHT)
+
+    def detect(self, image, canvas_size=CANVAS_SIZE, mag_ratio=MAG_RATIO, **kwargs):
+        """Text boxes as easyocr returns them: ([horizontal boxes], [rotated boxes]) for a batch of one"""
+        import cv2
+        import numpy as np
+
+        image = _rgb_array(image)
+        height, width = image.shape[:2]
+        ratio = min(mag_ratio * max(height, width), canvas_size) / max(height, width)
+        target_h, target_w = int(height * ratio), int(width * ratio)
+        # Detector input: canvas padded to a multiple of 32, ImageNet-normalised
+        canvas = np.zeros((-(-target_h // 32) * 32, -(-target_w // 32) * 32, 3), dtype=np.float32)
+        canvas[:target_h, :target_w] = cv2.resize(image, (target_w, target_h), interpolation=cv2.INTER_LINEAR)
+        canvas -= np.array(DETECTOR_MEAN, dtype=np.float32) * 255
+        canvas /= np.array(DETECTOR_STD, dtype=np.float32) * 255
+        scores = self.detector.run(None, {self.detector.get_inputs()[0].name: canvas.transpose(2, 0, 1)[None]})[0][0]
+
+        # Score maps are at half the detector input resolution
+        polys = [(box * (2 / ratio)).astype(np.int32).reshape(-1) for box in _score_map_boxes(scores[:, :, 0], scores[:, :, 1])]
+        horizontal, free = group_text_boxes(polys)
+        return [horizontal], [free]
+
+    def recognize(self, image, horizontal_list=None, free_list=None, decoder="greedy", beamWidth=BEAM_WIDTH,
+                  batch_size=RECOGNIZE_BATCH, allowlist=None, **kwargs):
+        """Recognise text in the given boxes, returns readtext-style (box, text, confidence) results"""
+        import cv2
+        import numpy as np
+        from PIL import Image
+
+        image = _rgb_array(image)
+        grey = cv2.cvtColor(np.ascontiguousarray(image), cv2.COLOR_RGB2GRAY)
+        height, width = grey.shape
+        crops = []
+        for box in horizontal_list or []:
+            x_min, x_max = max(0, int(box[0])), min(int(box[1]), width)
+            y_min, y_max = max(0, int(box[2])), min(int(box[3]), height)
+            if x_max > x_min and y_max > y_min:
+                corners = [[x_min, y_min], [x_max, y_min], [x_max, y_max], [x_min, y_max]]
+                crops.append((corners, grey[y_min:y_max, x_min:x_max]))
+        for box in free_list or []:
+            crop = _four_point_crop(grey, box)
+            if crop.size:
+                crops.append((box, crop))
+        # Top to bottom, as readtext returns them
+        crops.sort(key=lambda item: item[0][0][1])
+
+        inputs = []
+        for _, crop in crops:
+            crop_h, crop_w = crop.shape
+            resized_w = max(1, math.ceil(self.height * crop_w / crop_h))
+            resized = Image.fromarray(crop).resize((resized_w, self.height), Image.Resampling.BICUBIC)
+            inputs.append((np.asarray(resized, dtype=np.float32) / 127.5) - 1.0)
+
+        results = [None] * len(crops)
+        order = sorted(range(len(crops)), key=lambda idx: inputs[idx].shape[1])
+        # Like easyocr: characters outside the allowlist get no probability
+        ignored = [idx for idx, char in enumerate(self.characters) if idx and allowlist and char not in allowlist]
+        batch_size = max(1, batch_size)
+        for start in range(0, len(order), batch_size):
+            batch_ids = order[start:start + batch_size]
+            batch_w = max(inputs[idx].shape[1] for idx in batch_ids)
+            batch = np.empty((len(batch_ids), 1, self.height, batch_w), dtype=np.float32)
+            for row, idx in enumerate(batch_ids):
+                crop_w = inputs[idx].shape[1]
+                batch[row, 0, :, :crop_w] = inputs[idx]
+                # Pad by repeating the last column, like easyocr's NormalizePAD
+                batch[row, 0, :, crop_w:] = inputs[idx][:, -1:]
+            logits = self.recognizer.run(None, {self.recognizer.get_inputs()[0].name: batch})[0]
+            for row, idx in enumerate(batch_ids):
+                text, confidence = self._decode(logits[row], ignored, decoder, beamWidth)
+                results[idx] = (crops[idx][0], text, confidence)
+        return results
+
+    def _decode(self, logits, ignored, decoder, beam_width):
+        """CTC decoding of one crop, returns (text, confidence)"""
+        import numpy as np
+
+        probs = np.exp(logits - logits.max(axis=1, keepdims=True))
+        if ignored:
+            probs[:, ignored] = 0.0
+        probs /= probs.sum(axis=1, keepdims=True)
+        best = probs.argmax(axis=1)
+        if decoder == "beamsearch":
+            text = ''.join(self.characters[idx] for idx in _beam_search(probs, beam_width))
+        else:
+            keep = (best != 0) & np.concatenate(([True], best[1:] != best[:-1]))
+            text = ''.join(self.characters[idx] for idx in best[keep])
+        # easyocr's confidence (for either decoder): product of the non-blank
+        # greedy step maxima, length-normalised
+        step_probs = probs.max(axis=1)[best != 0]
+        confidence = float(step_probs.prod() ** (2.0 / math.sqrt(len(step_probs)))) if len(step_probs) else 0.0
+        return text, confidence
+
+    def readtext(self, image, canvas_size=CANVAS_SIZE, mag_ratio=MAG_RATIO, **kwargs):
+        """detect() followed by recognize(), like easyocr.Reader.readtext"""
+        image = _rgb_array(image)
+        horizontal_list, free_list = self.detect(image, canvas_size=canvas_size, mag_ratio=mag_ratio)
+        return self.recognize(image, horizontal_list[0], free_list[0], **kwargs)
+
+
+def export_models(directory=None):
+    """Export the EasyOCR detector and recogniser to ONNX (needs easyocr and torch)"""
+    import torch
+    from importlib import metadata
+
+    from ocr_engine import create_reader
+
+    directory = Path(directory or model_dir())
+    directory.mkdir(parents=True, exist_ok=True)
+    # The thorough profile loads the float models (a quantised recogniser cannot be exported)
+    reader = create_reader(gpu=False, profile="thorough")
+
+    detector = getattr(reader.detector, 'module', reader.detector).eval()
+    torch.onnx.export(
+        detector, torch.zeros(1, 3, 640, 640), str(directory / DETECTOR_FILE),
+        input_names=["image"], output_names=["scores", "features"],
+        dynamic_axes={"image": {0: "batch", 2: "height", 3: "width"},
+                      "scores": {0: "batch", 1: "map_height", 2: "map_width"},
+                      "features": {0: "batch", 2: "feature_height", 3: "feature_width"}},
+        opset_version=ONNX_OPSET, dynamo=False,
+    )
+
+    class RecognizerOnly(torch.nn.Module):
+        """The recogniser's forward without the unused text argument
+
+        AdaptiveAvgPool2d((None, 1)) over the feature height is written as a
+        mean, the exporter cannot handle it with a dynamic input width.
+        """
+
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, image):
+            features = self.model.FeatureExtraction(image).permute(0, 3, 1, 2).mean(dim=3)
+            return self.model.Prediction(self.model.SequenceModeling(features).contiguous())
+
+    recognizer = getattr(reader.recognizer, 'module', reader.recognizer).eval()
+    torch.onnx.export(
+        RecognizerOnly(recognizer), torch.zeros(1, 1, RECOGNIZER_HEIGHT, 256), str(directory / RECOGNIZER_FILE),
+        input_names=["image"], output_names=["logits"],
+        dynamic_axes={"image": {0: "batch", 3: "width"}, "logits": {0: "batch", 1: "steps"}},
+        opset_version=ONNX_OPSET, dynamo=False,
+    )
+    with open(directory / METADATA_FILE, 'w', encoding='utf-8') as f:
+        json.dump({
+            "characters": list(reader.converter.character),
+            "height": RECOGNIZER_HEIGHT,
+            "easyocr": metadata.version("easyocr"),
+        }, f, ensure_ascii=False)
+    quantized_recognizer(directory)
+    return directory
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(prog="python -m ocr_onnx", description="ONNX Runtime OCR engine models")
+    parser.add_argument("--export", action="store_true", help="export the EasyOCR models to ONNX")
+    parser.add_argument("--dir", help=f"model folder (default: {model_dir()})")
+    args = parser.parse_args(argv)
+    if not args.export:
+        parser.print_help()
+        return 2
+    directory = export_models(args.dir)
+    print(f"✓ Exported ONNX models to {directory}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""
+Image preprocessing before OCR
+
+Screenshots are often 4K captures where most pixels are screen chrome
+around the device table. Each preprocessing profile can crop to a region
+of interest, convert to grayscale, normalise contrast and downscale the
+longest side before the image reaches readtext. Boxes found on the
+processed image are mapped back to original image coordinates.
+"""
+
+import time
+
+from PIL import Image, ImageChops, ImageOps
+
+
+# Profile settings:
+#   max_side      downscale so the longest side is at most this many pixels
+#   grayscale     convert to 8-bit grayscale
+#   autocontrast  stretch contrast (ignoring the darkest/brightest 1%)
+#   roi           None, "auto" (trim uniform borders) or fractions (left, top, right, bottom)
+PREPROCESS_PROFILES = {
+    "none": {},
+    # EasyOCR's detector works on at most 2560 px anyway, but recognition
+    # crops are cut from the downscaled image, so 4K captures lose detail
+    "standard": {"max_side": 2560, "grayscale": True, "autocontrast": True, "roi": None},
+    # Large captures with chrome around the table: trim borders and shrink further
+    "large-capture": {"max_side": 1920, "grayscale": True, "autocontrast": True, "roi": "auto"},
+}
+# Opt-in: the original image unless a run asks for preprocessing
+DEFAULT_PREPROCESS_PROFILE = "none"
+
+# Pixels that differ from the border colour by more than this count as content
+ROI_THRESHOLD = 24
+# Margin kept around the detected content box
+ROI_MARGIN = 8
+
+
+def resolve_preprocess(profile):
+    """Return the settings dict for a profile name (or pass a settings dict through)"""
+    if isinstance(profile, dict):
+        return dict(profile)
+    if profile not in PREPROCESS_PROFILES:
+        raise ValueError(f"Unknown preprocessing profile: {profile}")
+    return dict(PREPROCESS_PROFILES[profile])
+
+
+def detect_content_box(image):
+    """Bounding box of everything that differs from the border colour, or None"""
+    gray = image if image.mode == 'L' else image.convert('L')
+    width, height = gray.size
+    corners = sorted(gray.getpixel(point) for point in
+                     ((0, 0), (width - 1, 0), (0, height - 1), (width - 1, height - 1)))
+    background = (corners[1] + corners[2]) // 2
+    diff = ImageChops.difference(gray, Image.new('L', gray.size, background))
+    box = diff.point(lambda p: 255 if p > ROI_THRESHOLD else 0).getbbox()
+    if box is None:
+        return None
+    left, top, right, bottom = box
+    return (max(0, left - ROI_MARGIN), max(0, top - ROI_MARGIN),
+            min(width, right + ROI_MARGIN), min(height, bottom + ROI_MARGIN))
+
+
+def preprocess_image(image, settings, timings=None):
+    """Preprocess a PIL image, returns (numpy array, scale, (offset_x, offset_y))"""
+    import numpy as np
+
+    start = time.perf_counter()
+    offset = (0, 0)
+    scale = 1.0
+
+    image = image.convert('L') if settings.get('grayscale') else image.convert('RGB')
+
+    roi = settings.get('roi')
+    box = None
+    if roi == "auto":
+        box = detect_content_box(image)
+    elif roi:
+        left, top, right, bottom = roi
+        box = (int(left * image.width), int(top * image.height),
+               int(right * image.width), int(bottom * image.height))
+    if box is not None and box != (0, 0, image.width, image.height):
+        image = image.crop(box)
+        offset = (box[0], box[1])
+
+    if settings.get('autocontrast'):
+        image = ImageOps.autocontrast(image, cutoff=1)
+
+    max_side = settings.get('max_side')
+    if max_side and max(image.size) > max_side:
+        scale = max_side / max(image.size)
+        new_size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+        image = image.resize(new_size, Image.Resampling.LANCZOS, reducing_gap=2.0)
+
+    array = np.asarray(image)
+    if timings is not None:
+        timings['preprocess'] = timings.get('preprocess', 0.0) + time.perf_counter() - start
+    return array, scale, offset
+
+
+def restore_detections(detections, scale, offset):
+    """Map detection boxes from the processed image back to original coordinates"""
+    if scale == 1.0 and offset == (0, 0):
+        return detections
+    offset_x, offset_y = offset
+    return [
+        ([[x / scale + offset_x, y / scale + offset_y] for x, y in box], text, confidence)
+        for box, text, confidence in detections
+    ]
@@ -0,0 +1,190 @@
+"""
+Detection-first targeted recognition
+
+readtext recognises every text box on a screenshot, but parse_device_text
+only uses the device table rows and engine blocks. This mode runs the
+text detector once, groups the boxes into rows and columns, recognises
+the left cell and the product code cell of each row and then recognises
+the rest of a row only when it can hold a device or engine serial:
+
+- one of those cells contains a product code (E#####, V#####, MS-...,
+  ##L####), in which case the following row is kept too (serial on the
+  next line)
+- it is an "engine" header or one of the rows below it
+
+The product code column is found by recognising whole rows from the top
+until one of their cells holds a product code (name | code | serial
+tables); when the left cells already hold codes, no search is needed.
+"""
+
+import time
+
+from device_parser import ENGINE_KEYWORD, ENGINE_WINDOW, TOKEN_SERIAL, classify_token
+from ocr_engine import add_timing
+from ocr_layout import cluster_columns, cluster_rows
+
+# Rows recognised in full per recognize() call while looking for the
+# product code column
+CODE_COLUMN_BATCH = 4
+# Rows searched for the product code column before giving up
+CODE_COLUMN_ROWS = 16
+
+
+def _box_key(x_min, y_min, x_max, y_max):
+    return int(x_min), int(y_min), int(x_max), int(y_max)
+
+
+def _detector_key(box):
+    """Key of a detector box [x_min, x_max, y_min, y_max]"""
+    x_min, x_max, y_min, y_max = box
+    return _box_key(x_min, y_min, x_max, y_max)
+
+
+def _result_key(box):
+    """Key of a recognize() result box (4 points, top-left first)"""
+    (x_min, y_min), _, (x_max, y_max), _ = box
+    return _box_key(x_min, y_min, x_max, y_max)
+
+
+def group_box_rows(boxes):
+    """Group detector boxes [x_min, x_max, y_min, y_max] into rows, top to bottom, left to right"""
+    if not boxes:
+        return []
+    row_ids = cluster_rows([box[2] for box in boxes], [box[3] for box in boxes])
+    rows = [[] for _ in range(int(row_ids.max()) + 1)]
+    for box, row_id in zip(boxes, row_ids):
+        rows[row_id].append(box)
+    return [sorted(row, key=lambda b: b[0]) for row in rows]
+
+
+def has_product_code(text):
+    """Check whether any token of a cell is a product code"""
+    for token in text.split():
+        classified = classify_token(token)
+        if classified is not None and classified[0] != TOKEN_SERIAL:
+            return True
+    return False
+
+
+def box_columns(boxes):
+    """Column id of each detector box [x_min, x_max, y_min, y_max], keyed by box"""
+    column_ids = cluster_columns([box[0] for box in boxes], [box[2] for box in boxes], [box[3] for box in boxes])
+    return {_detector_key(box): int(column_id) for box, column_id in zip(boxes, column_ids)}
+
+
+def select_rows(row_texts):
+    """Indices of rows worth recognising in full, given the probed cell text of each row"""
+    selected = set()
+    engine_until = -1
+    for idx, text in enumerate(row_texts):
+        if idx <= engine_until:
+            selected.add(idx)
+        if ENGINE_KEYWORD in text.casefold():
+            selected.add(idx)
+            engine_until = idx + ENGINE_WINDOW
+        if has_product_code(text):
+            selected.update((idx, idx + 1))
+    return {idx for idx in selected if idx < len(row_texts)}
+
+
+def _recognise(reader, image, boxes, recognised, recognize_kwargs):
+    """Recognise the boxes not recognised yet, results go into recognised (keyed by box)"""
+    boxes = [box for box in boxes if _detector_key(box) not in recognised]
+    if not boxes:
+        return
+    for result in reader.recognize(image, boxes, [], **recognize_kwargs):
+        recognised[_result_key(result[0])] = result
+
+
+def _cell_text(recognised, box):
+    """Recognised text of a detector box, empty when it has none"""
+    result = recognised.get(_detector_key(box))
+    return result[1] if result else ""
+
+
+def find_code_column(reader, image, rows, columns, recognised, recognize_kwargs):
+    """Column id of the first non-left cell holding a product code, or None
+
+    Recognises rows in full from the top, CODE_COLUMN_BATCH at a time, up
+    to CODE_COLUMN_ROWS rows.
+    """
+    candidates = [row for row in rows if len(row) > 1][:CODE_COLUMN_ROWS]
+    for start in range(0, len(candidates), CODE_COLUMN_BATCH):
+        batch = candidates[start:start + CODE_COLUMN_BATCH]
+        _recognise(reader, image, [box for row in batch for box in row[1:]], recognised, recognize_kwargs)
+        for row in batch:
+            for box in row[1:]:
+                if has_product_code(_cell_text(recognised, box)):
+                    return columns[_detector_key(box)]
+    return None
+
+
+def targeted_readtext(reader, image, timings=None, job=None, detect_kwargs=None, **recognize_kwargs):
+    """Detect text, recognise only candidate rows; returns readtext-style detections
+
+    A job (ocr_engine.ExtractionJob) is checked before each stage.
+    """
+    if job is not None:
+        job.checkpoint()
+    start = time.perf_counter()
+    horizontal_list, free_list = reader.detect(image, **(detect_kwargs or {}))
+    horizontal_list, free_list = horizontal_list[0], free_list[0]
+    add_timing(timings, 'detect', start)
+
+    # Clip to the image so recognize() hands back the coordinates we sent
+    height, width = image.shape[:2]
+    boxes = [
+        [max(0, int(x_min)), min(width, int(x_max)), max(0, int(y_min)), min(height, int(y_max))]
+        for x_min, x_max, y_min, y_max in horizontal_list
+    ]
+    rows = group_box_rows(boxes)
+    columns = box_columns(boxes) if boxes else {}
+
+    if job is not None:
+        job.checkpoint()
+    start = time.perf_counter()
+    recognised = {}
+    _recognise(reader, image, [row[0] for row in rows], recognised, recognize_kwargs)
+    row_texts = [_cell_text(recognised, row[0]) for row in rows]
+
+    if not any(has_product_code(text) for text in row_texts):
+        # Codes are not in the left column: probe the product code cell of each row too
+        code_column = find_code_column(reader, image, rows, columns, recognised, recognize_kwargs)
+        if code_column is not None:
+            code_cells = [
+                next((box for box in row[1:] if columns[_detector_key(box)] == code_column), None)
+                for row in rows
+            ]
+            _recognise(reader, image, [box for box in code_cells if box is not None], recognised, recognize_kwargs)
+            row_texts = [text if box is None else f"{text} {_cell_text(recognised, box)}"
+                         for text, box in zip(row_texts, code_cells)]
+
+    selected = select_rows(row_texts)
+    if not selected:
+        # Nothing looks like a device table: fall back to recognising everything
+        selected = set(range(len(rows)))
+    remaining = [
+        box for idx in sorted(selected) for box in rows[idx][1:]
+        if _detector_key(box) not in recognised
+    ]
+    free_results = []
+    if job is not None:
+        job.checkpoint()
+    if remaining or free_list:
+        remaining_keys = {_detector_key(box) for box in remaining}
+        for result in reader.recognize(image, remaining, free_list, **recognize_kwargs):
+            key = _result_key(result[0])
+            if key in remaining_keys:
+                recognised[key] = result
+            else:
+                free_results.append(result)
+    add_timing(timings, 'recognize', start)
+
+    # Reading order: row by row, left to right, then any rotated boxes
+    detections = []
+    for row in rows:
+        for box in row:
+            result = recognised.get(_detector_key(box))
+            if result is not None:
+                detections.append(result)
+    return detections + free_results
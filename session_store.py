@@ -0,0 +1,115 @@
+"""
+Session file
+
+Everything needed to reopen the extractor where it was left: the image
+list with content hashes, the raw readtext detections of each image, the
+table rows with the user's edits and check marks (and the OCR engine and
+profile each row was extracted with), the vessel/SAP fields and the
+selected OCR profile. Detections are stored once per image hash with rounded
+coordinates, so the file stays small.
+
+The GUI hands a snapshot to SessionAutosaver, which writes it on a
+background thread (latest snapshot wins) with an atomic replace, so a
+crash never leaves a half-written session behind.
+
+The session is per user: it stays in ~/.technohull_extractor even when
+the OCR cache is moved to a shared folder (SERIAL_EXTRACTOR_CACHE_DIR),
+so technicians sharing a cache never restore each other's work.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+
+from ocr_cache import DEFAULT_CACHE_DIR
+
+
+# Environment override for the session folder (the OCR cache folder
+# override does not apply, it may be shared)
+SESSION_DIR_ENV_VAR = "SERIAL_EXTRACTOR_SESSION_DIR"
+SESSION_FILENAME = "session.json"
+SESSION_VERSION = 1
+
+
+def default_session_path():
+    """Session file in the user's extractor data folder"""
+    return Path(os.environ.get(SESSION_DIR_ENV_VAR) or DEFAULT_CACHE_DIR) / SESSION_FILENAME
+
+
+def compact_detections(detections):
+    """Detections with box coordinates rounded to 0.1 px and confidences to 3 digits"""
+    return [
+        [[[round(x, 1), round(y, 1)] for x, y in box], text, round(confidence, 3)]
+        for box, text, confidence in detections
+    ]
+
+
+def save_session(path, session):
+    """Write a session dict as compact JSON, replacing the file atomically"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = dict(session, version=SESSION_VERSION)
+    data["detections"] = {
+        image_hash: compact_detections(detections)
+        for image_hash, detections in session.get("detections", {}).items()
+    }
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def load_session(path):
+    """Read a session file, None when there is none
+
+    Raises ValueError for a file written by an incompatible version.
+    """
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    if data.get("version") != SESSION_VERSION:
+        raise ValueError(f"unsupported session version {data.get('version')!r}")
+    return data
+
+
+class SessionAutosaver:
+    """Background writer for session snapshots; only the newest pending snapshot is written"""
+
+    def __init__(self, path, on_error=None):
+        self.path = Path(path)
+        self.on_error = on_error
+        self._pending = None
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, session):
+        """Queue a snapshot for writing (replaces any snapshot not yet written)"""
+        with self._condition:
+            self._pending = session
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                session, self._pending = self._pending, None
+                if session is None:
+                    return
+            try:
+                save_session(self.path, session)
+            except (OSError, TypeError, ValueError) as e:
+                if self.on_error is not None:
+                    self.on_error(e)
+
+    def close(self):
+        """Write the pending snapshot, if any, and stop the writer thread"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
@@ -0,0 +1,11 @@
+"""
+pytest setup: the modules live at the repository root and the synthetic
+screenshots in benchmarks/, neither is an installed package.
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
@@ -0,0 +1,89 @@
+"""
+Device catalogue: keyword matching at word edges, match priority and
+loading of an edited catalogue file
+"""
+
+import json
+
+import pytest
+
+import device_catalog
+from device_catalog import BUNDLED_CATALOG, DeviceCatalog, KeywordIndex
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    return DeviceCatalog.from_file(BUNDLED_CATALOG)
+
+
+@pytest.mark.parametrize("text, found", [
+    ("AXIOM 2 PRO 9 RV", {"AXIOM", "9"}),
+    ("AXIOM E70659", {"AXIOM"}),          # no "9" inside a longer number
+    ("9", {"9"}),                         # keyword is the whole text
+    ("AXIOM+ 12", {"AXIOM", "12"}),       # punctuation is an edge
+    ("RAYMARINE RS150", {"RS"}),          # letters next to digits are an edge
+    ("CROSSOVER", set()),                 # no "RS" inside a word
+    ("AXIOMS 129", set()),
+])
+def test_keywords_match_whole_words_and_numbers(text, found):
+    index = KeywordIndex(["AXIOM", "9", "12", "RS"])
+    assert index.find(text) == found
+
+
+def test_overlapping_keywords_share_the_automaton():
+    # Keywords that are prefixes/suffixes of each other go through failure links
+    index = KeywordIndex(["RAY", "RAY53", "AY53", "53"])
+    # Letters next to digits are an edge, "AY53" is glued to the "R"
+    assert index.find("RAY53") == {"RAY53", "RAY", "53"}
+    assert index.find("X RAY 53") == {"RAY", "53"}
+
+
+@pytest.mark.parametrize("name, code, device_type", [
+    ("AXIOM 2 PRO 12", "E70656", "AXIOM 2 PRO 12"),
+    ("AXIOM 2 PRO 9", "", "AXIOM 2 PRO 9"),
+    ("AXIOM E70659", "", None),
+    ("QUANTUM 2 Q24D DOPPLER RADAR", "", "RADAR QUANTUM 2 DOPPLER"),
+    ("QUANTUM 2 Q24C RADAR", "", "RADAR QUANTUM 2"),
+    ("RAYMARINE RS 150", "", "RAYMARINE RS 150"),
+    ("CROSSOVER 150", "", None),
+    ("DSC RADIO", "12L0123", "GMDSS"),
+])
+def test_match(catalog, name, code, device_type):
+    assert catalog.match(name, code) == device_type
+
+
+def test_product_code_beats_name(catalog):
+    # The name says AXIOM 9, the code is the AXIOM 12 one
+    assert catalog.match("AXIOM 2 PRO 9", "E70656") == "AXIOM 2 PRO 12"
+    assert catalog.match("RAYMARINE RS 150", "E70476") == "RAYMARINE AIS 700"
+
+
+def test_match_many_keeps_order(catalog):
+    products = [("AXIOM 2 PRO 16", ""), ("UNKNOWN", ""), ("", "E70310")]
+    assert catalog.match_many(products) == ["AXIOM 2 PRO 16", None, "RAYMARINE RS 150"]
+
+
+def test_broken_override_falls_back_to_bundled(tmp_path, monkeypatch):
+    broken = tmp_path / "device_catalog.json"
+    broken.write_text(json.dumps({"devices": [{"type": "X"}]})[:-5], encoding='utf-8')
+    monkeypatch.setenv(device_catalog.CATALOG_ENV_VAR, str(broken))
+    monkeypatch.setattr(device_catalog, "_default_catalog", None)
+    monkeypatch.setattr(device_catalog, "_load_error", None)
+
+    catalog = device_catalog.default_catalog()
+
+    assert catalog.path == BUNDLED_CATALOG
+    assert "AXIOM 2 PRO 12" in catalog.device_types
+    assert str(broken) in device_catalog.catalog_load_error()
+
+
+def test_override_with_wrong_shape_falls_back_to_bundled(tmp_path, monkeypatch):
+    # Valid JSON, but a device entry without a "type"
+    override = tmp_path / "device_catalog.json"
+    override.write_text(json.dumps({"devices": [{"codes": ["E1"]}]}), encoding='utf-8')
+    monkeypatch.setenv(device_catalog.CATALOG_ENV_VAR, str(override))
+    monkeypatch.setattr(device_catalog, "_default_catalog", None)
+    monkeypatch.setattr(device_catalog, "_load_error", None)
+
+    assert device_catalog.default_catalog().path == BUNDLED_CATALOG
+    assert device_catalog.catalog_load_error() is not None
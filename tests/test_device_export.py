@@ -0,0 +1,32 @@
+"""
+Export of extracted rows: the OCR engine and profile recorded with them
+"""
+
+import json
+
+from device_export import format_txt, ocr_summary, write_export
+
+ROWS = [{'device_type': "AXIOM 2 PRO 12", 'code': "E70656", 'serial': "TAZ2ZKB", 'image': "a.png"}]
+
+
+def test_ocr_summary_lists_what_was_used():
+    used = {("easyocr", "fast"), ("easyocr", "thorough"), (None, None)}
+    assert ocr_summary(used) == {'engine': "easyocr", 'profile': "fast/thorough"}
+
+
+def test_ocr_summary_of_manual_rows_only():
+    assert ocr_summary({(None, None)}) is None
+    assert ocr_summary(set()) is None
+
+
+def test_txt_records_ocr_only_when_known():
+    text, _ = format_txt(ROWS, "M", "N", "1", ocr={'engine': "onnx", 'profile': "fast"})
+    assert text.endswith("OCR: onnx, fast profile\n")
+    text, _ = format_txt(ROWS, "M", "N", "1", ocr=None)
+    assert "OCR:" not in text
+
+
+def test_json_records_ocr(tmp_path):
+    path = tmp_path / "export.json"
+    write_export(path, ROWS, "M", "N", "1", fmt="json", ocr={'engine': "easyocr", 'profile': "balanced"})
+    assert json.loads(path.read_text(encoding='utf-8'))['ocr'] == {'engine': "easyocr", 'profile': "balanced"}
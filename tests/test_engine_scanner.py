@@ -0,0 +1,31 @@
+"""
+Parity of the single-pass engine serial scanner with the legacy parser
+
+The legacy implementation (engine header search followed by a rescan of
+the next lines) lives in benchmarks/bench_parser.py. Both parsers must
+find the same devices in the same order on the dumps in
+benchmarks/corpus/ and on synthetic engine-heavy dumps.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from bench_parser import legacy_parse_device_text
+from device_parser import parse_device_text
+from parity_engine_scanner import build_engine_dump, plain
+
+CORPUS = sorted((Path(__file__).resolve().parent.parent / "benchmarks" / "corpus").glob("*.txt"))
+
+
+@pytest.mark.parametrize("path", CORPUS, ids=lambda path: path.name)
+def test_corpus_matches_legacy_parser(path):
+    text = path.read_text(encoding='utf-8')
+    assert plain(parse_device_text(text)) == legacy_parse_device_text(text)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_synthetic_dump_matches_legacy_parser(seed):
+    text = build_engine_dump(2000, seed)
+    assert plain(parse_device_text(text)) == legacy_parse_device_text(text)
+
@@ -0,0 +1,58 @@
+"""
+Targeted recognition on name | code | serial device tables
+
+A fake reader serves the text boxes of a synthetic screenshot, so
+targeted_readtext can be compared with a full readtext without easyocr.
+"""
+
+import numpy as np
+import pytest
+
+from ocr_engine import extract_image, ocr_options
+from ocr_targeted import select_rows
+from synthetic_screens import recall, render_screen
+
+
+class FakeReader:
+    """detect/recognize/readtext over the known boxes of a synthetic screen"""
+
+    def __init__(self, screen):
+        self.texts = {}
+        self.boxes = []
+        for box, text, _ in screen.detections:
+            (x_min, y_min), _, (x_max, y_max), _ = box
+            self.boxes.append([int(x_min), int(x_max), int(y_min), int(y_max)])
+            self.texts[(int(x_min), int(x_max), int(y_min), int(y_max))] = text
+        self.recognised = 0
+
+    def _result(self, box):
+        x_min, x_max, y_min, y_max = box
+        points = [[x_min, y_min], [x_max, y_min], [x_max, y_max], [x_min, y_max]]
+        return [points, self.texts[tuple(box)], 1.0]
+
+    def readtext(self, image, **kwargs):
+        return [self._result(box) for box in self.boxes]
+
+    def detect(self, image, **kwargs):
+        return [self.boxes], [[]]
+
+    def recognize(self, image, horizontal_list, free_list, **kwargs):
+        self.recognised += len(horizontal_list)
+        return [self._result(box) for box in horizontal_list]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_targeted_keeps_name_code_serial_rows(seed):
+    screen = render_screen(1920, 1080, 24, seed=seed)
+    image = np.asarray(screen.image)
+
+    _, full = extract_image(FakeReader(screen), image, ocr_options(preprocess="none"))
+    _, targeted = extract_image(FakeReader(screen), image, ocr_options(preprocess="none", targeted=True))
+
+    assert recall(targeted, screen.serials) == recall(full, screen.serials)
+    assert {device['serial'] for device in targeted} == {device['serial'] for device in full}
+
+
+def test_select_rows_keeps_code_rows_and_engine_blocks():
+    texts = ["Device List", "Product Code Serial", "Axiom 9 E70367", "TAZ2ZKB", "Settings", "Engine 1"]
+    assert select_rows(texts) == {2, 3, 5}
@@ -0,0 +1,170 @@
+"""
+Thumbnail strip widget
+
+Horizontal, scrollable strip of image thumbnails on a Canvas. Thumbnails
+are made once on a background thread; only the slots in view hold a
+Tk image, so sessions with hundreds of screenshots stay responsive.
+Selecting an image only moves the highlight.
+"""
+
+import queue
+import threading
+import tkinter as tk
+
+from PIL import ImageTk
+
+
+THUMB_SIZE = (60, 40)
+SLOT_PADDING = 8
+# Slots kept rendered on each side of the visible window
+OVERSCAN = 4
+# How often finished thumbnails are picked up from the worker thread
+POLL_MS = 50
+
+
+class ThumbnailStrip(tk.Frame):
+    """Virtualised thumbnail strip backed by an ImageCache"""
+
+    def __init__(self, master, image_cache, on_select, bg, highlight, thumb_size=THUMB_SIZE):
+        super().__init__(master, bg=bg, borderwidth=0, highlightthickness=0)
+        self.image_cache = image_cache
+        self.on_select = on_select
+        self.thumb_size = thumb_size
+        self.slot_width = thumb_size[0] + SLOT_PADDING
+        self.slot_height = thumb_size[1] + SLOT_PADDING
+
+        self.canvas = tk.Canvas(self, height=self.slot_height, bg=bg, borderwidth=0, highlightthickness=0)
+        self.scrollbar = tk.Scrollbar(self, orient=tk.HORIZONTAL, command=self._on_scroll)
+        self.canvas.configure(xscrollcommand=self.scrollbar.set)
+        self.canvas.pack(fill=tk.X)
+        self.highlight = self.canvas.create_rectangle(0, 0, 0, 0, outline=highlight, width=2, state=tk.HIDDEN)
+        self.canvas.bind("<Configure>", lambda event: self._update_scrollregion())
+        self.canvas.bind("<Button-1>", self._on_click)
+
+        self.paths = []
+        self.selected = None
+        self._thumbs = {}      # index -> PIL thumbnail (made by the worker)
+        self._rendered = {}    # index -> (canvas item, PhotoImage) for slots in view
+        self._results = queue.Queue()
+        self._generation = 0
+        self._pending = 0
+        self._polling = False
+
+    def set_images(self, paths):
+        """Show a new list of images"""
+        self._generation += 1
+        self.paths = list(paths)
+        self.selected = None
+        self._pending = 0
+        self._thumbs.clear()
+        for item, _ in self._rendered.values():
+            self.canvas.delete(item)
+        self._rendered.clear()
+        self.canvas.itemconfigure(self.highlight, state=tk.HIDDEN)
+        self.canvas.xview_moveto(0)
+        self._update_scrollregion()
+        self._start_worker(list(enumerate(self.paths)))
+
+    def add_images(self, paths):
+        """Append images; existing thumbnails are kept"""
+        start = len(self.paths)
+        self.paths.extend(paths)
+        self._update_scrollregion()
+        self._start_worker([(start + offset, path) for offset, path in enumerate(paths)])
+
+    def select(self, idx):
+        """Move the highlight to an image and scroll it into view"""
+        self.selected = idx
+        x0 = idx * self.slot_width
+        self.canvas.coords(self.highlight, x0 + 1, 1, x0 + self.slot_width - 1, self.slot_height - 1)
+        self.canvas.itemconfigure(self.highlight, state=tk.NORMAL)
+        self.canvas.tag_raise(self.highlight)
+        first, last = self._visible_range()
+        if not first <= idx < last and self.paths:
+            self.canvas.xview_moveto(idx / len(self.paths))
+            self._render()
+
+    def _update_scrollregion(self):
+        width = len(self.paths) * self.slot_width
+        self.canvas.configure(scrollregion=(0, 0, width, self.slot_height))
+        # Only show the scrollbar when the strip does not fit
+        if width > self.canvas.winfo_width() > 1:
+            self.scrollbar.pack(fill=tk.X)
+        else:
+            self.scrollbar.pack_forget()
+        self._render()
+
+    def _start_worker(self, items):
+        generation = self._generation
+        self._pending += len(items)
+        thread = threading.Thread(target=self._make_thumbnails, args=(generation, items), daemon=True)
+        thread.start()
+        if not self._polling:
+            self._polling = True
+            self.after(POLL_MS, self._poll_results)
+
+    def _make_thumbnails(self, generation, items):
+        """Worker thread: decode thumbnails and hand them to the Tk loop"""
+        for idx, path in items:
+            if generation != self._generation:
+                return
+            try:
+                thumb = self.image_cache.thumbnail(path, self.thumb_size)
+            except Exception:
+                thumb = None
+            self._results.put((generation, idx, thumb))
+
+    def _poll_results(self):
+        updated = False
+        while True:
+            try:
+                generation, idx, thumb = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if generation != self._generation:
+                continue
+            self._pending -= 1
+            if thumb is not None:
+                self._thumbs[idx] = thumb
+                updated = True
+        if updated:
+            self._render()
+        if self._pending > 0:
+            self.after(POLL_MS, self._poll_results)
+        else:
+            self._polling = False
+
+    def _visible_range(self):
+        """Slot indices [first, last) currently in view"""
+        if not self.paths:
+            return 0, 0
+        left = self.canvas.canvasx(0)
+        right = left + max(self.canvas.winfo_width(), self.slot_width)
+        first = max(0, int(left // self.slot_width))
+        last = min(len(self.paths), int(right // self.slot_width) + 1)
+        return first, last
+
+    def _render(self):
+        """Create Tk images for slots in view and drop the ones far outside it"""
+        first, last = self._visible_range()
+        keep_from, keep_to = first - OVERSCAN, last + OVERSCAN
+        for idx in [idx for idx in self._rendered if not keep_from <= idx < keep_to]:
+            item, _ = self._rendered.pop(idx)
+            self.canvas.delete(item)
+        for idx in range(max(0, keep_from), min(len(self.paths), keep_to)):
+            if idx in self._rendered or idx not in self._thumbs:
+                continue
+            photo = ImageTk.PhotoImage(self._thumbs[idx])
+            x = idx * self.slot_width + self.slot_width // 2
+            item = self.canvas.create_image(x, self.slot_height // 2, image=photo)
+            self._rendered[idx] = (item, photo)
+        self.canvas.tag_raise(self.highlight)
+
+    def _on_scroll(self, *args):
+        self.canvas.xview(*args)
+        self._render()
+
+    def _on_click(self, event):
+        idx = int(self.canvas.canvasx(event.x) // self.slot_width)
+        if 0 <= idx < len(self.paths):
+            self.on_select(idx)